@@ -1,8 +1,10 @@
 import sqlite3
-import requests
 import subprocess
 from bs4 import BeautifulSoup
 
+from src.core.config import settings
+from src.scraper import http_client
+
 DB_PATH = "data/ufc_predictions.db"
 
 def get_recent_results():
@@ -10,10 +12,9 @@ def get_recent_results():
     Goes to UFC Stats to get the link of the last COMPLETED event
     and extracts who actually won the fights.
     """
-    url_base = "http://ufcstats.com/statistics/events/completed"
-    headers = {'User-Agent': 'Mozilla/5.0'}
+    url_base = f"{settings.UFCSTATS_BASE_URL}/statistics/events/completed"
     
-    resp = requests.get(url_base, headers=headers)
+    resp = http_client.get(url_base)
     soup = BeautifulSoup(resp.content, 'html.parser')
     
     rows = soup.select('tr.b-statistics__table-row')[1:]
@@ -32,7 +33,7 @@ def get_recent_results():
     if not completed_event_link:
         return {}
 
-    resp_event = requests.get(completed_event_link, headers=headers)
+    resp_event = http_client.get(completed_event_link)
     soup_event = BeautifulSoup(resp_event.content, 'html.parser')
     
     results = {}
@@ -0,0 +1,104 @@
+"""
+Benchmarks the vectorized fight-details cleaner against the row-wise reference
+on synthetic raw data, and checks that both write byte-identical CSVs:
+
+    python -m scripts.benchmark_clean_data
+    python -m scripts.benchmark_clean_data --sizes 10000 100000
+
+The synthetic rows mix the regular ufcstats shapes with the irregular values
+the cleaners have to tolerate ('--', blanks, stray whitespace, malformed stats).
+"""
+import argparse
+import io
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.processing.clean_data import clean_frame
+from tests.test_processing.clean_data_reference import clean_frame_rowwise
+
+DEFAULT_SIZES = [10_000, 1_000_000]
+IRREGULAR_SHARE = 0.02
+
+IRREGULAR = {
+    'stat': ['---', '--', '', '31  of 55', '- of -', '10 of', 'of', '7/12', ' 3 of 9 '],
+    'pct': ['---', '--', '', '5%5', '%', 'abc%', '12.5%', ' 40 % '],
+    'time': ['--', '---', '', '120', '1:2:3', 'x:10', ' 2:05 ', '4.5'],
+    'round': ['', '--', '3.0', '²', '٣'],
+}
+
+def synthetic_raw(n, seed=42):
+    """Raw fight_details rows as they come out of read_csv."""
+    rng = np.random.default_rng(seed)
+
+    def stat(low, high):
+        attempted = rng.integers(low, high, n)
+        landed = (attempted * rng.random(n)).astype(int)
+        return pd.Series([f'{a} of {b}' for a, b in zip(landed, attempted)])
+
+    def pct():
+        return pd.Series([f'{v}%' for v in rng.integers(0, 101, n)])
+
+    def ctrl():
+        return pd.Series([f'{m}:{s:02d}' for m, s in zip(rng.integers(0, 15, n), rng.integers(0, 60, n))])
+
+    def sprinkle(col, kind):
+        col = col.astype(object)
+        mask = rng.random(n) < IRREGULAR_SHARE
+        col[mask] = rng.choice(IRREGULAR[kind], mask.sum())
+        col[rng.random(n) < IRREGULAR_SHARE / 4] = np.nan
+        return col
+
+    df = pd.DataFrame({
+        'event_name': rng.choice(['UFC 300: Pereira vs. Hill', 'UFC Fight Night:\n  Alpha vs. Bravo'], n),
+        'method': rng.choice(['KO/TKO', 'SUB', 'U-DEC', 'S-DEC\r\n'], n),
+        'end_round': sprinkle(pd.Series(rng.integers(1, 6, n).astype(str)), 'round'),
+        'end_time': sprinkle(ctrl(), 'time'),
+        'time_format': '3 Rnd (5-5-5)',
+        'referee': rng.choice(['Herb Dean', '  Marc   Goddard \n', None], n),
+        'method_detail': rng.choice(['Rear Naked Choke', 'Punches to Head \n From Mount', ''], n),
+    })
+    for side in ['f1', 'f2']:
+        df[f'{side}_kd'] = rng.integers(0, 3, n)
+        df[f'{side}_sig_str'] = sprinkle(stat(1, 200), 'stat')
+        df[f'{side}_sig_pct'] = sprinkle(pct(), 'pct')
+        df[f'{side}_tot_str'] = sprinkle(stat(1, 300), 'stat')
+        df[f'{side}_td'] = sprinkle(stat(0, 12), 'stat')
+        df[f'{side}_td_pct'] = sprinkle(pct(), 'pct')
+        df[f'{side}_ctrl'] = sprinkle(ctrl(), 'time')
+
+    # Round-trip through CSV so column dtypes match what clean_data() reads.
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False)
+    buffer.seek(0)
+    return pd.read_csv(buffer)
+
+def timed(fn, df):
+    start = time.perf_counter()
+    result = fn(df)
+    return result, time.perf_counter() - start
+
+def benchmark(sizes):
+    print(f"{'Rows':>10}{'Row-wise s':>12}{'Vectorized s':>14}{'Speedup':>9}  Output")
+    mismatches = []
+    for n in sizes:
+        raw = synthetic_raw(n)
+        reference, reference_time = timed(clean_frame_rowwise, raw)
+        vectorized, vectorized_time = timed(clean_frame, raw)
+
+        identical = reference.to_csv(index=False) == vectorized.to_csv(index=False)
+        if not identical:
+            mismatches.append(n)
+        print(f"{n:>10}{reference_time:>12.2f}{vectorized_time:>14.2f}{reference_time / vectorized_time:>8.1f}x  "
+              f"{'identical' if identical else 'DIFFERS'}")
+
+    if mismatches:
+        raise SystemExit(f"Vectorized output differs from the row-wise reference at {mismatches} rows.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark clean_data's vectorized cleaner")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Row counts to benchmark")
+    args = parser.parse_args()
+
+    benchmark(args.sizes)
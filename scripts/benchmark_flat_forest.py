@@ -0,0 +1,66 @@
+"""
+Benchmarks predict_proba latency of the flat-array forest against sklearn's
+RandomForestClassifier at serving batch sizes (one matchup, one card) and at
+a bulk size, and checks both return the same probabilities:
+
+    python -m scripts.benchmark_flat_forest
+    python -m scripts.benchmark_flat_forest --model models/ufc_random_forest.pkl --batches 1 14 10000
+
+Without --model it trains a forest with train.py's settings on synthetic data.
+"""
+import argparse
+import time
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from src.ml.flat_forest import FlatForest
+
+DEFAULT_BATCHES = [1, 14, 10_000]
+TRAINING_ROWS = 16_000
+N_FEATURES = 33
+
+def synthetic_forest(seed=42):
+    rng = np.random.default_rng(seed)
+    X = rng.random((TRAINING_ROWS, N_FEATURES))
+    y = (X[:, :3].sum(axis=1) + rng.normal(0, 0.5, TRAINING_ROWS) > 1.5).astype(int)
+    return RandomForestClassifier(n_estimators=100, max_depth=15, random_state=42).fit(X, y)
+
+def median_ms(fn, X, repeats):
+    fn(X)
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(X)
+        times.append(time.perf_counter() - start)
+    return np.median(times) * 1000
+
+def benchmark(forest, batches, seed=0):
+    flat = FlatForest.from_sklearn(forest)
+    print(f"{len(forest.estimators_)} trees, {flat.n_nodes} nodes, depth {flat.depth}")
+    print(f"{'Batch':>8}{'sklearn ms':>12}{'Flat ms':>10}{'Speedup':>9}  Max abs diff")
+
+    rng = np.random.default_rng(seed)
+    mismatches = []
+    for n in batches:
+        X = rng.random((n, forest.n_features_in_))
+        repeats = max(3, min(200, 20_000 // n))
+        sklearn_ms = median_ms(forest.predict_proba, X, repeats)
+        flat_ms = median_ms(flat.predict_proba, X, repeats)
+
+        diff = np.abs(forest.predict_proba(X) - flat.predict_proba(X)).max()
+        if diff > 1e-9 or (forest.predict(X) != flat.predict(X)).any():
+            mismatches.append(n)
+        print(f"{n:>8}{sklearn_ms:>12.3f}{flat_ms:>10.3f}{sklearn_ms / flat_ms:>8.1f}x  {diff:.1e}")
+
+    if mismatches:
+        raise SystemExit(f"Flat forest differs from sklearn at batch sizes {mismatches}.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the flat-array forest evaluator")
+    parser.add_argument('--model', help="Trained forest to benchmark (default: a synthetic one)")
+    parser.add_argument('--batches', type=int, nargs='+', default=DEFAULT_BATCHES, help="Batch sizes to time")
+    args = parser.parse_args()
+
+    benchmark(joblib.load(args.model) if args.model else synthetic_forest(), args.batches)
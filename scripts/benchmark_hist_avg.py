@@ -0,0 +1,85 @@
+"""
+Benchmarks the grouped-cumsum kernel behind the *_hist_avg columns against
+the per-fighter `transform(lambda ...)` calls it replaced, on synthetic
+balanced fights, and checks both give the same averages:
+
+    python -m scripts.benchmark_hist_avg
+    python -m scripts.benchmark_hist_avg --fights 8000 80000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.processing.fighter_state import prior_mean
+
+DEFAULT_FIGHTS = [8_000, 80_000]
+STATS = ['kd', 'sig_str_landed', 'td_landed', 'ctrl', 'sig_pct']
+FIGHTERS_PER_FIGHT = 0.3
+
+def synthetic_balanced(fights, seed=42):
+    """Both orientations of `fights` random bouts, sorted by date like train.feature_engineering."""
+    rng = np.random.default_rng(seed)
+    names = np.array([f'Fighter {i}' for i in range(max(2, int(fights * FIGHTERS_PER_FIGHT)))])
+    rows = 2 * fights
+    df = pd.DataFrame({
+        'event_date': np.repeat(np.sort(rng.integers(0, 10_000, fights)), 2),
+        'f1_name': rng.choice(names, rows),
+        'f2_name': rng.choice(names, rows),
+    })
+    for side in ('f1', 'f2'):
+        for stat in STATS:
+            values = rng.random(rows) * 100
+            values[rng.random(rows) < 0.02] = np.nan
+            df[f'{side}_{stat}'] = values
+    return df
+
+def lambda_averages(df):
+    out = {}
+    for side in ('f1', 'f2'):
+        for stat in STATS:
+            col = f'{side}_{stat}'
+            out[col + '_hist_avg'] = df.groupby(f'{side}_name')[col].transform(lambda x: x.shift(1).expanding().mean())
+    return pd.DataFrame(out)
+
+def kernel_averages(df):
+    long_df = pd.concat(
+        [df[[f'{side}_name'] + [f'{side}_{s}' for s in STATS]].set_axis(['name'] + STATS, axis=1) for side in ('f1', 'f2')],
+        keys=['f1', 'f2'],
+    )
+    averages = prior_mean(long_df[STATS], [long_df.index.get_level_values(0), long_df['name']])
+    out = {}
+    for side in ('f1', 'f2'):
+        for stat in STATS:
+            out[f'{side}_{stat}_hist_avg'] = averages.loc[side, stat].to_numpy()
+    return pd.DataFrame(out, index=df.index)
+
+def timed(fn, df):
+    start = time.perf_counter()
+    result = fn(df)
+    return result, time.perf_counter() - start
+
+def benchmark(sizes):
+    print(f"{'Fights':>10}{'Lambda s':>10}{'Kernel s':>10}{'Speedup':>9}  Max abs diff")
+    mismatches = []
+    for n in sizes:
+        df = synthetic_balanced(n)
+        reference, reference_time = timed(lambda_averages, df)
+        kernel, kernel_time = timed(kernel_averages, df)
+
+        same_nans = (reference.isna() == kernel.isna()).all().all()
+        diff = np.nanmax(np.abs(reference.to_numpy() - kernel.to_numpy()))
+        if not same_nans or diff > 1e-9:
+            mismatches.append(n)
+        print(f"{n:>10}{reference_time:>10.2f}{kernel_time:>10.3f}{reference_time / kernel_time:>8.0f}x  {diff:.1e}")
+
+    if mismatches:
+        raise SystemExit(f"Kernel averages differ from the groupby reference at {mismatches} fights.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the historical-average kernel")
+    parser.add_argument('--fights', type=int, nargs='+', default=DEFAULT_FIGHTS, help="Fight counts to benchmark")
+    args = parser.parse_args()
+
+    benchmark(args.fights)
@@ -0,0 +1,85 @@
+"""
+Micro-benchmark for the scraper parsers: pages/sec per backend, full tree vs.
+the partial tree each extractor actually reads, on saved pages.
+
+    python -m scripts.benchmark_parsing
+    python -m scripts.benchmark_parsing --fight-pages 'pages/fight-*.html' --fighter-pages 'pages/fighter-*.html'
+
+It also checks that every combination extracts exactly the same records as the
+reference (html.parser, full tree) and fails loudly if one does not.
+"""
+import argparse
+import glob
+import time
+from unittest import mock
+
+from src.scraper import details, fighters
+from src.scraper.parsing import available_backends
+
+FIXTURES_DIR = 'tests/fixtures/pages'
+MIN_SECONDS = 1.0
+
+def load_pages(pattern):
+    pages = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+    return pages
+
+def extractors():
+    return {
+        'fight': (details, 'fight_details_filter', lambda page, backend: details.parse_fight_stats(page, backend)),
+        'fighter': (fighters, 'fighter_details_filter', lambda page, backend: fighters.parse_fighter_details(page, 'url', backend)),
+    }
+
+def run(parse, pages, backend):
+    """Parses `pages` repeatedly for at least MIN_SECONDS; returns (pages/sec, records)."""
+    records = [parse(page, backend) for page in pages]
+    done = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < MIN_SECONDS:
+        for page in pages:
+            parse(page, backend)
+        done += len(pages)
+    return done / elapsed, records
+
+def benchmark(pages_by_kind):
+    failures = []
+    print(f"{'Page':<9}{'Backend':<13}{'Tree':<9}{'Pages/s':>10}{'Speedup':>9}  Output")
+    for kind, (module, filter_name, parse) in extractors().items():
+        pages = pages_by_kind[kind]
+        if not pages:
+            print(f"{kind:<9}no pages found, skipped")
+            continue
+
+        reference_rate, reference = None, None
+        for backend in available_backends():
+            for tree in ['full', 'partial']:
+                if tree == 'full':
+                    with mock.patch.object(module, filter_name, lambda: None):
+                        rate, records = run(parse, pages, backend)
+                else:
+                    rate, records = run(parse, pages, backend)
+
+                # html.parser on the full tree comes first and is the reference.
+                if reference is None:
+                    reference_rate, reference = rate, records
+
+                identical = records == reference
+                if not identical:
+                    failures.append(f"{kind}/{backend}/{tree}")
+                print(f"{kind:<9}{backend:<13}{tree:<9}{rate:>10.0f}{rate / reference_rate:>8.1f}x  "
+                      f"{'identical' if identical else 'DIFFERS'}")
+
+    if 'lxml' not in available_backends():
+        print("\nlxml is not installed; only html.parser was measured.")
+    if failures:
+        raise SystemExit(f"Output differs from the reference parse for: {', '.join(failures)}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the scraper HTML parsers")
+    parser.add_argument('--fight-pages', default=f'{FIXTURES_DIR}/fight_details*.html', help="Glob of saved fight pages")
+    parser.add_argument('--fighter-pages', default=f'{FIXTURES_DIR}/fighter_details*.html', help="Glob of saved fighter pages")
+    args = parser.parse_args()
+
+    benchmark({'fight': load_pages(args.fight_pages), 'fighter': load_pages(args.fighter_pages)})
@@ -0,0 +1,210 @@
+"""
+End-to-end scraper benchmark against the local fixture server.
+
+Runs events -> fights -> fighters -> details in a scratch directory, each as its
+own process like the pipeline does, and reports pages/sec, p50/p99 request
+latency, peak memory and output rows per stage:
+
+    python -m scripts.benchmark_scrapers --events 30 --latency 0.02 --error-rate 0.01
+    python -m scripts.benchmark_scrapers --pipelined --output run.json --baseline main.json
+
+With --baseline, exits non-zero when a stage is slower, or uses more memory,
+than the baseline run by more than --tolerance.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from scripts.fixture_server import SyntheticSite, add_server_arguments, server_from_args
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STAGES = [
+    ('events', 'src.scraper.events', 'data/raw/all_events.csv'),
+    ('fights', 'src.scraper.fights', 'data/raw/all_fights.csv'),
+    ('fighters', 'src.scraper.fighters', 'data/raw/fighter_details.csv'),
+    ('details', 'src.scraper.details', 'data/raw/fight_details.csv'),
+]
+DEFAULT_TOLERANCE = 0.2
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))]
+
+def count_rows(path):
+    try:
+        return len(pd.read_csv(path))
+    except (FileNotFoundError, pd.errors.EmptyDataError):
+        return 0
+
+def wait_with_rusage(proc):
+    """Waits for `proc` and returns its peak RSS in MB (None where wait4 is unavailable)."""
+    if not hasattr(os, 'wait4'):
+        proc.wait()
+        return None
+    _, status, rusage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    return rusage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+def run_stage(name, module, args, workdir, base_url):
+    stats_file = os.path.join(workdir, f'{name}.http.json')
+    env = dict(os.environ)
+    env.update({
+        'PYTHONPATH': os.pathsep.join(filter(None, [REPO_ROOT, env.get('PYTHONPATH')])),
+        'UFCSTATS_BASE_URL': base_url,
+        'HTTP_CACHE_MODE': 'off',
+        'HTTP_ARCHIVE': '0',
+        'HTTP_STATS_FILE': stats_file,
+    })
+
+    with open(os.path.join(workdir, f'{name}.log'), 'w', encoding='utf-8') as log:
+        start = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, '-m', module, *args], cwd=workdir, env=env,
+                                stdout=log, stderr=subprocess.STDOUT)
+        peak_mb = wait_with_rusage(proc)
+        elapsed = time.perf_counter() - start
+
+    try:
+        with open(stats_file, 'r', encoding='utf-8') as f:
+            http = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        http = {'status_counts': {}, 'latencies': []}
+
+    pages = http['status_counts'].get('200', 0)
+    return {
+        'stage': name,
+        'exit_code': proc.returncode,
+        'seconds': elapsed,
+        'pages': pages,
+        'pages_per_sec': pages / elapsed if elapsed > 0 else 0.0,
+        'requests': sum(http['status_counts'].values()),
+        'p50_ms': percentile(http['latencies'], 50) * 1000,
+        'p99_ms': percentile(http['latencies'], 99) * 1000,
+        'peak_mb': peak_mb,
+        'latencies': http['latencies'],
+    }
+
+def expected_rows(site):
+    """Rows each stage should produce for a SyntheticSite (the upcoming event is never scraped)."""
+    completed = site.events[1:]
+    fights = [site.fights[f] for event in completed for f in event['fights']]
+    fighters = {f['winner_id'] for f in fights} | {f['loser_id'] for f in fights}
+    return {'events': len(completed), 'fights': len(fights), 'fighters': len(fighters), 'details': len(fights)}
+
+def run(server, stage_args, site=None):
+    results = []
+    expected = expected_rows(site) if isinstance(site, SyntheticSite) else {}
+
+    with tempfile.TemporaryDirectory(prefix='scraper-bench-') as workdir:
+        for name, module, output in STAGES:
+            result = run_stage(name, module, stage_args.get(name, []), workdir, server.base_url)
+            result['rows'] = count_rows(os.path.join(workdir, output))
+            result['expected_rows'] = expected.get(name)
+            results.append(result)
+            if result['exit_code'] != 0:
+                with open(os.path.join(workdir, f'{name}.log'), 'r', encoding='utf-8') as f:
+                    print(f.read()[-2000:])
+                break
+
+    return results
+
+def summarize(results):
+    latencies = [x for r in results for x in r['latencies']]
+    seconds = sum(r['seconds'] for r in results)
+    pages = sum(r['pages'] for r in results)
+    peaks = [r['peak_mb'] for r in results if r['peak_mb'] is not None]
+    return {
+        'stage': 'total',
+        'seconds': seconds,
+        'pages': pages,
+        'pages_per_sec': pages / seconds if seconds > 0 else 0.0,
+        'requests': sum(r['requests'] for r in results),
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'peak_mb': max(peaks) if peaks else None,
+        'rows': None,
+        'expected_rows': None,
+    }
+
+def print_table(rows):
+    print(f"\n{'Stage':<10}{'Pages':>7}{'Requests':>10}{'Seconds':>9}{'Pages/s':>9}{'p50 ms':>8}{'p99 ms':>8}{'Peak MB':>9}  Rows")
+    for r in rows:
+        peak = f"{r['peak_mb']:.0f}" if r['peak_mb'] is not None else '-'
+        if r['rows'] is None:
+            rows_text = ''
+        elif r['expected_rows'] is None:
+            rows_text = str(r['rows'])
+        else:
+            rows_text = f"{r['rows']}/{r['expected_rows']}"
+        print(f"{r['stage']:<10}{r['pages']:>7}{r['requests']:>10}{r['seconds']:>9.1f}{r['pages_per_sec']:>9.1f}"
+              f"{r['p50_ms']:>8.0f}{r['p99_ms']:>8.0f}{peak:>9}  {rows_text}")
+
+def compare(rows, baseline, tolerance):
+    """Returns a description of every metric that regressed beyond `tolerance` against `baseline`."""
+    previous = {r['stage']: r for r in baseline}
+    regressions = []
+    for r in rows:
+        old = previous.get(r['stage'])
+        if old is None:
+            continue
+        if old['pages_per_sec'] and r['pages_per_sec'] < old['pages_per_sec'] * (1 - tolerance):
+            regressions.append(f"{r['stage']}: {r['pages_per_sec']:.1f} pages/s (baseline {old['pages_per_sec']:.1f})")
+        if old['p99_ms'] and r['p99_ms'] > old['p99_ms'] * (1 + tolerance):
+            regressions.append(f"{r['stage']}: p99 {r['p99_ms']:.0f}ms (baseline {old['p99_ms']:.0f}ms)")
+        if old.get('peak_mb') and r['peak_mb'] and r['peak_mb'] > old['peak_mb'] * (1 + tolerance):
+            regressions.append(f"{r['stage']}: peak {r['peak_mb']:.0f}MB (baseline {old['peak_mb']:.0f}MB)")
+    return regressions
+
+def main(args):
+    stage_args = {'events': ['--full']}
+    if args.pipelined:
+        stage_args['fighters'] = ['--pipelined']
+        stage_args['details'] = ['--pipelined']
+    elif args.concurrent:
+        stage_args['details'] = ['--concurrent']
+
+    server = server_from_args(args)
+    with server:
+        print(f"Fixture server on {server.base_url}")
+        results = run(server, stage_args, server.site)
+        print(f"Server responses: {dict(server.status_counts)}")
+
+    rows = [{k: v for k, v in r.items() if k not in ('latencies', 'exit_code')} for r in results]
+    rows.append(summarize(results))
+    print_table(rows)
+
+    failed = [r['stage'] for r in results if r['exit_code'] != 0]
+    if failed:
+        raise SystemExit(f"Stage {failed[0]} exited with code {results[-1]['exit_code']}.")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(rows, json.load(f), args.tolerance)
+        if regressions:
+            raise SystemExit("Regressions against the baseline:\n  " + "\n  ".join(regressions))
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers end to end against a local fixture server")
+    add_server_arguments(parser)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--pipelined', action='store_true', help="Run fighters and details with --pipelined")
+    mode.add_argument('--concurrent', action='store_true', help="Run details with --concurrent")
+    parser.add_argument('--output', help="Write the results to this JSON file")
+    parser.add_argument('--baseline', help="Compare against a previous --output file")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help="Allowed regression, as a fraction")
+
+    main(parser.parse_args())
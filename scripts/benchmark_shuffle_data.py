@@ -0,0 +1,181 @@
+"""
+Benchmarks the chunked balanced-dataset writer against the copy-per-orientation
+reference on synthetic merged data: time, peak traced memory, and whether both
+write byte-identical CSVs:
+
+    python -m scripts.benchmark_shuffle_data
+    python -m scripts.benchmark_shuffle_data --fights 10000 200000
+"""
+import argparse
+import filecmp
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from src.processing.shuffle_data import BIO_COLS, balanced_chunks, corner_sources, output_columns
+
+DEFAULT_FIGHTS = [10_000, 200_000]
+STATS = ['kd', 'sig_str_landed', 'sig_str_attempted', 'sig_pct', 'tot_str_landed', 'tot_str_attempted',
+         'td_landed', 'td_attempted', 'td_pct', 'ctrl']
+
+def synthetic_merged(fights, seed=42):
+    """merged_data rows as they come out of read_csv: f1/f2 fight stats, winner/loser names and bios."""
+    rng = np.random.default_rng(seed)
+    names = np.array([f'Fighter {i}' for i in range(max(2, fights // 3))])
+    winner, loser = rng.choice(names, fights), rng.choice(names, fights)
+    f1_is_winner = rng.random(fights) < 0.9
+
+    df = pd.DataFrame({
+        'event_date': pd.Timestamp('2000-01-01') + pd.to_timedelta(rng.integers(0, 9000, fights), unit='D'),
+        'f1_name': np.where(f1_is_winner, winner, loser),
+        'f2_name': np.where(f1_is_winner, loser, winner),
+        'winner': winner,
+        'loser': loser,
+        'winner_link': [f'http://ufcstats.com/fighter-details/{w}' for w in winner],
+        'loser_link': [f'http://ufcstats.com/fighter-details/{l}' for l in loser],
+        'weight_class': rng.choice(['Lightweight', 'Welterweight', 'Heavyweight'], fights),
+        'method_detail': rng.choice(['Rear Naked Choke', 'Punches', ''], fights),
+        'referee': rng.choice(['Herb Dean', 'Marc Goddard'], fights),
+        'total_time_seconds': rng.integers(10, 1500, fights),
+    })
+    for side in ('f1', 'f2'):
+        for stat in STATS:
+            df[f'{side}_{stat}'] = rng.integers(0, 200, fights)
+    for corner in ('winner', 'loser'):
+        for bio in BIO_COLS:
+            df[f'{corner}_{bio}'] = rng.choice(['Orthodox', 'Southpaw']) if bio == 'stance' else rng.random(fights) * 100
+
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False)
+    buffer.seek(0)
+    return pd.read_csv(buffer)
+
+def balanced_frame_copying(df):
+    """
+    Reference implementation of shuffle_data's balanced dataset: builds
+    winner_/loser_ columns, copies the frame once per orientation and
+    concatenates them. Columns come out in `balanced_chunks`' order.
+    """
+    df = df.copy()
+
+    stat_cols = [c for c in df.columns if c.startswith('f1_') and 'name' not in c and 'link' not in c and 'id' not in c]
+    base_stats = [c.replace('f1_', '') for c in stat_cols]
+
+    bio_cols = ['height', 'weight', 'reach', 'stance', 'age']
+
+    mask_f1_winner = df['f1_name'] == df['winner']
+
+    for stat in base_stats:
+        df[f'winner_{stat}'] = np.where(mask_f1_winner, df[f'f1_{stat}'], df[f'f2_{stat}'])
+        df[f'loser_{stat}']  = np.where(mask_f1_winner, df[f'f2_{stat}'], df[f'f1_{stat}'])
+
+    df_a = df.copy()
+
+    cols_to_drop = [f'f1_{s}' for s in base_stats] + [f'f2_{s}' for s in base_stats]
+    cols_to_drop += ['f1_name', 'f2_name', 'f1_link', 'f2_link']
+    cols_to_drop = [c for c in cols_to_drop if c in df_a.columns]
+    df_a.drop(columns=cols_to_drop, inplace=True)
+
+    map_a = {
+        'winner': 'f1_name', 'loser': 'f2_name',
+        'winner_link': 'f1_link', 'loser_link': 'f2_link',
+    }
+
+    for stat in base_stats:
+        map_a[f'winner_{stat}'] = f'f1_{stat}'
+        map_a[f'loser_{stat}'] = f'f2_{stat}'
+    for bio in bio_cols:
+        map_a[f'winner_{bio}'] = f'f1_{bio}'
+        map_a[f'loser_{bio}'] = f'f2_{bio}'
+
+    df_a = df_a.rename(columns=map_a)
+    df_a['target'] = 1
+
+    df_b = df.copy()
+
+    df_b.drop(columns=cols_to_drop, inplace=True)
+
+    map_b = {
+        'loser': 'f1_name', 'winner': 'f2_name',
+        'loser_link': 'f1_link', 'winner_link': 'f2_link',
+    }
+
+    for stat in base_stats:
+        map_b[f'loser_{stat}'] = f'f1_{stat}'
+        map_b[f'winner_{stat}'] = f'f2_{stat}'
+    for bio in bio_cols:
+        map_b[f'loser_{bio}'] = f'f1_{bio}'
+        map_b[f'winner_{bio}'] = f'f2_{bio}'
+
+    df_b = df_b.rename(columns=map_b)
+    df_b['target'] = 0
+
+    df_final = pd.concat([df_a, df_b], ignore_index=True)
+
+    keep_cols = [
+        'f1_name', 'f2_name', 'f1_link', 'f2_link', 'target',
+        'weight_class', 'total_time_seconds', 'method_detail', 'referee', 'event_date'
+    ]
+
+    stats_final = [c for c in df_final.columns if c.startswith('f1_') or c.startswith('f2_')]
+
+    final_cols_list = list(set(keep_cols + stats_final))
+
+    final_cols_list = [c for c in final_cols_list if c in df_final.columns]
+
+    df_final = df_final[final_cols_list]
+
+    df_final = df_final.loc[:, ~df_final.columns.duplicated()]
+
+    # The columns above come out of a set; put them in balanced_chunks' order.
+    df_final = df_final[[c for c in output_columns(corner_sources(df)) if c in df_final.columns]]
+
+    return df_final.sample(frac=1, random_state=42).reset_index(drop=True)
+
+def write_copying(df, path):
+    balanced_frame_copying(df).to_csv(path, index=False)
+
+def write_chunked(df, path):
+    for i, chunk in enumerate(balanced_chunks(df)):
+        chunk.to_csv(path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+
+def measured(fn, df, path):
+    """Seconds taken and peak traced memory in MB."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn(df, path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+def benchmark(sizes):
+    print(f"{'Fights':>10}{'Copying s':>11}{'Chunked s':>11}{'Copying MB':>12}{'Chunked MB':>12}  Output")
+    mismatches = []
+    with tempfile.TemporaryDirectory() as tmp:
+        reference_path, chunked_path = os.path.join(tmp, 'reference.csv'), os.path.join(tmp, 'chunked.csv')
+        for n in sizes:
+            df = synthetic_merged(n)
+            reference_time, reference_mb = measured(write_copying, df, reference_path)
+            chunked_time, chunked_mb = measured(write_chunked, df, chunked_path)
+
+            identical = filecmp.cmp(reference_path, chunked_path, shallow=False)
+            if not identical:
+                mismatches.append(n)
+            print(f"{n:>10}{reference_time:>11.2f}{chunked_time:>11.2f}{reference_mb:>12.0f}{chunked_mb:>12.0f}  "
+                  f"{'identical' if identical else 'DIFFERS'}")
+
+    if mismatches:
+        raise SystemExit(f"Chunked output differs from the copying reference at {mismatches} fights.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark shuffle_data's chunked writer")
+    parser.add_argument('--fights', type=int, nargs='+', default=DEFAULT_FIGHTS, help="Fight counts to benchmark")
+    args = parser.parse_args()
+
+    benchmark(args.fights)
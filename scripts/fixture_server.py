@@ -0,0 +1,446 @@
+"""
+Local stand-in for ufcstats.com, for benchmarking and load-testing the scrapers.
+
+Serves either a synthetic site generated from a seed (SyntheticSite) or pages
+recorded in the scraper's response cache (RecordedSite), with optional latency,
+error injection and throttling:
+
+    python -m scripts.fixture_server --events 50 --latency 0.05 --error-rate 0.02 --max-rps 40
+
+Point the scrapers at it with UFCSTATS_BASE_URL=http://127.0.0.1:8765.
+"""
+import argparse
+import random
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from src.scraper.http_cache import ResponseCache
+
+DEFAULT_PORT = 8765
+LISTING_PAGE_SIZE = 25
+PAGE_PADDING_KB = 32
+ORIGIN = 'http://ufcstats.com'
+
+FIRST_NAMES = ['Alex', 'Bruno', 'Carlos', 'Daniel', 'Elias', 'Felipe', 'Gabriel', 'Henry', 'Igor', 'Jamal',
+               'Kai', 'Leon', 'Marcus', 'Nikolai', 'Omar', 'Paulo', 'Rafael', 'Sean', 'Tiago', 'Yuri']
+LAST_NAMES = ['Almeida', 'Barros', 'Costa', 'Dvalishvili', 'Edwards', 'Fernandes', 'Gomes', 'Holloway',
+              'Ivanov', 'Jones', 'Kowalski', 'Lopes', 'Moreno', 'Nunes', "O'Malley", 'Pereira', 'Silva', 'Usman']
+WEIGHT_CLASSES = ['Flyweight', 'Bantamweight', 'Featherweight', 'Lightweight', 'Welterweight',
+                  'Middleweight', 'Light Heavyweight', 'Heavyweight']
+METHODS = [('KO/TKO', 'Punches'), ('SUB', 'Rear Naked Choke'), ('U-DEC', ''), ('S-DEC', ''), ('SUB', 'Guillotine Choke')]
+STANCES = ['Orthodox', 'Southpaw', 'Switch']
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>{title} | UFC Stats</title>
+</head>
+<body class="b-page">
+  <header class="b-statistics__header">
+    <a class="b-logo" href="{base}/statistics/events/completed">UFC Stats</a>
+    <ul class="b-statistics__nav-items">{padding}</ul>
+  </header>
+  <section class="b-statistics__section_details">
+    <div class="l-page__container">
+{body}
+    </div>
+  </section>
+</body>
+</html>
+"""
+
+LISTING_ROW = """
+      <tr class="b-statistics__table-row">
+        <td class="b-statistics__table-col">
+          <i class="b-statistics__table-content">
+            <a href="{base}/event-details/{event_id}" class="b-link b-link_style_black">{name}</a>
+            <span class="b-statistics__date">{date}</span>
+          </i>{icon}
+        </td>
+        <td class="b-statistics__table-col b-statistics__table-col_style_big-top-padding">{location}</td>
+      </tr>"""
+
+EVENT_ROW = """
+          <tr class="b-fight-details__table-row b-fight-details__table-row__hover js-fight-details-click" data-link="{base}/fight-details/{fight_id}">
+            <td class="b-fight-details__table-col"><p class="b-fight-details__table-text"><a class="b-flag b-flag_style_green" href="{base}/fight-details/{fight_id}"><i class="b-flag__inner"><i class="b-flag__text">win</i></i></a></p></td>
+            <td class="b-fight-details__table-col l-page_align_left">
+              <p class="b-fight-details__table-text"><a class="b-link b-link_style_black" href="{base}/fighter-details/{winner_id}">{winner}</a></p>
+              <p class="b-fight-details__table-text"><a class="b-link b-link_style_black" href="{base}/fighter-details/{loser_id}">{loser}</a></p>
+            </td>
+            <td class="b-fight-details__table-col"><p class="b-fight-details__table-text">{kd}</p><p class="b-fight-details__table-text">0</p></td>
+            <td class="b-fight-details__table-col"><p class="b-fight-details__table-text">{str1}</p><p class="b-fight-details__table-text">{str2}</p></td>
+            <td class="b-fight-details__table-col"><p class="b-fight-details__table-text">{td}</p><p class="b-fight-details__table-text">0</p></td>
+            <td class="b-fight-details__table-col"><p class="b-fight-details__table-text">{sub}</p><p class="b-fight-details__table-text">0</p></td>
+            <td class="b-fight-details__table-col l-page_align_left"><p class="b-fight-details__table-text">
+              {weight_class}
+            </p></td>
+            <td class="b-fight-details__table-col l-page_align_left"><p class="b-fight-details__table-text">{method}</p><p class="b-fight-details__table-text">{method_detail}</p></td>
+            <td class="b-fight-details__table-col"><p class="b-fight-details__table-text">{round}</p></td>
+            <td class="b-fight-details__table-col"><p class="b-fight-details__table-text">{time}</p></td>
+          </tr>"""
+
+STAT_HEADERS = ['Fighter', 'KD', 'Sig. str.', 'Sig. str. %', 'Total str.', 'Td', 'Td %', 'Sub. att', 'Rev.', 'Ctrl']
+STAT_CELL = '<td class="b-fight-details__table-col"><p class="b-fight-details__table-text">{}</p><p class="b-fight-details__table-text">{}</p></td>'
+
+FIGHT_BODY = """      <h2 class="b-content__title"><a class="b-link" href="{base}/event-details/{event_id}">{event_name}</a></h2>
+      <div class="b-fight-details__fight">
+        <div class="b-fight-details__content">
+          <p class="b-fight-details__text">
+            <i class="b-fight-details__text-item_first"><i class="b-fight-details__label">Method:</i> <i style="font-style: normal">{method} </i></i>
+            <i class="b-fight-details__text-item"><i class="b-fight-details__label">Round:</i> {round}</i>
+            <i class="b-fight-details__text-item"><i class="b-fight-details__label">Time:</i> {time}</i>
+            <i class="b-fight-details__text-item"><i class="b-fight-details__label">Time format:</i> 3 Rnd (5-5-5)</i>
+            <i class="b-fight-details__text-item"><i class="b-fight-details__label">Referee:</i> <span>Herb Dean</span></i>
+          </p>
+          <p class="b-fight-details__text"><i class="b-fight-details__label">Details:</i> {method_detail}</p>
+        </div>
+      </div>
+      <section class="b-fight-details__section js-fight-section">
+        <table style="width: 745px">
+          <thead class="b-fight-details__table-head">
+            <tr class="b-fight-details__table-row">{headers}</tr>
+          </thead>
+          <tbody class="b-fight-details__table-body">
+            <tr class="b-fight-details__table-row">
+              <td class="b-fight-details__table-col l-page_align_left">
+                <p class="b-fight-details__table-text"><a class="b-link b-link_style_black" href="{base}/fighter-details/{winner_id}">{winner}</a></p>
+                <p class="b-fight-details__table-text"><a class="b-link b-link_style_black" href="{base}/fighter-details/{loser_id}">{loser}</a></p>
+              </td>
+              {cells}
+            </tr>
+          </tbody>
+        </table>
+      </section>"""
+
+FIGHTER_ITEM = """
+          <li class="b-list__box-list-item b-list__box-list-item_type_block">
+            <i class="b-list__box-item-title b-list__box-item-title_type_width">{label}:</i>
+            {value}
+          </li>"""
+
+FIGHTER_BODY = """      <h2 class="b-content__title">
+        <span class="b-content__title-highlight">{name}</span>
+        <span class="b-content__title-record">Record: {wins}-{losses}-0</span>
+      </h2>
+      <div class="b-list__info-box b-list__info-box_style_small-width js-guide">
+        <ul class="b-list__box-list">{items}
+        </ul>
+      </div>"""
+
+def _padding(kb):
+    """Navigation-style filler so synthetic pages cost about as much to parse as real ones."""
+    item = '<li class="b-statistics__nav-item"><a class="b-statistics__nav-link" href="/statistics/fighters?char=a">A</a></li>'
+    return item * (kb * 1024 // len(item))
+
+class SyntheticSite:
+    """
+    Deterministic fake ufcstats.com: `events` completed events (newest first)
+    plus one upcoming event, each with `fights_per_event` fights between
+    fighters drawn from a pool of `fighters`. Every page is rendered on request
+    in the markup the scrapers parse.
+    """
+
+    def __init__(self, events=20, fights_per_event=10, fighters=None, seed=42, padding_kb=PAGE_PADDING_KB):
+        rng = random.Random(seed)
+        self.seed = seed
+        self.padding = _padding(padding_kb)
+        pool_size = fighters or max(2, events * fights_per_event)
+        self.fighters = {
+            f'f{i:05d}': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}'
+            for i in range(1, pool_size + 1)
+        }
+        fighter_ids = list(self.fighters)
+
+        newest = date(2024, 12, 14)
+        self.events = []
+        self.fights = {}
+        for i in range(events + 1):
+            event_id = f'e{i:05d}'
+            event = {
+                'id': event_id,
+                'name': f'UFC Fight Night {events + 1 - i}',
+                # Index 0 is the upcoming event, a week after the newest completed one.
+                'date': (newest - timedelta(weeks=i - 1)).strftime('%B %d, %Y'),
+                'location': 'Las Vegas, Nevada, USA',
+                'fights': [],
+            }
+            for k in range(fights_per_event):
+                fight_id = f'g{i:05d}{k:03d}'
+                winner_id, loser_id = rng.sample(fighter_ids, 2)
+                method, detail = rng.choice(METHODS)
+                self.fights[fight_id] = {
+                    'id': fight_id, 'event': event,
+                    'winner_id': winner_id, 'loser_id': loser_id,
+                    'weight_class': rng.choice(WEIGHT_CLASSES),
+                    'method': method, 'method_detail': detail,
+                    'round': 3 if 'DEC' in method else rng.randint(1, 3),
+                    'time': '5:00' if 'DEC' in method else f'{rng.randint(0, 4)}:{rng.randint(0, 59):02d}',
+                }
+                event['fights'].append(fight_id)
+            self.events.append(event)
+
+    def render(self, path, query, base):
+        """Returns the page body for `path`, or None for unknown pages."""
+        parts = path.strip('/').split('/')
+        if path.rstrip('/') == '/statistics/events/completed':
+            return self.listing(parse_qs(query).get('page', ['1'])[0], base)
+        if len(parts) == 2 and parts[0] == 'event-details' and (event := self._event(parts[1])):
+            return self.event_page(event, base)
+        if len(parts) == 2 and parts[0] == 'fight-details' and parts[1] in self.fights:
+            return self.fight_page(self.fights[parts[1]], base)
+        if len(parts) == 2 and parts[0] == 'fighter-details' and parts[1] in self.fighters:
+            return self.fighter_page(parts[1], base)
+        return None
+
+    def _event(self, event_id):
+        return next((e for e in self.events if e['id'] == event_id), None)
+
+    def _page(self, title, body, base):
+        return PAGE.format(title=title, body=body, base=base, padding=self.padding).encode('utf-8')
+
+    def listing(self, page, base):
+        if page == 'all':
+            events = self.events
+        else:
+            start = (int(page) - 1) * LISTING_PAGE_SIZE
+            events = self.events[start:start + LISTING_PAGE_SIZE]
+
+        rows = ['\n      <tr class="b-statistics__table-row"><td class="b-statistics__table-col" colspan="2"></td></tr>']
+        for event in events:
+            icon = '\n          <img src="/static/img/next.png" class="b-statistics__icon">' if event is self.events[0] else ''
+            rows.append(LISTING_ROW.format(base=base, event_id=event['id'], name=event['name'],
+                                           date=event['date'], location=event['location'], icon=icon))
+        body = f'      <table class="b-statistics__table-events">{"".join(rows)}\n      </table>'
+        return self._page('Completed Events', body, base)
+
+    def event_page(self, event, base):
+        rows = []
+        for fight_id in event['fights']:
+            fight = self.fights[fight_id]
+            rng = random.Random(f'{self.seed}:{fight_id}')
+            rows.append(EVENT_ROW.format(
+                base=base, fight_id=fight_id,
+                winner_id=fight['winner_id'], winner=self.fighters[fight['winner_id']],
+                loser_id=fight['loser_id'], loser=self.fighters[fight['loser_id']],
+                kd=rng.randint(0, 2), str1=rng.randint(10, 120), str2=rng.randint(10, 120),
+                td=rng.randint(0, 5), sub=rng.randint(0, 3), weight_class=fight['weight_class'],
+                method=fight['method'], method_detail=fight['method_detail'],
+                round=fight['round'], time=fight['time'],
+            ))
+        body = (
+            f'      <h2 class="b-content__title"><span class="b-content__title-highlight">{event["name"]}</span></h2>\n'
+            f'      <table class="b-fight-details__table js-fight-table">\n'
+            f'        <tbody class="b-fight-details__table-body">{"".join(rows)}\n        </tbody>\n      </table>'
+        )
+        return self._page(event['name'], body, base)
+
+    def fight_page(self, fight, base):
+        rng = random.Random(f'{self.seed}:{fight["id"]}')
+        landed = [rng.randint(10, 120), rng.randint(10, 120)]
+        attempted = [n + rng.randint(5, 80) for n in landed]
+        takedowns = [rng.randint(0, 5), rng.randint(0, 5)]
+        cells = [
+            (rng.randint(0, 2), rng.randint(0, 1)),
+            (f'{landed[0]} of {attempted[0]}', f'{landed[1]} of {attempted[1]}'),
+            (f'{landed[0] * 100 // attempted[0]}%', f'{landed[1] * 100 // attempted[1]}%'),
+            (f'{landed[0] + 20} of {attempted[0] + 25}', f'{landed[1] + 20} of {attempted[1] + 25}'),
+            (f'{takedowns[0]} of {takedowns[0] + 2}', f'{takedowns[1]} of {takedowns[1] + 3}'),
+            (f'{takedowns[0] * 100 // (takedowns[0] + 2)}%', f'{takedowns[1] * 100 // (takedowns[1] + 3)}%'),
+            (rng.randint(0, 3), rng.randint(0, 3)),
+            (rng.randint(0, 1), rng.randint(0, 1)),
+            (f'{rng.randint(0, 9)}:{rng.randint(0, 59):02d}', f'{rng.randint(0, 9)}:{rng.randint(0, 59):02d}'),
+        ]
+        body = FIGHT_BODY.format(
+            base=base, event_id=fight['event']['id'], event_name=fight['event']['name'],
+            method=fight['method'], method_detail=fight['method_detail'],
+            round=fight['round'], time=fight['time'],
+            winner_id=fight['winner_id'], winner=self.fighters[fight['winner_id']],
+            loser_id=fight['loser_id'], loser=self.fighters[fight['loser_id']],
+            headers=''.join(f'<th class="b-fight-details__table-col">{h}</th>' for h in STAT_HEADERS),
+            cells='\n              '.join(STAT_CELL.format(a, b) for a, b in cells),
+        )
+        return self._page(fight['event']['name'], body, base)
+
+    def fighter_page(self, fighter_id, base):
+        rng = random.Random(f'{self.seed}:{fighter_id}')
+        height = rng.randint(63, 78)
+        items = [
+            ('Height', f'{height // 12}\' {height % 12}"'),
+            ('Weight', f'{rng.choice([125, 135, 145, 155, 170, 185, 205, 245])} lbs.'),
+            ('Reach', f'{height + rng.randint(-2, 5)}"'),
+            ('STANCE', rng.choice(STANCES)),
+            ('DOB', date(rng.randint(1980, 2002), rng.randint(1, 12), rng.randint(1, 28)).strftime('%b %d, %Y')),
+        ]
+        body = FIGHTER_BODY.format(
+            name=self.fighters[fighter_id], wins=rng.randint(5, 30), losses=rng.randint(0, 10),
+            items=''.join(FIGHTER_ITEM.format(label=label, value=value) for label, value in items),
+        )
+        return self._page(self.fighters[fighter_id], body, base)
+
+class RecordedSite:
+    """
+    Serves pages recorded in the scraper response cache, rewriting links to
+    `origin` so the scrapers keep following them to this server.
+    """
+
+    def __init__(self, cache_root=None, origin=ORIGIN):
+        self.cache = ResponseCache(root=cache_root, mode='replay')
+        self.origin = origin
+
+    def render(self, path, query, base):
+        url = self.origin + path + (f'?{query}' if query else '')
+        content = self.cache.get(url)
+        if content is None:
+            return None
+        return content.replace(self.origin.encode('utf-8'), base.encode('utf-8'))
+
+class TokenBucket:
+    """Allows `rate` requests per second on average, in bursts of up to `burst`."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+class FixtureServer:
+    """
+    Threaded HTTP server for a site object exposing `render(path, query, base)`,
+    which returns the page body (links pointing at `base`) or None for a 404.
+
+    Every response is delayed by `latency` seconds plus up to `jitter` more.
+    A fraction `error_rate` of requests fail with a 503, and requests above
+    `max_rps` are answered with a 429 and a Retry-After header. Served
+    requests are counted per status in `status_counts`.
+    """
+
+    def __init__(self, site, host='127.0.0.1', port=0, latency=0.0, jitter=0.0, error_rate=0.0, max_rps=None, seed=0):
+        self.site = site
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.bucket = TokenBucket(max_rps) if max_rps else None
+        self.status_counts = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                status, headers, body = server.respond(self.path)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def _fault(self):
+        with self._lock:
+            delay = self.latency + self._rng.uniform(0, self.jitter) if self.latency or self.jitter else 0.0
+            failed = self.error_rate > 0 and self._rng.random() < self.error_rate
+        return delay, failed
+
+    def respond(self, raw_path):
+        """Returns (status, headers, body) for a request path, applying the configured faults."""
+        if self.bucket is not None and not self.bucket.take():
+            status, headers, body = 429, {'Retry-After': '1'}, b'Too Many Requests'
+        else:
+            delay, failed = self._fault()
+            if delay:
+                time.sleep(delay)
+            if failed:
+                status, headers, body = 503, {}, b'Service Unavailable'
+            else:
+                url = urlsplit(raw_path)
+                content = self.site.render(url.path, url.query, self.base_url)
+                if content is None:
+                    status, headers, body = 404, {}, b'Not Found'
+                else:
+                    status, headers, body = 200, {'Content-Type': 'text/html; charset=utf-8'}, content
+
+        with self._lock:
+            self.status_counts[status] += 1
+        return status, headers, body
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def add_server_arguments(parser):
+    parser.add_argument('--events', type=int, default=20, help="Completed events on the synthetic site")
+    parser.add_argument('--fights-per-event', type=int, default=10, help="Fights on every synthetic event")
+    parser.add_argument('--fighters', type=int, default=None, help="Size of the synthetic fighter pool")
+    parser.add_argument('--padding-kb', type=int, default=PAGE_PADDING_KB, help="Filler added to every synthetic page")
+    parser.add_argument('--recorded', metavar='CACHE_DIR', help="Serve pages recorded in this response cache instead")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Up to this many extra seconds per response")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with a 503")
+    parser.add_argument('--max-rps', type=float, default=None, help="Answer requests above this rate with a 429")
+
+def server_from_args(args, port=0):
+    if args.recorded:
+        site = RecordedSite(args.recorded)
+    else:
+        site = SyntheticSite(args.events, args.fights_per_event, args.fighters, padding_kb=args.padding_kb)
+    return FixtureServer(site, port=port, latency=args.latency, jitter=args.jitter,
+                         error_rate=args.error_rate, max_rps=args.max_rps)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for ufcstats.com")
+    add_server_arguments(parser)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    server = server_from_args(args, args.port)
+    print(f"Serving on {server.base_url} (UFCSTATS_BASE_URL={server.base_url}). Press Ctrl+C to stop.")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
@@ -1,6 +1,7 @@
 import asyncio
 import datetime
 import discord
+import pandas as pd
 from discord.ext import commands, tasks
 
 from src.core.config import settings
@@ -13,11 +14,11 @@ from src.db import (
     get_last_event_predictions
 )
 
-from src.ml.predict import predict_winner, get_fighter_profile
+from src.ml.predict import predict_many, get_fighter_profile, unknown_fighters
+from src.ml.prediction_cache import prediction_cache
 
 from src.scraper.events import get_event_fights, get_next_event
 from scripts.auditor import audit_predictions
-import pandas as pd
 
 logger = get_logger(__name__)
 
@@ -51,7 +52,7 @@ async def predict_fight(ctx, *, args: str):
         fighter_1, fighter_2, weight_class = parts
         message_status = await ctx.send(f"Preparing prediction for: {fighter_1} vs {fighter_2} in {weight_class} category...")
 
-        result = predict_winner(fighter_1, fighter_2, weight_class)
+        result = predict_many([(fighter_1, fighter_2, weight_class)])[0]
 
         if result:
             winner = result['winner']
@@ -69,6 +70,15 @@ async def predict_fight(ctx, *, args: str):
             embed.set_footer(text="This prediction is based on historical data and machine learning. Not a guarantee of the actual fight outcome!")    
 
             await message_status.edit(content=None, embed=embed)
+            return
+
+        unknown = unknown_fighters([fighter_1, fighter_2])
+        if unknown:
+            hints = "".join(
+                f" Did you mean {', '.join(suggestions)} for **{name}**?"
+                for name, suggestions in unknown.items() if suggestions
+            )
+            await message_status.edit(content=f"Could not find profiles for one or both fighters.{hints}")
         else:
             await message_status.edit(content="Could not calculate prediction. Check if fighters exist in database.")
 
@@ -141,10 +151,11 @@ async def next_event(ctx):
         return
 
     fields = []
-    for fighter_1, fighter_2, weight_class in fights:
-        
-        result = predict_winner(fighter_1, fighter_2, weight_class)
-
+    # Fighters are aged to fight night, so their ring rust matches the card.
+    fight_day = pd.to_datetime(event_date, errors='coerce')
+    results = predict_many([(fighter_1, fighter_2, weight_class) for fighter_1, fighter_2, weight_class in fights],
+                           as_of=None if pd.isna(fight_day) else fight_day)
+    for (fighter_1, fighter_2, weight_class), result in zip(fights, results):
         if result:
             winner = result['winner']
             confiability = result['confidence'] / 100.0
@@ -156,9 +167,14 @@ async def next_event(ctx):
                 f"Predicted Winner: **{winner}** with AI Confidence of {confiability:.2%}"
             ))
         else:
+            unknown = unknown_fighters([fighter_1, fighter_2])
+            hints = "".join(
+                f"\nNo profile for **{name}**" + (f" (did you mean {', '.join(suggestions)}?)" if suggestions else ".")
+                for name, suggestions in unknown.items()
+            )
             fields.append((
                 f"{fighter_1} vs {fighter_2} ({weight_class})",
-                "Could not retrieve profiles for one or both fighters. Skipping prediction."
+                "Could not retrieve profiles for one or both fighters. Skipping prediction." + hints
             ))
 
     await _send_event_embeds(ctx, status_message, event_name, event_date, fields)
@@ -189,6 +205,13 @@ async def show_stats(ctx):
         
         embed.add_field(name="⏳ Pending", value=f"I have **{total_pendentes}** predictions made waiting for the fight to happen.", inline=False)
 
+        cache = prediction_cache.stats()
+        embed.add_field(
+            name="🧠 Prediction Cache",
+            value=f"{cache['hits']} hits / {cache['misses']} misses since start ({cache['hit_rate']:.0%} answered without the model).",
+            inline=False
+        )
+
         embed.set_footer(text="The results auditor runs automatically every Sunday at 15:00.")
 
         await ctx.send(embed=embed)
@@ -244,12 +267,12 @@ async def fighter_profile(ctx, *, fighter_name: str):
     Shows the profile of a specific fighter.
     """
     try:
-        historical_df = pd.read_csv('data/processed/balanced_fights.csv')
-        fighter_name = fighter_name.title()
-        profile = get_fighter_profile(fighter_name, historical_df)
+        profile = get_fighter_profile(fighter_name)
 
         if not profile:
-            await ctx.send(f"Could not find a profile for **{fighter_name}**. Please check the name and try again.")
+            suggestions = unknown_fighters([fighter_name]).get(fighter_name)
+            hint = f"Did you mean: {', '.join(suggestions)}?" if suggestions else "Please check the name and try again."
+            await ctx.send(f"Could not find a profile for **{fighter_name}**. {hint}")
             return
         
         embed = discord.Embed(
@@ -261,8 +284,8 @@ async def fighter_profile(ctx, *, fighter_name: str):
         embed.add_field(name="Age", value=f"{int(profile['age'])} anos", inline=True)
         embed.add_field(name="Height", value=f"{profile['height']} cm", inline=True)
         embed.add_field(name="Reach", value=f"{profile['reach']} cm", inline=True)
-        embed.add_field(name="Win Streak", value=f"{int(profile['f1_win_streak'])}", inline=True)
-        embed.add_field(name="Strike Advantage", value=f"{profile.get('f1_strike_diff', 0):.2f}", inline=True)
+        embed.add_field(name="Win Streak", value=f"{int(profile.get('win_streak', 0))}", inline=True)
+        embed.add_field(name="Sig. Strikes Landed (avg)", value=f"{profile.get('sig_str_landed_hist_avg', 0):.2f}", inline=True)
         
         embed.set_footer(text="UFC-AI Data Analytics • Data evolves with every fight")
         
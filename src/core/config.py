@@ -12,5 +12,30 @@ class Settings:
     
     AUDIT_HOUR: int = int(os.getenv("AUDIT_HOUR", "15"))
     AUDIT_MINUTE: int = int(os.getenv("AUDIT_MINUTE", "0"))
+
+    # "on" reads and writes the scraper response cache, "off" bypasses it and
+    # "replay" serves everything from cache without touching the network.
+    HTTP_CACHE_MODE: str = os.getenv("HTTP_CACHE_MODE", "on")
+    HTTP_CACHE_DIR: str = os.getenv("HTTP_CACHE_DIR", "data/cache/http")
+    # Keep archiving fetched pages even when HTTP_CACHE_MODE is "off", so raw
+    # CSVs can always be rebuilt offline with src.scraper.reparse.
+    HTTP_ARCHIVE: bool = os.getenv("HTTP_ARCHIVE", "1") == "1"
+    # When set, each scraper run writes its request stats here as JSON (used by benchmarks).
+    HTTP_STATS_FILE: str = os.getenv("HTTP_STATS_FILE", "")
+
+    # Root of the site the scrapers start from; point it at scripts/fixture_server.py
+    # to benchmark or load-test them locally.
+    UFCSTATS_BASE_URL: str = os.getenv("UFCSTATS_BASE_URL", "http://ufcstats.com").rstrip("/")
+
+    # BeautifulSoup backend for the scrapers: "html.parser" or "lxml" (if installed).
+    HTML_PARSER: str = os.getenv("HTML_PARSER", "html.parser")
+
+    # Most pipeline stages that may run at once (1 runs them one after another).
+    PIPELINE_WORKERS: int = int(os.getenv("PIPELINE_WORKERS", "4"))
+
+    # Predictions kept in memory per process, and an optional SQLite file that
+    # keeps them across restarts ("" keeps them in memory only).
+    PREDICTION_CACHE_SIZE: int = int(os.getenv("PREDICTION_CACHE_SIZE", "4096"))
+    PREDICTION_CACHE_FILE: str = os.getenv("PREDICTION_CACHE_FILE", "")
     
 settings = Settings()
\ No newline at end of file
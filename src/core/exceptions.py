@@ -0,0 +1,5 @@
+class ScraperError(Exception):
+    """Base class for errors raised by the scraping layer."""
+
+class CacheMissError(ScraperError):
+    """Raised in replay mode when a URL has no entry in the response cache."""
@@ -1 +1 @@
-from .predict import predict_winner, get_fighter_profile, prepare_data_prevision
\ No newline at end of file
+from .predict import predict_winner, predict_many, get_fighter_profile, prepare_data_prevision, unknown_fighters
\ No newline at end of file
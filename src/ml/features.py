@@ -0,0 +1,110 @@
+"""
+Model features, defined once for training and inference.
+
+Every feature is computed from a fights frame holding each fighter's
+*corner inputs* as f1_<input> / f2_<input> columns, plus `weight_class`.
+Training passes balanced_fights.csv; inference passes `matchup_frame()`
+built from fighter profiles. Both go through `FeatureSet.transform`, so
+the model always sees the same columns, computed the same way.
+"""
+import numpy as np
+import pandas as pd
+
+from src.processing.fighter_state import HIST_STATS
+
+# Per-fighter values a profile has to provide (f1_/f2_ columns in the fights frame).
+CORNER_INPUTS = ['age', 'height', 'reach', 'weight', 'stance', 'days_since_last', 'win_streak', 'loss_streak',
+                 *[f'{s}_hist_avg' for s in HIST_STATS]]
+SIDES = ('f1', 'f2')
+
+class Feature:
+    """A numeric model column computed from `inputs` by `compute(df) -> Series`."""
+
+    def __init__(self, name, inputs, compute):
+        self.name = name
+        self.inputs = inputs
+        self.compute = compute
+
+def corner(input_name):
+    """The fighter's own value, once per corner."""
+    return [Feature(f'{side}_{input_name}', [f'{side}_{input_name}'], lambda df, col=f'{side}_{input_name}': df[col])
+            for side in SIDES]
+
+def diff(name, input_name):
+    """f1's value minus f2's."""
+    f1, f2 = f'f1_{input_name}', f'f2_{input_name}'
+    return [Feature(name, [f1, f2], lambda df: df[f1] - df[f2])]
+
+NUMERIC_FEATURES = [
+    *corner('weight'),
+    *corner('days_since_last'),
+    *corner('win_streak'),
+    *corner('loss_streak'),
+    *[f for s in HIST_STATS for f in corner(f'{s}_hist_avg')],
+    *diff('age_diff', 'age'),
+    *diff('height_diff', 'height'),
+    *diff('reach_diff', 'reach'),
+    *diff('ring_rust_diff', 'days_since_last'),
+    *diff('win_streak_diff', 'win_streak'),
+    *diff('loss_streak_diff', 'loss_streak'),
+]
+
+# One-hot encoded with the categories seen in training, dropping the first like get_dummies(drop_first=True).
+CATEGORICAL_FEATURES = ['weight_class', 'f1_stance', 'f2_stance']
+
+def required_inputs():
+    return sorted({col for f in NUMERIC_FEATURES for col in f.inputs} | set(CATEGORICAL_FEATURES))
+
+class FeatureSet:
+    """
+    The feature registry fitted to a training set: remembers the categories of
+    each categorical feature and the resulting column order. It is saved with
+    the model, and a model can only be served by the FeatureSet it was trained
+    with.
+    """
+
+    def __init__(self):
+        self.categories = {}
+        self.columns = []
+
+    def fit(self, df):
+        self.categories = {col: sorted(df[col].dropna().astype(str).unique()) for col in CATEGORICAL_FEATURES}
+        self.columns = self._columns()
+        return self
+
+    def _columns(self):
+        one_hot = [f'{col}_{value}' for col in CATEGORICAL_FEATURES for value in self.categories[col][1:]]
+        return [f.name for f in NUMERIC_FEATURES] + one_hot
+
+    def transform(self, df):
+        """The model matrix for the fights in `df`, with exactly `self.columns`."""
+        if self._columns() != self.columns:
+            raise ValueError("The feature registry changed since this FeatureSet was fitted. Retrain the model.")
+
+        missing = [col for col in required_inputs() if col not in df.columns]
+        if missing:
+            raise ValueError(f"Missing feature inputs: {', '.join(missing)}")
+
+        blocks = [np.column_stack([pd.to_numeric(f.compute(df), errors='coerce').to_numpy(dtype=float)
+                                   for f in NUMERIC_FEATURES])]
+        for col in CATEGORICAL_FEATURES:
+            values = df[col].astype(str).to_numpy()[:, None]
+            blocks.append((values == np.array(self.categories[col][1:], dtype=object)).astype(float))
+
+        return pd.DataFrame(np.hstack(blocks), columns=self.columns, index=df.index)
+
+def matchup_frame(matchups):
+    """
+    A fights frame for `matchups`, a list of (f1_profile, f2_profile,
+    weight_class), where each profile maps CORNER_INPUTS to the fighter's
+    current values.
+    """
+    data = {'weight_class': [weight_class for _, _, weight_class in matchups]}
+    for i, side in enumerate(SIDES):
+        for name in CORNER_INPUTS:
+            data[f'{side}_{name}'] = [matchup[i].get(name, np.nan) for matchup in matchups]
+    return pd.DataFrame(data)
+
+def corner_profile(row, side):
+    """The CORNER_INPUTS of the fighter in `side` ('f1' or 'f2') of a fights row."""
+    return {name: row.get(f'{side}_{name}', np.nan) for name in CORNER_INPUTS}
@@ -0,0 +1,85 @@
+"""
+The trained random forest flattened into contiguous NumPy arrays, with an
+evaluator that walks every tree for a whole batch of rows at once, one
+tree level per step.
+
+sklearn's predict_proba validates its input and dispatches its trees
+through joblib on every call, which dominates the cost of scoring one
+matchup or one card. The flat forest skips that overhead and returns the
+same probabilities (up to float rounding in the average over trees). For
+large batches sklearn's compiled traversal is faster, so bulk scoring
+should keep using the sklearn model.
+"""
+import numpy as np
+
+class FlatForest:
+    """
+    All trees' nodes in shared arrays: node i compares feature `feature[i]`
+    with `threshold[i]` and continues at `children[i, 0]` (<=) or
+    `children[i, 1]` (>), and `value[i]` holds its class probabilities.
+    Leaves are their own children, so walking `depth` levels leaves every
+    row on a leaf whatever the depth of each tree. `roots` are the indices
+    of the trees' first nodes.
+    """
+
+    def __init__(self, feature, threshold, children, value, roots, classes, depth):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.roots = roots
+        self.classes_ = classes
+        self.depth = depth
+
+    @classmethod
+    def from_sklearn(cls, forest):
+        """Flattens a fitted single-output forest of decision trees, like RandomForestClassifier."""
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+
+        children = []
+        for tree, offset in zip(trees, offsets):
+            nodes = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+            children.append(np.stack([
+                np.where(is_leaf, nodes, tree.children_left) + offset,
+                np.where(is_leaf, nodes, tree.children_right) + offset,
+            ], axis=1))
+
+        value = np.concatenate([tree.value[:, 0, :] for tree in trees])
+        value /= value.sum(axis=1, keepdims=True)
+
+        return cls(
+            # Leaves have no split feature (-2); any valid column keeps the gather in bounds.
+            feature=np.concatenate([np.maximum(tree.feature, 0) for tree in trees]).astype(np.intp),
+            threshold=np.concatenate([tree.threshold for tree in trees]),
+            children=np.concatenate(children).astype(np.intp),
+            value=value,
+            roots=offsets[:-1].astype(np.intp),
+            classes=forest.classes_,
+            depth=max(tree.max_depth for tree in trees),
+        )
+
+    @property
+    def n_nodes(self):
+        return len(self.threshold)
+
+    def apply(self, X):
+        """The leaf each row of X reaches in each tree, shape (rows, trees)."""
+        # sklearn compares float32 features against float64 thresholds.
+        X = np.asarray(X, dtype=np.float32)
+        if np.isnan(X).any():
+            raise ValueError("FlatForest needs imputed input, got NaN.")
+
+        rows = np.arange(len(X))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        for _ in range(self.depth):
+            go_right = X[rows, self.feature[nodes]] > self.threshold[nodes]
+            nodes = self.children[nodes, go_right.view(np.int8)]
+        return nodes
+
+    def predict_proba(self, X):
+        return self.value[self.apply(X)].mean(axis=1)
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
@@ -1,42 +1,340 @@
-import subprocess
+import argparse
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
 import sys
 import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
 
-def run_script(script_path):
-    """Execute a Python script and check for errors."""
-    print(f"\nRunning: {script_path}...")
-    
-    resultado = subprocess.run([sys.executable, script_path])
-    
-    if resultado.returncode != 0:
-        print(f"Error: Script {script_path} failed.")
-        sys.exit(1)
-        
-    print(f"Completed: {script_path}")
-    time.sleep(1)
+from src.core.config import settings
+
+STATE_FILE = 'data/pipeline_state.json'
+HASH_CHUNK_SIZE = 1 << 20
+TIMELINE_WIDTH = 40
+
+class Stage:
+    """
+    One step of the pipeline: `target` is the 'module:function' it runs, and
+    `inputs`/`outputs` are the files it reads and writes. `sources` lists extra
+    code files (besides the target's module) whose changes should re-run it.
+    `always_run` marks stages whose real input is the network, not a file.
+    """
+
+    def __init__(self, name, target, inputs=(), outputs=(), sources=(), always_run=False):
+        self.name = name
+        self.target = target
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.sources = list(sources)
+        self.always_run = always_run
+
+    @property
+    def module(self):
+        return self.target.split(':')[0]
+
+    def source_files(self):
+        """The files whose code defines the stage, found without importing it."""
+        return [os.path.relpath(importlib.util.find_spec(self.module).origin), *self.sources]
+
+    def run(self):
+        module, function = self.target.split(':')
+        return getattr(importlib.import_module(module), function)()
+
+    def __repr__(self):
+        return f"Stage({self.name!r})"
+
+STAGES = [
+    # Phase 1: scraping new data
+    Stage('events', 'src.scraper.events:main',
+          outputs=['data/raw/all_events.csv'], always_run=True),
+    # Always run, so pages that failed to fetch last time are retried. Their key
+    # manifests make a run with nothing left to fetch cheap.
+    Stage('fights', 'src.scraper.fights:main',
+          inputs=['data/raw/all_events.csv'], outputs=['data/raw/all_fights.csv'], always_run=True),
+    Stage('fighters', 'src.scraper.fighters:main',
+          inputs=['data/raw/all_fights.csv'], outputs=['data/raw/fighter_details.csv'], always_run=True),
+    Stage('details', 'src.scraper.details:main',
+          inputs=['data/raw/all_fights.csv'], outputs=['data/raw/fight_details.csv'], always_run=True),
+    # Phase 2: cleaning
+    Stage('clean_data', 'src.processing.clean_data:clean_data',
+          inputs=['data/raw/fight_details.csv'], outputs=['data/processed/clean_fight_details.csv']),
+    Stage('clean_fighters', 'src.processing.clean_fighters:main',
+          inputs=['data/raw/fighter_details.csv'], outputs=['data/processed/clean_fighter_details.csv'],
+          sources=['src/processing/clean_data.py']),
+    # Phase 3: preparing features
+    Stage('merge_data', 'src.processing.merge_data:merge_data',
+          inputs=['data/processed/clean_fight_details.csv', 'data/processed/clean_fighter_details.csv'],
+          outputs=['data/processed/merged_data.csv']),
+    Stage('shuffle_data', 'src.processing.shuffle_data:create_balanced_dataset',
+          inputs=['data/processed/merged_data.csv'], outputs=['data/processed/balanced_fights.csv']),
+    # Rewrites balanced_fights.csv and the fighter state store in place.
+    Stage('feature_engineering', 'src.processing.feature_engineering:main',
+          inputs=['data/processed/balanced_fights.csv', 'data/processed/fight_history.csv',
+                  'data/processed/fighter_state.csv'],
+          outputs=['data/processed/balanced_fights.csv', 'data/processed/fight_history.csv',
+                   'data/processed/fighter_state.csv', 'data/processed/fighter_profiles.csv'],
+          sources=['src/processing/fighter_state.py', 'src/processing/fighter_profiles.py']),
+    # Phase 4: training
+    Stage('train', 'src.ml.train:train_model',
+          inputs=['data/processed/balanced_fights.csv', 'data/processed/fighter_profiles.csv'],
+          outputs=['data/processed/historical_df.csv', 'models/ufc_random_forest.pkl',
+                   'models/ufc_imputer.pkl', 'models/ufc_features.pkl', 'models/ufc_profiles.csv',
+                   'models/ufc_manifest.json'],
+          sources=['src/ml/features.py']),
+]
+
+def check_order(stages):
+    """
+    Checks that `stages` is declared in dependency order: raises ValueError if
+    a stage reads a file that a later stage writes, since it would always see
+    the previous run's data.
+    """
+    position = {s.name: i for i, s in enumerate(stages)}
+    for stage in stages:
+        for path in stage.inputs:
+            late = [s.name for s in stages if path in s.outputs and position[s.name] > position[stage.name]]
+            if late:
+                raise ValueError(f"Stage {stage.name} reads {path}, which is written later by {late[0]}.")
+    return stages
+
+def dependencies(stages):
+    """
+    Maps each stage name to the earlier stages it must wait for: those that
+    write a file it reads or writes, and those that read a file it writes.
+    Stages with no such conflict can run at the same time.
+    """
+    deps = {}
+    for i, stage in enumerate(stages):
+        reads, writes = set(stage.inputs), set(stage.outputs)
+        deps[stage.name] = [
+            earlier.name for earlier in stages[:i]
+            if set(earlier.outputs) & (reads | writes) or set(earlier.inputs) & writes
+        ]
+    return deps
+
+class FileHasher:
+    """
+    sha256 of file contents, reusing the previous digest when a file's size and
+    mtime are unchanged so an up-to-date run doesn't re-read every CSV.
+    """
+
+    def __init__(self, known=None):
+        self.known = dict(known or {})
+
+    def digest(self, path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+
+        cached = self.known.get(path)
+        if cached and cached['size'] == st.st_size and cached['mtime_ns'] == st.st_mtime_ns:
+            return cached['sha256']
+
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                sha.update(chunk)
+
+        self.known[path] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': sha.hexdigest()}
+        return self.known[path]['sha256']
+
+def load_state(path=STATE_FILE):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {'stages': {}, 'files': {}}
+
+def save_state(state, path=STATE_FILE):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+def fingerprint(stage, hasher):
+    return {
+        'inputs': {path: hasher.digest(path) for path in stage.inputs},
+        'sources': {path: hasher.digest(path) for path in stage.source_files()},
+    }
+
+def stale_reason(stage, record, hasher):
+    """Why `stage` has to run, or None if its outputs are up to date."""
+    if stage.always_run:
+        return "always runs"
+    if record is None:
+        return "no previous run"
+
+    missing = [path for path in stage.outputs if not os.path.exists(path)]
+    if missing:
+        return f"missing {missing[0]}"
+
+    current = fingerprint(stage, hasher)
+    for kind in ('inputs', 'sources'):
+        changed = [path for path, digest in current[kind].items() if record.get(kind, {}).get(path) != digest]
+        if changed:
+            return f"{changed[0]} changed"
+    return None
+
+def run_stage(stage):
+    """Runs `stage` on a pool worker and returns its (start, end) perf_counter times."""
+    print(f"\nRunning: {stage.name} ({stage.target})...")
+    start = time.perf_counter()
+    stage.run()
+    end = time.perf_counter()
+    print(f"Completed: {stage.name} in {end - start:.1f}s")
+    return start, end
+
+def record_run(stage, state, hasher, seconds):
+    # Inputs are hashed after the run, so a stage that rewrites its own input
+    # (feature_engineering) matches its own result on the next run.
+    state['stages'][stage.name] = fingerprint(stage, hasher) | {
+        'finished_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'seconds': round(seconds, 3),
+    }
+    state['files'] = hasher.known
+    save_state(state)
+
+def critical_path(timeline, deps):
+    """
+    The chain of stages that bounded the run: from the last stage to finish,
+    repeatedly step back to the dependency that finished last.
+    """
+    if not timeline:
+        return []
+    name = max(timeline, key=lambda n: timeline[n][1])
+    path = [name]
+    while True:
+        gating = [d for d in deps[name] if d in timeline]
+        if not gating:
+            return path[::-1]
+        name = max(gating, key=lambda n: timeline[n][1])
+        path.append(name)
+
+def print_timeline(timeline, deps, origin):
+    """Prints when each stage ran relative to `origin`, marking the critical path with '*'."""
+    if not timeline:
+        return
+    path = critical_path(timeline, deps)
+    total = max(end for _, end in timeline.values()) - origin
+    scale = TIMELINE_WIDTH / total if total > 0 else 0
+
+    print(f"\n{'Stage':<22}{'Start':>7}{'End':>7}{'Secs':>7}  Timeline")
+    for name, (start, end) in sorted(timeline.items(), key=lambda item: item[1]):
+        offset, length = int((start - origin) * scale), int((end - start) * scale)
+        bar = ' ' * offset + '#' * max(length, 1 if end > start else 0)
+        marker = '*' if name in path else ' '
+        print(f"{marker} {name:<20}{start - origin:>7.1f}{end - origin:>7.1f}{end - start:>7.1f}  |{bar:<{TIMELINE_WIDTH}}|")
+    print(f"Critical path: {' -> '.join(path)} ({sum(timeline[n][1] - timeline[n][0] for n in path):.1f}s of {total:.1f}s)")
+
+def execute_complete_pipeline(force=(), dry_run=False, stages=None, workers=settings.PIPELINE_WORKERS):
+    """
+    Runs every stage whose inputs or code changed since its last successful
+    run or whose outputs are missing. A stage starts as soon as the stages it
+    depends on are done, with at most `workers` stages running at once.
+    `force` names stages to run anyway ('all' runs everything). With
+    `dry_run`, only prints the plan.
+    """
+    stages = check_order(stages if stages is not None else STAGES)
+    force = set(force)
+    unknown = force - {s.name for s in stages} - {'all'}
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(sorted(unknown))}")
+
+    state = load_state()
+    state.setdefault('stages', {})
+    hasher = FileHasher(state.get('files'))
+    deps = dependencies(stages)
+
+    def reason_to_run(stage):
+        if 'all' in force or stage.name in force:
+            return "forced"
+        return stale_reason(stage, state['stages'].get(stage.name), hasher)
 
-def execute_complete_pipeline():
     print("Starting MLOps pipeline")
-    
-    print("\n--- Phase 1: Scraping New Data ---")
-    run_script("src/scraper/events.py")
-    run_script("src/scraper/fights.py")
-    run_script("src/scraper/fighters.py")
-    run_script("src/scraper/details.py")
-    
-    print("\n--- Phase 2: Cleaning Data ---")
-    run_script("src/processing/clean_data.py")
-    run_script("src/processing/clean_fighters.py")
-    
-    print("\n--- Phase 3: Preparing Features ---")
-    run_script("src/processing/merge_data.py")
-    run_script("src/processing/shuffle_data.py")
-    run_script("src/processing/feature_engineering.py")
-    
-    print("\n--- Phase 4: Training AI Model ---")
-    run_script("src/ml/train.py")
-    
-    print("\nPipeline completed successfully. The Oracles' brain is updated! 🧠")
+    if dry_run:
+        pending = set()
+        for stage in stages:
+            reason = reason_to_run(stage)
+            if reason is None and pending.intersection(stage.inputs):
+                reason = "an upstream stage would run"
+            if reason is None:
+                print(f"Skipping: {stage.name} (up to date)")
+            else:
+                print(f"Would run: {stage.name} ({reason})")
+                pending.update(stage.outputs)
+        return []
+
+    origin = time.perf_counter()
+    waiting = list(stages)
+    done = set()
+    running = {}
+    timeline = {}
+    ran = []
+    failed = None
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        while waiting or running:
+            # Start every ready stage, in declared order. A stage is only
+            # checked for staleness once its dependencies have finished.
+            for stage in list(waiting):
+                if failed or len(running) >= max(1, workers):
+                    break
+                if not all(d in done for d in deps[stage.name]):
+                    continue
+                waiting.remove(stage)
+
+                reason = reason_to_run(stage)
+                if reason is None:
+                    print(f"Skipping: {stage.name} (up to date)")
+                    done.add(stage.name)
+                    continue
+
+                print(f"Stage {stage.name} is out of date: {reason}")
+                running[pool.submit(run_stage, stage)] = stage
+
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                try:
+                    start, end = future.result()
+                except Exception as e:
+                    traceback.print_exception(e)
+                    print(f"Error: Stage {stage.name} failed.")
+                    failed = failed or stage.name
+                    continue
+
+                record_run(stage, state, hasher, end - start)
+                timeline[stage.name] = (start, end)
+                done.add(stage.name)
+                ran.append(stage.name)
+
+    print_timeline(timeline, deps, origin)
+    if failed:
+        sys.exit(1)
+
+    print(f"\nPipeline finished in {time.perf_counter() - origin:.1f}s. "
+          f"Ran {len(ran)} of {len(stages)} stages: {', '.join(ran) or 'none'}.")
+    if 'train' in ran:
+        print("The Oracles' brain is updated! 🧠")
+    return ran
 
 if __name__ == "__main__":
-    execute_complete_pipeline()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the scraping, processing and training pipeline")
+    parser.add_argument('--force', nargs='*', metavar='STAGE',
+                        help="Re-run these stages even if up to date (no names: every stage)")
+    parser.add_argument('--dry-run', action='store_true', help="Show which stages would run, without running them")
+    parser.add_argument('--workers', type=int, default=settings.PIPELINE_WORKERS,
+                        help="Most stages to run at once (1 runs them one after another)")
+    args = parser.parse_args()
+
+    force = ['all'] if args.force == [] else args.force or []
+    execute_complete_pipeline(force=force, dry_run=args.dry_run, workers=args.workers)
@@ -0,0 +1,119 @@
+"""
+Caches each matchup's predicted probability that fighter 1 wins, keyed by
+the normalized names, the weight class, the version of the served
+artifacts and the day the profiles were aged to (their age and ring rust
+grow every day). A retrain or a profile update changes the version, so
+stale predictions are never served; they just stop being hit and age out.
+"""
+import datetime
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import pandas as pd
+
+from src.core.config import settings
+from src.processing.name_index import normalize_name
+
+def cache_key(fighter_1, fighter_2, weight_class, version, as_of):
+    day = pd.Timestamp(as_of).date().isoformat()
+    return normalize_name(fighter_1), normalize_name(fighter_2), normalize_name(weight_class), version, day
+
+class PredictionCache:
+    """
+    A bounded LRU in memory. With `path`, also a SQLite table that outlives
+    the process: memory misses are looked up there, and every new prediction
+    is written to both. The table only keeps the latest version's rows, and
+    none for days before today.
+    """
+
+    def __init__(self, max_size=settings.PREDICTION_CACHE_SIZE, path=settings.PREDICTION_CACHE_FILE):
+        self.max_size = max_size
+        self.path = path or None
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._pruned = None
+        self._lock = threading.Lock()
+
+        if self.path:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with self._connect() as conn:
+                columns = [row[1] for row in conn.execute('PRAGMA table_info(prediction_cache)')]
+                if columns and 'as_of' not in columns:
+                    # Written before keys had a date; it is only a cache.
+                    conn.execute('DROP TABLE prediction_cache')
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS prediction_cache (
+                        fighter_1 TEXT, fighter_2 TEXT, weight_class TEXT, version TEXT, as_of TEXT,
+                        f1_win REAL,
+                        PRIMARY KEY (fighter_1, fighter_2, weight_class, version, as_of)
+                    )
+                ''')
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key):
+        """The cached probability for `key`, or None. Counts a hit or a miss."""
+        with self._lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        if self.path:
+            with self._connect() as conn:
+                row = conn.execute('''
+                    SELECT f1_win FROM prediction_cache
+                    WHERE fighter_1 = ? AND fighter_2 = ? AND weight_class = ? AND version = ? AND as_of = ?
+                ''', key).fetchone()
+            value = row[0] if row else None
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._remember(key, value)
+        return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._remember(key, value)
+
+        if self.path:
+            with self._connect() as conn:
+                # Rows for other versions or past days are never looked up again.
+                pruned = (key[3], datetime.date.today().isoformat())
+                if pruned != self._pruned:
+                    conn.execute('DELETE FROM prediction_cache WHERE version != ? OR as_of < ?', pruned)
+                    self._pruned = pruned
+                conn.execute('INSERT OR REPLACE INTO prediction_cache VALUES (?, ?, ?, ?, ?, ?)', (*key, value))
+
+    def _remember(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self.entries),
+        }
+
+# The process-wide cache.
+prediction_cache = PredictionCache()
@@ -0,0 +1,180 @@
+"""
+Keeps the trained artifacts (model, imputer, FeatureSet and fighter
+profiles) in memory for the whole process, and swaps in new ones when the
+pipeline writes them.
+
+Training writes a manifest last, listing every artifact and its hash, and
+the server only reloads when the manifest changes. A reload checks the
+files against the manifest, so a retrain still in progress is never
+half-loaded. A request that takes one `Artifacts` snapshot from
+`model.current()` and uses it throughout never mixes a new model with an
+old FeatureSet. While one thread reloads, the others keep serving the
+previous snapshot.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import namedtuple
+
+import joblib
+from sklearn.ensemble import RandomForestClassifier
+
+from src.ml.flat_forest import FlatForest
+from src.processing.fighter_profiles import load_profiles
+
+MODEL_FILE = 'models/ufc_random_forest.pkl'
+IMPUTER_FILE = 'models/ufc_imputer.pkl'
+FEATURES_FILE = 'models/ufc_features.pkl'
+# Training's own copy of data/processed/fighter_profiles.csv, which the
+# feature_engineering stage may rewrite before the next retrain.
+SERVED_PROFILES_FILE = 'models/ufc_profiles.csv'
+MANIFEST_FILE = 'models/ufc_manifest.json'
+ARTIFACT_FILES = {
+    'model': MODEL_FILE,
+    'imputer': IMPUTER_FILE,
+    'features': FEATURES_FILE,
+    'profiles': SERVED_PROFILES_FILE,
+}
+
+# Up to this many rows the flat forest scores faster than sklearn, whose
+# per-call overhead it skips; above it sklearn's compiled traversal wins
+# (scripts/benchmark_flat_forest.py: crossover between 250 and 500 rows).
+FLAT_FOREST_MAX_ROWS = 256
+
+# `flat_forest` is the model flattened into a FlatForest, or None if it is not a random forest.
+Artifacts = namedtuple('Artifacts', ['model', 'imputer', 'features', 'profiles', 'version', 'flat_forest'],
+                       defaults=[None])
+
+def file_signature(paths):
+    """(mtime_ns, size) of every file, or None if any of them is missing."""
+    try:
+        return tuple((os.stat(path).st_mtime_ns, os.stat(path).st_size) for path in paths)
+    except FileNotFoundError:
+        return None
+
+def flat_forest(model):
+    """The FlatForest of a trained random forest, or None for any other model."""
+    return FlatForest.from_sklearn(model) if isinstance(model, RandomForestClassifier) else None
+
+def scoring_model(artifacts, n_rows):
+    """The model to score `n_rows` rows with: the flat forest for small batches, sklearn's for bulk."""
+    if artifacts.flat_forest is not None and n_rows <= FLAT_FOREST_MAX_ROWS:
+        return artifacts.flat_forest
+    return artifacts.model
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def write_manifest(files=ARTIFACT_FILES, path=MANIFEST_FILE):
+    """
+    Records the artifacts in `files` (name -> path) and the hash of each in
+    the manifest at `path`, and returns their version: a short hash of the
+    contents, so the same artifacts always get the same version. Call it
+    after every artifact is in place.
+    """
+    hashes = {name: file_hash(file) for name, file in files.items()}
+    version = hashlib.sha256(json.dumps(hashes, sort_keys=True).encode()).hexdigest()[:12]
+    manifest = {
+        'version': version,
+        'files': {name: {'path': file, 'sha256': hashes[name]} for name, file in files.items()},
+    }
+
+    with open(path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + '.tmp', path)
+    return version
+
+class ModelServer:
+    """
+    Serves predictions from artifacts loaded once per process. `current()`
+    checks the manifest's mtime and size on every call (one stat call) and
+    reloads when it changed. Also usable as the model itself: `predict` and
+    `predict_proba` go to the current model (its flat forest for small
+    batches).
+    """
+
+    def __init__(self, manifest=MANIFEST_FILE):
+        self.manifest = manifest
+        self._artifacts = None
+        self._signature = None
+        self._failed = None
+        self._lock = threading.Lock()
+
+    def current(self):
+        """The current Artifacts, or None if the pipeline has not produced them yet."""
+        signature = file_signature([self.manifest])
+        if signature is not None and signature not in (self._signature, self._failed):
+            # Only the first load makes callers wait; later reloads happen in one thread at a time.
+            if self._lock.acquire(blocking=self._artifacts is None):
+                try:
+                    if signature != self._signature:
+                        self._reload(signature)
+                finally:
+                    self._lock.release()
+        return self._artifacts
+
+    def _reload(self, signature):
+        try:
+            with open(self.manifest) as f:
+                manifest = json.load(f)
+            files = {name: entry['path'] for name, entry in manifest['files'].items()}
+            trained = joblib.load(files['model'])
+            artifacts = Artifacts(
+                model=trained,
+                imputer=joblib.load(files['imputer']),
+                features=joblib.load(files['features']),
+                profiles=load_profiles(files['profiles']),
+                version=manifest['version'],
+                flat_forest=flat_forest(trained),
+            )
+            # Checked after loading, so a file replaced mid-load is caught too.
+            changed = [file for name, file in files.items() if file_hash(file) != manifest['files'][name]['sha256']]
+        except Exception as e:
+            logging.error(f"Could not load the model artifacts, still serving the previous ones: {e}")
+            self._failed = signature
+            return
+
+        if changed:
+            # A retrain is replacing them; its manifest will trigger the next reload.
+            logging.warning(f"Model artifacts do not match their manifest ({', '.join(changed)}). "
+                            "Still serving the previous ones.")
+            self._failed = signature
+            return
+
+        if file_signature([self.manifest]) != signature:
+            logging.warning("Model artifacts changed while loading them. Reloading on the next request.")
+            return
+
+        previous = self._artifacts
+        self._artifacts, self._signature = artifacts, signature
+        if previous is None:
+            logging.info(f"Loaded model artifacts (version {artifacts.version}).")
+        else:
+            logging.info(f"Swapped model artifacts: version {previous.version} -> {artifacts.version}.")
+
+    @property
+    def version(self):
+        """Version of the current artifacts (None if there are none)."""
+        artifacts = self.current()
+        return artifacts.version if artifacts else None
+
+    def _model(self, X):
+        artifacts = self.current()
+        if artifacts is None:
+            raise RuntimeError("Model artifacts missing. Run the pipeline first.")
+        return scoring_model(artifacts, len(X))
+
+    def predict(self, X):
+        return self._model(X).predict(X)
+
+    def predict_proba(self, X):
+        return self._model(X).predict_proba(X)
+
+# The process-wide server.
+model = ModelServer()
@@ -1,26 +1,25 @@
 import pandas as pd
 import joblib
 import os
+import shutil
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.impute import SimpleImputer
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
 
+from src.ml.features import FeatureSet
+from src.ml.serving import FEATURES_FILE, IMPUTER_FILE, MODEL_FILE, SERVED_PROFILES_FILE, write_manifest
+from src.processing.fighter_profiles import PROFILES_FILE
+from src.processing.fighter_state import prior_mean
+
 def feature_engineering():
-    """Read cleaned data, calculate historical averages and attribute differences."""
+    """Read the enriched fights, sorted by date, making sure the historical averages are present."""
     data_path = 'data/processed/balanced_fights.csv'
     if not os.path.exists(data_path):
         print(f"Error: File {data_path} not found.")
         return None
 
     df = pd.read_csv(data_path)
-    
-    df['diff_age'] = df['f1_age'] - df['f2_age']
-    df['diff_height'] = df['f1_height'] - df['f2_height']
-    df['diff_reach'] = df['f1_reach'] - df['f2_reach']
-
-    encoding_columns = ['weight_class', 'f1_stance', 'f2_stance']
-    df = pd.get_dummies(df, columns=encoding_columns, drop_first=True)
 
     df['event_date'] = pd.to_datetime(df['event_date'])
     df = df.sort_values(by='event_date', ascending=True)
@@ -29,15 +28,23 @@ def feature_engineering():
     f1_statistics = ['f1_kd', 'f1_sig_str_landed', 'f1_td_landed', 'f1_ctrl', 'f1_sig_pct']
     f2_statistics = ['f2_kd', 'f2_sig_str_landed', 'f2_td_landed', 'f2_ctrl', 'f2_sig_pct']
 
-    for col in f1_statistics:
-        new_col = col + '_hist_avg'
-        df[new_col] = df.groupby('f1_name')[col].transform(lambda x: x.shift(1).expanding().mean())
+    historical_columns = [c + '_hist_avg' for c in f1_statistics + f2_statistics]
 
-    for col in f2_statistics:
-        new_col = col + '_hist_avg'
-        df[new_col] = df.groupby('f2_name')[col].transform(lambda x: x.shift(1).expanding().mean())
+    # The feature_engineering stage attaches these from the fighter state
+    # store; recompute them only when training on a file it hasn't enriched.
+    if not set(historical_columns).issubset(df.columns):
+        # Stack both corners into one long table so a single grouped pass
+        # (keyed by corner and name) computes every average.
+        stats = [c.removeprefix('f1_') for c in f1_statistics]
+        long_df = pd.concat(
+            [df[[f'{side}_name'] + [f'{side}_{s}' for s in stats]].set_axis(['name'] + stats, axis=1) for side in ('f1', 'f2')],
+            keys=['f1', 'f2'],
+        )
+        averages = prior_mean(long_df[stats], [long_df.index.get_level_values(0), long_df['name']])
+
+        df[[c + '_hist_avg' for c in f1_statistics]] = averages.loc['f1'].to_numpy()
+        df[[c + '_hist_avg' for c in f2_statistics]] = averages.loc['f2'].to_numpy()
 
-    historical_columns = [c + '_hist_avg' for c in f1_statistics + f2_statistics]
     df[historical_columns] = df[historical_columns].fillna(0)
 
     os.makedirs('data/processed', exist_ok=True)
@@ -46,29 +53,19 @@ def feature_engineering():
     return df
 
 def train_model():
+    if not os.path.exists(PROFILES_FILE):
+        print(f"Error: File {PROFILES_FILE} not found.")
+        return
+
     df = feature_engineering()
     if df is None:
         return
 
-    spoilers = [
-        'f1_kd', 'f2_kd', 'f1_sig_str_landed', 'f2_sig_str_landed',
-        'f1_sig_str_attempted', 'f2_sig_str_attempted', 'f1_sig_pct', 'f2_sig_pct',
-        'f1_tot_str_landed', 'f2_tot_str_landed', 'f1_tot_str_attempted', 'f2_tot_str_attempted',
-        'f1_td_landed', 'f2_td_landed', 'f1_td_attempted', 'f2_td_attempted',
-        'f1_td_pct', 'f2_td_pct', 'f1_sub_att', 'f2_sub_att',
-        'f1_rev', 'f2_rev', 'f1_ctrl', 'f2_ctrl', 'total_time_seconds', 'method_detail',
-        'f1_age', 'f2_age', 'f1_reach', 'f2_reach', 'f1_height', 'f2_height',
-    ]
-
-    df_model = df.drop(columns=spoilers, errors='ignore')
-    
-    text_columns = ['f1_name', 'f2_name', 'f1_link', 'f2_link', 'event_date', 'referee']
-    df_model = df_model.drop(columns=text_columns, errors='ignore')
-
-    X = df_model.drop('target', axis=1)
-    y = df_model['target']
-
-    training_columns = X.columns.tolist()
+    # Only the registered features reach the model, so the fight's own
+    # stats (spoilers) and text columns are never inputs.
+    features = FeatureSet().fit(df)
+    X = features.transform(df)
+    y = df['target']
 
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
     
@@ -84,9 +81,16 @@ def train_model():
     print(f"Training complete. Test accuracy: {acc:.2%}")
 
     os.makedirs('models', exist_ok=True)
-    joblib.dump(model, 'models/ufc_random_forest.pkl')
-    joblib.dump(imputer, 'models/ufc_imputer.pkl')
-    joblib.dump(training_columns, 'models/ufc_model_columns.pkl')
+    for artifact, path in [(model, MODEL_FILE), (imputer, IMPUTER_FILE), (features, FEATURES_FILE)]:
+        # Written aside and renamed, so a running bot never loads a half-written file.
+        joblib.dump(artifact, path + '.tmp')
+        os.replace(path + '.tmp', path)
+    shutil.copyfile(PROFILES_FILE, SERVED_PROFILES_FILE + '.tmp')
+    os.replace(SERVED_PROFILES_FILE + '.tmp', SERVED_PROFILES_FILE)
+
+    # Last, so a running bot swaps in the whole set at once.
+    version = write_manifest()
+    print(f"Model artifacts saved (version {version}).")
 
 if __name__ == "__main__":
     train_model()
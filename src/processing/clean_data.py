@@ -57,61 +57,118 @@ def clean_percentage(val):
             return 0.0
     return 0.0
 
-def clean_data():
-    if not os.path.exists(INPUT_FILE):
-        print(f"Error: File {INPUT_FILE} not found!")
-        return
+def calc_total_time(end_round, end_time):
+    """Total fight time in seconds from the finishing round and the time within it."""
+    try:
+        r_val = str(end_round).strip()
+        if not r_val.isdigit(): return 0
+        
+        r = int(r_val)
+        last_r_seconds = clean_seconds(end_time)
+        
+        return ((r - 1) * 300) + last_r_seconds
+    except:
+        return 0
 
-    print("Loading dataset...")
-    df = pd.read_csv(INPUT_FILE)
+# Column-level versions of the cleaners above. Raw columns repeat a small set
+# of values ("3 Rnd (5-5-5)", "0 of 0", "2:15"...), so each distinct value is
+# cleaned once with the scalar cleaner and the results are broadcast back with
+# a NumPy take over the factorized codes. Output is identical to running the
+# scalar cleaner on every row, at a cost that grows with the number of distinct
+# values instead of the number of rows.
+
+def _factorize(col):
+    # NaN is kept as a value of its own so the scalar cleaners decide what it becomes.
+    codes, uniques = pd.factorize(col, use_na_sentinel=False)
+    return codes, np.asarray(uniques, dtype=object)
+
+def _broadcast(values, codes, index):
+    return pd.Series(values).take(codes).set_axis(index)
+
+def map_distinct(col, cleaner):
+    """Returns `col.apply(cleaner)`, calling `cleaner` once per distinct value."""
+    codes, uniques = _factorize(col)
+    return _broadcast([cleaner(v) for v in uniques], codes, col.index)
+
+def clean_text_column(col):
+    return map_distinct(col, clean_text_nuclear)
+
+def clean_percentage_column(col):
+    return map_distinct(col, clean_percentage)
+
+def clean_seconds_column(col):
+    return map_distinct(col, clean_seconds)
+
+def split_stats_column(col):
+    """Column version of `split_stats`: returns the landed and attempted columns."""
+    codes, uniques = _factorize(col)
+    pairs = [split_stats(v) for v in uniques]
+    return (
+        _broadcast([p[0] for p in pairs], codes, col.index),
+        _broadcast([p[1] for p in pairs], codes, col.index),
+    )
+
+def _round_number(end_round):
+    """The finishing round as `calc_total_time` reads it, or -1 when it counts as 0 seconds."""
+    r_val = str(end_round).strip()
+    if not r_val.isdigit():
+        return -1
+    try:
+        return int(r_val)
+    except ValueError:
+        return -1
 
-    df = df.loc[:, ~df.columns.duplicated()]
+def total_time_column(end_round, end_time):
+    """Column version of `calc_total_time`, with the arithmetic done in NumPy."""
+    round_codes, round_uniques = _factorize(end_round)
+    rounds = np.array([_round_number(v) for v in round_uniques], dtype=np.int64)[round_codes]
+    last_round_seconds = clean_seconds_column(end_time).to_numpy(dtype=np.int64)
 
-    print("Applying nuclear cleaning to all text columns...")
-    str_cols = df.select_dtypes(include=['object']).columns
-    
-    for col in str_cols:
-        df[col] = df[col].apply(clean_text_nuclear)
+    total = np.where(rounds >= 0, (rounds - 1) * 300 + last_round_seconds, 0)
+    return pd.Series(total, index=end_round.index)
 
-    print("Converting percentages...")
-    pct_cols = ['f1_sig_pct', 'f2_sig_pct', 'f1_td_pct', 'f2_td_pct']
-    for col in pct_cols:
-        if col in df.columns:
-            df[col] = df[col].apply(clean_percentage)
+PCT_COLS = ['f1_sig_pct', 'f2_sig_pct', 'f1_td_pct', 'f2_td_pct']
+SPLIT_COLS = ['f1_sig_str', 'f2_sig_str', 'f1_tot_str', 'f2_tot_str', 'f1_td', 'f2_td']
+TIME_COLS = ['f1_ctrl', 'f2_ctrl']
+
+def clean_frame(df, verbose=False):
+    """Cleans a raw fight_details frame into the clean_fight_details layout."""
+    df = df.loc[:, ~df.columns.duplicated()].copy()
 
-    print("Splitting stats (X of Y)...")
-    cols_to_split = [
-        'f1_sig_str', 'f2_sig_str', 
-        'f1_tot_str', 'f2_tot_str', 
-        'f1_td', 'f2_td'
-    ]
+    if verbose: print("Applying nuclear cleaning to all text columns...")
+    for col in df.select_dtypes(include=['object', 'string']).columns:
+        df[col] = clean_text_column(df[col])
 
-    for col in cols_to_split:
+    if verbose: print("Converting percentages...")
+    for col in PCT_COLS:
         if col in df.columns:
-            new_data = df[col].apply(split_stats)
-            df[f'{col}_landed'] = new_data.apply(lambda x: x[0])
-            df[f'{col}_attempted'] = new_data.apply(lambda x: x[1])
+            df[col] = clean_percentage_column(df[col])
+
+    if verbose: print("Splitting stats (X of Y)...")
+    for col in SPLIT_COLS:
+        if col in df.columns:
+            df[f'{col}_landed'], df[f'{col}_attempted'] = split_stats_column(df[col])
             df.drop(columns=[col], inplace=True)
 
-    print("Converting times...")
-    time_cols = ['f1_ctrl', 'f2_ctrl']
-    for col in time_cols:
+    if verbose: print("Converting times...")
+    for col in TIME_COLS:
         if col in df.columns:
-            df[col] = df[col].apply(clean_seconds)
+            df[col] = clean_seconds_column(df[col])
 
     if 'end_round' in df.columns and 'end_time' in df.columns:
-        def calc_total_time(row):
-            try:
-                r_val = str(row['end_round']).strip()
-                if not r_val.isdigit(): return 0
-                
-                r = int(r_val)
-                last_r_seconds = clean_seconds(row['end_time'])
-                
-                return ((r - 1) * 300) + last_r_seconds
-            except:
-                return 0
-        df['total_time_seconds'] = df.apply(calc_total_time, axis=1)
+        df['total_time_seconds'] = total_time_column(df['end_round'], df['end_time'])
+
+    return df
+
+def clean_data():
+    if not os.path.exists(INPUT_FILE):
+        print(f"Error: File {INPUT_FILE} not found!")
+        return
+
+    print("Loading dataset...")
+    df = pd.read_csv(INPUT_FILE)
+
+    df = clean_frame(df, verbose=True)
 
     print(f"Saving cleaned dataset to {OUTPUT_FILE}...")
     os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
@@ -121,4 +178,4 @@ def clean_data():
     print(df[['event_name', 'method', 'method_detail']].head(3))
 
 if __name__ == "__main__":
-    clean_data()
\ No newline at end of file
+    clean_data()
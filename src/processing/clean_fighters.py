@@ -3,6 +3,8 @@ import numpy as np
 import os
 import re
 
+from src.processing.clean_data import map_distinct
+
 INPUT_FILE = 'data/raw/fighter_details.csv'
 OUTPUT_FILE = 'data/processed/clean_fighter_details.csv'
 
@@ -58,6 +60,38 @@ def parse_dob(dob_str):
     except Exception:
         return pd.NaT
 
+DOB_FORMAT = '%b %d, %Y'
+MISSING = '--'
+
+def parse_dob_column(col):
+    """Vectorized `parse_dob`: one bulk `to_datetime` call for the whole column."""
+    return pd.to_datetime(col.where(col != MISSING), format=DOB_FORMAT, errors='coerce')
+
+# (raw column, clean column, column parser). The numeric parsers run the scalar
+# cleaners once per distinct raw value, of which there are few (heights, weights
+# and reaches repeat across thousands of fighters); DOBs are parsed in bulk.
+ATTRIBUTES = [
+    ('height', 'height_cm', lambda col: map_distinct(col, clean_height)),
+    ('weight', 'weight_kg', lambda col: map_distinct(col, clean_weight)),
+    ('reach', 'reach_cm', lambda col: map_distinct(col, clean_reach)),
+    ('dob', 'dob', parse_dob_column),
+]
+
+def parse_attributes(df):
+    """
+    Parses height, weight, reach and DOB column-wise. Returns the parsed columns
+    and, per raw column, how many present values (not blank or '--') could not
+    be parsed.
+    """
+    parsed = {}
+    invalid = {}
+    for raw, clean, parser in ATTRIBUTES:
+        values = parser(df[raw])
+        present = df[raw].notna() & (df[raw] != MISSING)
+        parsed[clean] = values
+        invalid[raw] = int((present & values.isna()).sum())
+    return pd.DataFrame(parsed, index=df.index), invalid
+
 def main():
     if not os.path.exists(INPUT_FILE):
         print(f"Error: File {INPUT_FILE} not found. Run the fighter scraper first.")
@@ -71,17 +105,12 @@ def main():
     print("Cleaning Names...")
     df['name'] = df['name'].apply(clean_name)
 
-    print("Cleaning Height...")
-    df['height_cm'] = df['height'].apply(clean_height)
-
-    print("Cleaning Weight...")
-    df['weight_kg'] = df['weight'].apply(clean_weight)
-
-    print("Cleaning Reach...")
-    df['reach_cm'] = df['reach'].apply(clean_reach)
-
-    print("Converting Date of Birth (DOB)...")
-    df['dob'] = df['dob'].apply(parse_dob)
+    print("Parsing height, weight, reach and date of birth (DOB)...")
+    attributes, invalid = parse_attributes(df)
+    df[attributes.columns] = attributes
+    for column, count in invalid.items():
+        if count:
+            print(f"  {column}: {count} invalid values set to missing")
 
     if 'stance' in df.columns:
         df['stance'] = df['stance'].fillna('Orthodox').str.strip()
@@ -0,0 +1,103 @@
+"""
+One row per fighter with everything a prediction needs about them: the
+bios of their last fight and their state after it (streaks and historical
+stat averages, from the fighter state store). Written by the
+feature_engineering stage, so serving a profile is a dict lookup by
+normalized name or profile URL instead of a scan of balanced_fights.csv.
+"""
+import logging
+import os
+
+import pandas as pd
+
+from src.processing import fighter_state
+from src.processing.name_index import NameIndex
+
+PROFILES_FILE = 'data/processed/fighter_profiles.csv'
+BIO_COLS = ['age', 'height', 'reach', 'weight', 'stance']
+DAYS_PER_YEAR = 365.25
+
+def latest_appearances(df):
+    """Each fighter's last fight row in `df`: name, profile URL, date and bios at that fight."""
+    sides = []
+    for side in ('f1', 'f2'):
+        columns = {f'{side}_name': 'name', f'{side}_link': 'url', 'event_date': 'last_fight_date'}
+        columns.update({f'{side}_{bio}': bio for bio in BIO_COLS})
+        part = df.reindex(columns=list(columns)).set_axis(list(columns.values()), axis=1)
+        sides.append(part)
+
+    rows = pd.concat(sides, ignore_index=True)
+    rows['last_fight_date'] = fighter_state._dates(rows['last_fight_date'])
+    rows = rows.dropna(subset=['name', 'last_fight_date'])
+    return rows.sort_values('last_fight_date', kind='stable').groupby('name').tail(1)
+
+def build_profiles(df, state, stats=fighter_state.HIST_STATS):
+    """
+    The profile table for the fighters in `df`, given the fighter state store
+    `state` after those fights. Rows are ordered by last fight, oldest first.
+    """
+    profiles = latest_appearances(df).set_index('name')
+    current = state.reindex(profiles.index)
+
+    profiles['win_streak'] = current['win_streak'].fillna(0).astype(int)
+    profiles['loss_streak'] = current['loss_streak'].fillna(0).astype(int)
+    for stat in stats:
+        counts = current[f'{stat}_count']
+        profiles[f'{stat}_hist_avg'] = (current[f'{stat}_sum'] / counts.where(counts > 0)).fillna(0.0)
+
+    return profiles.reset_index()
+
+def save_profiles(profiles, path=PROFILES_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    profiles.to_csv(path + '.tmp', index=False)
+    os.replace(path + '.tmp', path)
+    logging.info(f"Fighter profiles saved to: {path} ({len(profiles)} fighters)")
+
+class ProfileTable:
+    """
+    The profile table, keyed by profile URL (by name for fighters without
+    one) and with a NameIndex over the names. If two fighters share a
+    normalized name, the one who fought last wins the name.
+    """
+
+    def __init__(self, profiles):
+        records = profiles.astype(object).where(profiles.notna(), None).to_dict('records')
+        self.by_url = {}
+        self.names = NameIndex()
+        for record in records:
+            fighter_id = record['url'] or record['name']
+            self.by_url[fighter_id] = record
+            self.names.add(record['name'], fighter_id)
+
+    def __len__(self):
+        return len(self.by_url)
+
+    def suggest(self, name, limit=3):
+        """Names of the known fighters closest to `name`, best first."""
+        return [match for match, _ in self.names.suggest(name, limit)]
+
+    def get(self, name_or_url, as_of=None):
+        """
+        The profile of a fighter, or None if unknown. Ring rust and age are
+        advanced to `as_of` (default: today).
+        """
+        record = self.by_url.get(name_or_url) or self.by_url.get(self.names.get(name_or_url))
+        if record is None:
+            return None
+
+        as_of = pd.Timestamp.today().normalize() if as_of is None else pd.Timestamp(as_of)
+        days = max((as_of - record['last_fight_date']).days, 0)
+
+        profile = {k: v for k, v in record.items() if k not in ('url', 'last_fight_date')}
+        profile['days_since_last'] = days
+        if profile['age'] is not None:
+            profile['age'] += days / DAYS_PER_YEAR
+        return profile
+
+def load_profiles(path=PROFILES_FILE):
+    """The ProfileTable saved at `path`, or None if the pipeline has not written it yet."""
+    if not os.path.exists(path):
+        return None
+
+    profiles = pd.read_csv(path, parse_dates=['last_fight_date'])
+    return ProfileTable(profiles)
@@ -0,0 +1,263 @@
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+HISTORY_FILE = 'data/processed/fight_history.csv'
+STATE_FILE = 'data/processed/fighter_state.csv'
+
+# Per-fight stats whose running averages are kept (as f1_/f2_ columns in the fight rows).
+HIST_STATS = ['kd', 'sig_str_landed', 'td_landed', 'ctrl', 'sig_pct']
+DEFAULT_DAYS_SINCE_LAST = 180
+KEY = ['fighter', 'opponent', 'event_date']
+# Each fighter's entries in chronological order; the opponent only orders fights on the same date.
+ORDER = ['fighter', 'event_date', 'opponent']
+# Stored with every history entry: a hash of the fight's result and stats, so
+# a corrected fight is noticed even though its key did not change.
+HASH_COLUMN = 'entry_hash'
+
+def feature_columns(stats=HIST_STATS):
+    """Pre-fight features stored per entry, attached to fight rows as f1_<feature> and f2_<feature>."""
+    return ['days_since_last', 'win_streak', 'loss_streak'] + [f'{s}_hist_avg' for s in stats]
+
+def state_columns(stats=HIST_STATS):
+    return ['last_fight_date', 'win_streak', 'loss_streak'] + [f'{s}_{agg}' for s in stats for agg in ('sum', 'count')]
+
+def _dates(col):
+    return pd.to_datetime(col).astype('datetime64[ns]')
+
+def fight_outcomes(df):
+    """Whether f1 won each row."""
+    if 'target' in df.columns:
+        return df['target'] == 1
+    if 'winner' in df.columns:
+        return df['winner'] == df['f1_name']
+    logging.warning("⚠️ No column indicating the winner found. Counting every fight as a loss for both fighters.")
+    return pd.Series(False, index=df.index)
+
+def fighter_entries(df, stats=HIST_STATS):
+    """
+    One row per fighter per fight: fighter, opponent, event date, whether the
+    fighter won, and the fighter's stats in that fight. A fight that appears
+    twice (the mirrored rows of balanced_fights.csv) yields each entry once.
+    Sorted by ORDER, so fights on the same date keep a fixed order.
+    """
+    f1_won = fight_outcomes(df)
+    dates = _dates(df['event_date'])
+
+    sides = []
+    for side, other, won in (('f1', 'f2', f1_won), ('f2', 'f1', ~f1_won)):
+        part = pd.DataFrame({
+            'fighter': df[f'{side}_name'].to_numpy(),
+            'opponent': df[f'{other}_name'].to_numpy(),
+            'event_date': dates.to_numpy(),
+            'won': won.to_numpy(dtype=bool),
+        })
+        for stat in stats:
+            part[stat] = pd.to_numeric(df[f'{side}_{stat}'], errors='coerce').to_numpy(dtype=float)
+        sides.append(part)
+
+    entries = pd.concat(sides, ignore_index=True).dropna(subset=KEY).drop_duplicates(subset=KEY)
+    return entries.sort_values(ORDER, kind='stable').reset_index(drop=True)
+
+def history_columns(stats=HIST_STATS):
+    return KEY + [HASH_COLUMN] + feature_columns(stats)
+
+def entry_hashes(entries, stats=HIST_STATS):
+    """Per-entry hash of whether the fighter won and of their stats in the fight."""
+    return pd.util.hash_pandas_object(entries[['won'] + list(stats)], index=False).to_numpy(dtype=np.uint64)
+
+def prior_mean(values, keys, window=None):
+    """
+    Per-key mean of each column over the earlier rows, in row order: the same
+    as groupby(keys)[col].transform(lambda x: x.shift(1).expanding().mean())
+    for every column at once. With `window`, only the last `window` earlier
+    rows count (like .shift(1).rolling(window, min_periods=1).mean()). NaNs
+    are skipped, and rows with no earlier value get NaN.
+
+    One grouped cumsum of the values and of their non-null counts replaces a
+    Python call per group: the sum before a row is its cumulative sum minus
+    its own value.
+    """
+    values = values.astype(float)
+    present = values.notna().astype(int)
+    filled = values.fillna(0)
+
+    sums = filled.groupby(keys).cumsum()
+    counts = present.groupby(keys).cumsum()
+    prior_sums = sums - filled
+    prior_counts = counts - present
+
+    if window is not None:
+        prior_sums -= sums.groupby(keys).shift(window + 1).fillna(0)
+        prior_counts -= counts.groupby(keys).shift(window + 1).fillna(0)
+
+    return prior_sums / prior_counts.where(prior_counts > 0)
+
+def _streaks(won, fighters):
+    """Length of the run of equal results ending at each entry, split into (win, loss) columns."""
+    block = (won != won.groupby(fighters).shift(1)).cumsum()
+    length = won.groupby([fighters, block]).cumcount() + 1
+    return length.where(won == True, 0), length.where(won == False, 0)
+
+def rebuild(entries, stats=HIST_STATS):
+    """
+    Full backfill over every entry. Returns (history, state): the pre-fight
+    features of each entry, and each fighter's state after their last fight.
+    """
+    grouped = entries.groupby('fighter', sort=False)
+
+    history = entries[KEY].copy()
+    history[HASH_COLUMN] = entry_hashes(entries, stats)
+    history['days_since_last'] = grouped['event_date'].diff().dt.days.fillna(DEFAULT_DAYS_SINCE_LAST)
+
+    prev_won = grouped['won'].shift(1)
+    win_streak, loss_streak = _streaks(prev_won, entries['fighter'])
+    history['win_streak'] = win_streak.where(prev_won.notna(), 0).astype(int)
+    history['loss_streak'] = loss_streak.where(prev_won.notna(), 0).astype(int)
+
+    averages = prior_mean(entries[stats], entries['fighter']).fillna(0)
+    for stat in stats:
+        history[f'{stat}_hist_avg'] = averages[stat]
+
+    win_streak, loss_streak = _streaks(entries['won'], entries['fighter'])
+    last = entries.assign(win_streak=win_streak, loss_streak=loss_streak).groupby('fighter').tail(1).set_index('fighter')
+    state = pd.DataFrame({
+        'last_fight_date': last['event_date'],
+        'win_streak': last['win_streak'].astype(int),
+        'loss_streak': last['loss_streak'].astype(int),
+    })
+    totals = entries.groupby('fighter')[stats].agg(['sum', 'count'])
+    for stat in stats:
+        state[f'{stat}_sum'] = totals[(stat, 'sum')]
+        state[f'{stat}_count'] = totals[(stat, 'count')]
+
+    return history, state.sort_index()
+
+def update(history, state, new_entries, stats=HIST_STATS):
+    """
+    Appends the pre-fight features of `new_entries` (sorted, and all later
+    than `history`) and advances `state` past them. Touches only the fighters
+    in `new_entries`, so a weekly run costs O(new fights).
+    """
+    records = {}
+    rows = []
+
+    for entry, entry_hash in zip(new_entries.itertuples(index=False), entry_hashes(new_entries, stats)):
+        current = records.get(entry.fighter)
+        if current is None:
+            if entry.fighter in state.index:
+                current = state.loc[entry.fighter].to_dict()
+            else:
+                current = dict.fromkeys(state_columns(stats), 0) | {'last_fight_date': pd.NaT}
+            records[entry.fighter] = current
+
+        last_date = current['last_fight_date']
+        row = {
+            'fighter': entry.fighter,
+            'opponent': entry.opponent,
+            'event_date': entry.event_date,
+            HASH_COLUMN: entry_hash,
+            'days_since_last': DEFAULT_DAYS_SINCE_LAST if pd.isna(last_date) else (entry.event_date - last_date).days,
+            'win_streak': current['win_streak'],
+            'loss_streak': current['loss_streak'],
+        }
+        for stat in stats:
+            count = current[f'{stat}_count']
+            row[f'{stat}_hist_avg'] = current[f'{stat}_sum'] / count if count else 0.0
+        rows.append(row)
+
+        current['last_fight_date'] = entry.event_date
+        if entry.won:
+            current['win_streak'], current['loss_streak'] = current['win_streak'] + 1, 0
+        else:
+            current['win_streak'], current['loss_streak'] = 0, current['loss_streak'] + 1
+        for stat in stats:
+            value = getattr(entry, stat)
+            if not np.isnan(value):
+                current[f'{stat}_sum'] += value
+                current[f'{stat}_count'] += 1
+
+    if not rows:
+        return history, state
+
+    changed = pd.DataFrame.from_dict(records, orient='index')[state.columns]
+    state = pd.concat([state.drop(index=changed.index, errors='ignore'), changed]).sort_index()
+    history = pd.concat([history, pd.DataFrame(rows, columns=history.columns)], ignore_index=True)
+    return history.sort_values(ORDER, kind='stable').reset_index(drop=True), state
+
+def load_store(history_file=HISTORY_FILE, state_file=STATE_FILE):
+    """Returns the persisted (history, state), or (None, None) if there is no store yet."""
+    if not (os.path.exists(history_file) and os.path.exists(state_file)):
+        return None, None
+
+    history = pd.read_csv(history_file)
+    history['event_date'] = _dates(history['event_date'])
+    if HASH_COLUMN in history.columns:
+        history[HASH_COLUMN] = history[HASH_COLUMN].astype(np.uint64)
+    state = pd.read_csv(state_file, index_col='fighter')
+    state['last_fight_date'] = _dates(state['last_fight_date'])
+    return history, state
+
+def save_store(history, state, history_file=HISTORY_FILE, state_file=STATE_FILE):
+    os.makedirs(os.path.dirname(history_file), exist_ok=True)
+    history.to_csv(history_file, index=False)
+    state.to_csv(state_file, index_label='fighter')
+
+def refresh(entries, full_rebuild=False, stats=HIST_STATS):
+    """
+    Brings the persisted store up to date with `entries` and returns it as
+    (history, state). Entries later than the newest stored fight are applied
+    incrementally; anything else (no store, different stats, or a change to
+    already-stored fights, including a corrected result or corrected stats)
+    falls back to a full rebuild.
+    """
+    history, state = (None, None) if full_rebuild else load_store()
+
+    reason = None
+    if full_rebuild:
+        reason = "full rebuild requested"
+    elif history is None:
+        reason = "no fighter state store yet"
+    elif list(history.columns) != history_columns(stats):
+        reason = "stored columns differ"
+    else:
+        known = entries['event_date'] <= history['event_date'].max()
+        stored = entries[known].reset_index(drop=True)
+        if not (stored[KEY].equals(history[KEY])
+                and (entry_hashes(stored, stats) == history[HASH_COLUMN].to_numpy()).all()):
+            reason = "already-stored fights changed"
+
+    if reason:
+        logging.info(f"Rebuilding fighter state from {len(entries)} fight entries ({reason}).")
+        history, state = rebuild(entries, stats)
+    else:
+        new_entries = entries[~known]
+        logging.info(f"Updating fighter state with {len(new_entries)} new fight entries.")
+        history, state = update(history, state, new_entries, stats)
+
+    save_store(history, state)
+    return history, state
+
+def verify(entries, history, stats=HIST_STATS):
+    """Columns where `history` disagrees with a full rebuild over `entries` (empty if it matches)."""
+    expected, _ = rebuild(entries, stats)
+    if len(expected) != len(history) or not expected[KEY].equals(history[KEY].reset_index(drop=True)):
+        return KEY
+    return [
+        col for col in feature_columns(stats)
+        if not np.allclose(expected[col].to_numpy(dtype=float), history[col].to_numpy(dtype=float), equal_nan=True)
+    ]
+
+def attach_history(df, history, stats=HIST_STATS):
+    """Adds each fighter's pre-fight features to `df` as f1_<feature> and f2_<feature> columns."""
+    dates = _dates(df['event_date'])
+    indexed = history.set_index(KEY)[feature_columns(stats)]
+
+    for side, other in (('f1', 'f2'), ('f2', 'f1')):
+        keys = pd.MultiIndex.from_arrays([df[f'{side}_name'], df[f'{other}_name'], dates], names=KEY)
+        features = indexed.reindex(keys)
+        for col in features.columns:
+            df[f'{side}_{col}'] = features[col].to_numpy()
+    return df
@@ -1,22 +1,58 @@
 import pandas as pd
-import numpy as np
 import os
 
 FIGHTS_FILE = 'data/processed/clean_fight_details.csv'
 FIGHTERS_FILE = 'data/processed/clean_fighter_details.csv'
 OUTPUT_FILE = 'data/processed/merged_data.csv'
 
-def calculate_age(row, dob_col, date_col):
-    """Calculate age at the time of the fight."""
-    if pd.isna(row[dob_col]) or pd.isna(row[date_col]):
-        return np.nan
-    try:
-        born = pd.to_datetime(row[dob_col])
-        fight_date = pd.to_datetime(row[date_col])
-        return (fight_date - born).days / 365.25
-    except:
-        return np.nan
-    
+BIO_COLUMNS = {
+    'height_cm': 'height',
+    'weight_kg': 'weight',
+    'reach_cm': 'reach',
+    'stance': 'stance',
+}
+DAYS_PER_YEAR = 365.25
+
+def ages_at(dob, event_date):
+    """Ages in years at each event date, NaN where either date is missing."""
+    return (event_date - dob).dt.days / DAYS_PER_YEAR
+
+def fighter_bios(fighters):
+    """
+    The fighter table indexed by profile url, with DOBs parsed once per fighter.
+    Unparseable DOBs become NaT, so those fighters get no age.
+    """
+    duplicated = fighters['url'].duplicated()
+    if duplicated.any():
+        print(f"Warning: ignoring {duplicated.sum()} duplicated fighter rows.")
+
+    bios = fighters.loc[~duplicated, ['url', *BIO_COLUMNS, 'dob']].set_index('url')
+    bios['dob'] = pd.to_datetime(bios['dob'], format='mixed', errors='coerce')
+    return bios
+
+def attach_bios(fights, fighters):
+    """
+    Adds winner_/loser_ height, weight, reach, stance and age columns.
+    Both corners are looked up in a single reindex of the url-indexed fighter
+    table; fighters without a profile get NaN.
+    """
+    bios = fighter_bios(fighters)
+    links = pd.concat([fights['winner_link'], fights['loser_link']], ignore_index=True)
+    corners = bios.reindex(links)
+
+    n = len(fights)
+    winner = corners.iloc[:n].set_axis(fights.index)
+    loser = corners.iloc[n:].set_axis(fights.index)
+
+    attached = {}
+    for prefix, bio in [('winner', winner), ('loser', loser)]:
+        for column, name in BIO_COLUMNS.items():
+            attached[f'{prefix}_{name}'] = bio[column]
+    attached['winner_age'] = ages_at(winner['dob'], fights['event_date'])
+    attached['loser_age'] = ages_at(loser['dob'], fights['event_date'])
+
+    return pd.concat([fights, pd.DataFrame(attached, index=fights.index)], axis=1)
+
 def merge_data():
     if not os.path.exists(FIGHTS_FILE) or not os.path.exists(FIGHTERS_FILE):
         print("Required files are missing. Please ensure both fight and fighter details CSV files are present.")
@@ -28,45 +64,9 @@ def merge_data():
 
     fights['event_date'] = pd.to_datetime(fights['event_date'], errors='coerce')
 
-    print("Merging winner deta...")
-    fights = fights.merge(
-        fighters[['url', 'height_cm', 'weight_kg', 'reach_cm', 'stance', 'dob']], 
-        left_on='winner_link', 
-        right_on='url', 
-        how='left'
-    )
-
-    fights.rename(columns={
-        'height_cm': 'winner_height',
-        'weight_kg': 'winner_weight',
-        'reach_cm': 'winner_reach',
-        'stance': 'winner_stance',
-        'dob': 'winner_dob'
-    }, inplace=True)
-    fights.drop(columns=['url'], inplace=True)
-
-    print("Merging loser deta...")
-    fights = fights.merge(
-        fighters[['url', 'height_cm', 'weight_kg', 'reach_cm', 'stance', 'dob']], 
-        left_on='loser_link', 
-        right_on='url', 
-        how='left'
-    )
-
-    fights.rename(columns={
-        'height_cm': 'loser_height',
-        'weight_kg': 'loser_weight',
-        'reach_cm': 'loser_reach',
-        'stance': 'loser_stance',
-        'dob': 'loser_dob'
-    }, inplace=True)
-    fights.drop(columns=['url'], inplace=True)
-
-    print("Calculating ages at the time of the fight...")
-    fights['winner_age'] = fights.apply(lambda x: calculate_age(x, 'winner_dob', 'event_date'), axis=1)
-    fights['loser_age'] = fights.apply(lambda x: calculate_age(x, 'loser_dob', 'event_date'), axis=1)
+    print("Attaching winner and loser bios and ages...")
+    fights = attach_bios(fights, fighters)
 
-    fights.drop(columns=['winner_dob', 'loser_dob'], inplace=True)
     print("Saving merged data...")
     fights.to_csv(OUTPUT_FILE, index=False)
 
@@ -76,4 +76,4 @@ def merge_data():
     print(f"New columns sample: {list(fights.columns[-10:])}")
 
 if __name__ == "__main__":
-    merge_data()
\ No newline at end of file
+    merge_data()
@@ -0,0 +1,72 @@
+"""
+Fighter-name index. Names are reduced to a normalized key for exact
+lookups, and every key's character trigrams are indexed so that names which
+do not match exactly (a typo, a missing hyphen, a different transliteration)
+still get the closest known fighters as suggestions.
+"""
+import re
+import unicodedata
+from collections import Counter, defaultdict
+
+# Letters NFKD does not decompose into a base letter plus accents.
+FOLDED_LETTERS = str.maketrans({'ł': 'l', 'ø': 'o', 'đ': 'd', 'ð': 'd', 'þ': 'th', 'æ': 'ae', 'œ': 'oe', 'ı': 'i'})
+DROPPED = re.compile(r"['’`.]")
+SEPARATORS = re.compile(r"[\W_]+")
+MIN_SIMILARITY = 0.3
+
+def normalize_name(name):
+    """
+    Lookup key for a fighter name: accents and case folded, apostrophes and
+    periods dropped, any other punctuation read as a space. 'José Aldo',
+    "Sean O'Malley" and 'B.J. Penn' become 'jose aldo', 'sean omalley' and
+    'bj penn'.
+    """
+    text = unicodedata.normalize('NFKD', str(name))
+    text = ''.join(c for c in text if not unicodedata.combining(c)).casefold().translate(FOLDED_LETTERS)
+    text = DROPPED.sub('', text)
+    return ' '.join(SEPARATORS.sub(' ', text).split())
+
+def trigrams(key):
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class NameIndex:
+    """Maps fighter names, through their normalized keys, to a value (the fighter's id)."""
+
+    def __init__(self):
+        self.entries = {}
+        self.postings = defaultdict(set)
+        self.sizes = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, name, value):
+        """Indexes `name`. A later name with the same key replaces the earlier one."""
+        key = normalize_name(name)
+        if key not in self.entries:
+            grams = trigrams(key)
+            for gram in grams:
+                self.postings[gram].add(key)
+            self.sizes[key] = len(grams)
+        self.entries[key] = (name, value)
+
+    def get(self, name):
+        """The value for `name`, or None if no indexed name has its key."""
+        entry = self.entries.get(normalize_name(name))
+        return entry[1] if entry else None
+
+    def suggest(self, name, limit=3, min_similarity=MIN_SIMILARITY):
+        """
+        Up to `limit` (name, similarity) pairs for the indexed names closest to
+        `name`, best first. Similarity is the Dice coefficient of the keys'
+        trigram sets, from 0 to 1 (same key).
+        """
+        grams = trigrams(normalize_name(name))
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+
+        scored = [(2 * count / (len(grams) + self.sizes[key]), key) for key, count in shared.items()]
+        scored = sorted((s for s in scored if s[0] >= min_similarity), key=lambda s: (-s[0], s[1]))
+        return [(self.entries[key][0], round(score, 3)) for score, key in scored[:limit]]
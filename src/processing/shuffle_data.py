@@ -4,6 +4,82 @@ import os
 
 INPUT_FILE = 'data/processed/merged_data.csv'
 OUTPUT_FILE = 'data/processed/balanced_fights.csv'
+RANDOM_STATE = 42
+CHUNK_SIZE = 50_000
+
+KEEP_COLS = ['target', 'weight_class', 'total_time_seconds', 'method_detail', 'referee', 'event_date']
+BIO_COLS = ['height', 'weight', 'reach', 'stance', 'age']
+
+def base_stats(df):
+    """Per-fight stats recorded for both corners (f1_kd, f2_kd, ...), without the f1_ prefix."""
+    stat_cols = [c for c in df.columns if c.startswith('f1_') and 'name' not in c and 'link' not in c and 'id' not in c]
+    return [c.replace('f1_', '') for c in stat_cols]
+
+def corner_sources(df):
+    """
+    For every f1_/f2_ output column, the two source columns it is picked from
+    and which of them holds the winner's value in each fight (True: the first).
+    Fight stats are stored as f1/f2 and bios and names as winner/loser.
+    """
+    mask_f1_winner = (df['f1_name'] == df['winner']).to_numpy()
+    always = np.ones(len(df), dtype=bool)
+
+    sources = {'name': ('winner', 'loser', always)}
+    if 'winner_link' in df.columns:
+        sources['link'] = ('winner_link', 'loser_link', always)
+    for stat in base_stats(df):
+        sources[stat] = (f'f1_{stat}', f'f2_{stat}', mask_f1_winner)
+    for bio in BIO_COLS:
+        if f'winner_{bio}' in df.columns:
+            sources[bio] = (f'winner_{bio}', f'loser_{bio}', always)
+    return sources
+
+def shuffled_order(n, random_state=RANDOM_STATE):
+    """
+    The row order of the shuffled, mirrored dataset: values below n are the
+    fights as winner vs loser (target 1), n and above the mirrored copies.
+    Same permutation as DataFrame.sample(frac=1, random_state=...) on 2n rows.
+    """
+    return pd.RangeIndex(2 * n).to_series().sample(frac=1, random_state=random_state).to_numpy()
+
+def output_columns(sources):
+    corners = [f'{side}_{name}' for name in sources for side in ('f1', 'f2')]
+    return corners[:4] + KEEP_COLS + corners[4:]
+
+def balanced_chunks(df, chunk_size=CHUNK_SIZE, random_state=RANDOM_STATE):
+    """
+    Yields the balanced dataset in chunks of rows. Nothing is copied per
+    orientation: each chunk's f1_/f2_ columns are gathered straight from the
+    source columns, swapping winner and loser for the mirrored rows.
+    """
+    n = len(df)
+    sources = corner_sources(df)
+    columns = output_columns(sources)
+    order = shuffled_order(n, random_state)
+    arrays = {col: df[col].to_numpy() for pair in sources.values() for col in pair[:2]}
+    arrays.update({col: df[col].to_numpy() for col in KEEP_COLS if col in df.columns})
+
+    for start in range(0, len(order), chunk_size):
+        idx = order[start:start + chunk_size]
+        fight = idx % n
+        winner_side = idx < n
+
+        chunk = {'target': winner_side.astype(np.int64)}
+        for name, (first, second, first_is_winner) in sources.items():
+            # f1 is the winner in the original rows and the loser in the mirrored ones.
+            f1_from_first = first_is_winner[fight] == winner_side
+            a, b = arrays[first][fight], arrays[second][fight]
+            chunk[f'f1_{name}'] = np.where(f1_from_first, a, b)
+            chunk[f'f2_{name}'] = np.where(f1_from_first, b, a)
+        for col in KEEP_COLS[1:]:
+            if col in arrays:
+                chunk[col] = arrays[col][fight]
+
+        yield pd.DataFrame(chunk, columns=[c for c in columns if c in chunk])
+
+def balanced_frame(df, random_state=RANDOM_STATE):
+    """The whole balanced dataset as one DataFrame."""
+    return pd.concat(balanced_chunks(df, random_state=random_state), ignore_index=True)
 
 def create_balanced_dataset():
     if not os.path.exists(INPUT_FILE):
@@ -12,87 +88,20 @@ def create_balanced_dataset():
 
     print("Loading entire dataset...")
     df = pd.read_csv(INPUT_FILE)
+    if df.empty:
+        print(f"Error: {INPUT_FILE} has no fights.")
+        return
 
-    stat_cols = [c for c in df.columns if c.startswith('f1_') and 'name' not in c and 'link' not in c and 'id' not in c]
-    base_stats = [c.replace('f1_', '') for c in stat_cols]
-
-    bio_cols = ['height', 'weight', 'reach', 'stance', 'age']
-
-    print("Standardizing stats for Winner vs Loser...")
-    
-    mask_f1_winner = df['f1_name'] == df['winner']
-
-    for stat in base_stats:
-        df[f'winner_{stat}'] = np.where(mask_f1_winner, df[f'f1_{stat}'], df[f'f2_{stat}'])
-        df[f'loser_{stat}']  = np.where(mask_f1_winner, df[f'f2_{stat}'], df[f'f1_{stat}'])
-
-    df_a = df.copy()
-    
-    cols_to_drop = [f'f1_{s}' for s in base_stats] + [f'f2_{s}' for s in base_stats]
-    cols_to_drop += ['f1_name', 'f2_name', 'f1_link', 'f2_link']
-    cols_to_drop = [c for c in cols_to_drop if c in df_a.columns]
-    df_a.drop(columns=cols_to_drop, inplace=True)
-
-    map_a = {
-        'winner': 'f1_name', 'loser': 'f2_name',
-        'winner_link': 'f1_link', 'loser_link': 'f2_link',
-    }
-    
-    for stat in base_stats:
-        map_a[f'winner_{stat}'] = f'f1_{stat}'
-        map_a[f'loser_{stat}'] = f'f2_{stat}'
-    for bio in bio_cols:
-        map_a[f'winner_{bio}'] = f'f1_{bio}'
-        map_a[f'loser_{bio}'] = f'f2_{bio}'
-
-    df_a = df_a.rename(columns=map_a)
-    df_a['target'] = 1
-
-    df_b = df.copy()
-    
-    df_b.drop(columns=cols_to_drop, inplace=True)
-
-    map_b = {
-        'loser': 'f1_name', 'winner': 'f2_name',
-        'loser_link': 'f1_link', 'winner_link': 'f2_link',
-    }
-
-    for stat in base_stats:
-        map_b[f'loser_{stat}'] = f'f1_{stat}'
-        map_b[f'winner_{stat}'] = f'f2_{stat}'
-    for bio in bio_cols:
-        map_b[f'loser_{bio}'] = f'f1_{bio}'
-        map_b[f'winner_{bio}'] = f'f2_{bio}'
-
-    df_b = df_b.rename(columns=map_b)
-    df_b['target'] = 0
-
-    print("Concatenating and removing excess columns...")
-    
-    df_final = pd.concat([df_a, df_b], ignore_index=True)
-    
-    keep_cols = [
-        'f1_name', 'f2_name', 'f1_link', 'f2_link', 'target', 
-        'weight_class', 'total_time_seconds', 'method_detail', 'referee', 'event_date'
-    ]
-    
-    stats_final = [c for c in df_final.columns if c.startswith('f1_') or c.startswith('f2_')]
-    
-    final_cols_list = list(set(keep_cols + stats_final))
-    
-    final_cols_list = [c for c in final_cols_list if c in df_final.columns]
-    
-    df_final = df_final[final_cols_list]
-
-    df_final = df_final.loc[:, ~df_final.columns.duplicated()]
-
-    df_final = df_final.sample(frac=1, random_state=42).reset_index(drop=True)
-
-    print(f"Total rows for training: {len(df_final)}")
-    print(f"Final column ({len(df_final.columns)}): {list(df_final.columns[:5])}...")
-    
-    df_final.to_csv(OUTPUT_FILE, index=False)
+    print("Writing both orientations of every fight, shuffled...")
+    rows = 0
+    for i, chunk in enumerate(balanced_chunks(df)):
+        chunk.to_csv(OUTPUT_FILE, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+        rows += len(chunk)
+        columns = list(chunk.columns)
+
+    print(f"Total rows for training: {rows}")
+    print(f"Final column ({len(columns)}): {columns[:5]}...")
     print(f"File saved: {OUTPUT_FILE}")
 
 if __name__ == "__main__":
-    create_balanced_dataset()
\ No newline at end of file
+    create_balanced_dataset()
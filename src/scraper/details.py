@@ -1,13 +1,19 @@
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
-import time
+import asyncio
+import argparse
 import os
 from tqdm import tqdm
 
+from src.scraper import http_client
+from src.scraper.manifest import KeyManifest
+from src.scraper.parsing import fight_details_filter, make_soup
+from src.scraper.staged import FETCH_WORKERS, PARSE_WORKERS, run_staged
+
 INPUT_FILE = 'data/raw/all_fights.csv'
 OUTPUT_FILE = 'data/raw/fight_details.csv'
 SAVE_INTERVAL = 10
+CONCURRENCY = 16
+PER_HOST_LIMIT = 8
 
 def extract_header_stats(soup):
     """
@@ -59,83 +65,101 @@ def extract_values(td):
         return clean_text(p_tags[0].text), clean_text(p_tags[1].text)
     return None, None
 
+def parse_fight_stats(content, backend=None):
+    """
+    Parses a fight details page into the stats record stored in fight_details.csv
+    """
+    soup = make_soup(content, fight_details_filter(), backend)
+
+    header_stats = extract_header_stats(soup)        
+
+    tables = soup.find_all('table') 
+    if not tables: return None
+
+    rows = tables[0].find_all('tr', class_='b-fight-details__table-row')
+    if len(rows) < 2: return None
+
+    data_row = rows[1]
+    cols = data_row.find_all('td')
+
+    f1_name, f2_name = extract_values(cols[0])
+    f1_kd, f2_kd = extract_values(cols[1])
+    f1_sig_str, f2_sig_str = extract_values(cols[2])
+    f1_sig_pct, f2_sig_pct = extract_values(cols[3])
+    f1_tot_str, f2_tot_str = extract_values(cols[4])
+    f1_td, f2_td = extract_values(cols[5])
+    f1_td_pct, f2_td_pct = extract_values(cols[6])
+    f1_sub_att, f2_sub_att = extract_values(cols[7])
+    f1_rev, f2_rev = extract_values(cols[8])
+    f1_ctrl, f2_ctrl = extract_values(cols[9])
+
+    return {
+        'end_round': header_stats['total_rounds'],
+        'end_time': header_stats['last_round_time'],
+        'time_format': header_stats['time_format'],
+        'referee': header_stats['referee'],
+        'method_detail': header_stats['win_method_details'],
+        'f1_name': f1_name, 'f2_name': f2_name,
+        'f1_kd': f1_kd, 'f2_kd': f2_kd,
+        'f1_sig_str': f1_sig_str, 'f2_sig_str': f2_sig_str,
+        'f1_sig_pct': f1_sig_pct, 'f2_sig_pct': f2_sig_pct,
+        'f1_tot_str': f1_tot_str, 'f2_tot_str': f2_tot_str,
+        'f1_td': f1_td, 'f2_td': f2_td,
+        'f1_td_pct': f1_td_pct, 'f2_td_pct': f2_td_pct,
+        'f1_sub_att': f1_sub_att, 'f2_sub_att': f2_sub_att,
+        'f1_rev': f1_rev, 'f2_rev': f2_rev,
+        'f1_ctrl': f1_ctrl, 'f2_ctrl': f2_ctrl
+    }
+
 def get_fight_stats(url):
     try:
-        response = requests.get(url, timeout=10)
+        response = http_client.get(url)
         if response.status_code != 200:
             return None
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-
-        header_stats = extract_header_stats(soup)        
-
-        tables = soup.find_all('table') 
-        if not tables: return None
-
-        rows = tables[0].find_all('tr', class_='b-fight-details__table-row')
-        if len(rows) < 2: return None
-
-        data_row = rows[1]
-        cols = data_row.find_all('td')
-
-        f1_name, f2_name = extract_values(cols[0])
-        f1_kd, f2_kd = extract_values(cols[1])
-        f1_sig_str, f2_sig_str = extract_values(cols[2])
-        f1_sig_pct, f2_sig_pct = extract_values(cols[3])
-        f1_tot_str, f2_tot_str = extract_values(cols[4])
-        f1_td, f2_td = extract_values(cols[5])
-        f1_td_pct, f2_td_pct = extract_values(cols[6])
-        f1_sub_att, f2_sub_att = extract_values(cols[7])
-        f1_rev, f2_rev = extract_values(cols[8])
-        f1_ctrl, f2_ctrl = extract_values(cols[9])
-
-        return {
-            'end_round': header_stats['total_rounds'],
-            'end_time': header_stats['last_round_time'],
-            'time_format': header_stats['time_format'],
-            'referee': header_stats['referee'],
-            'method_detail': header_stats['win_method_details'],
-            'f1_name': f1_name, 'f2_name': f2_name,
-            'f1_kd': f1_kd, 'f2_kd': f2_kd,
-            'f1_sig_str': f1_sig_str, 'f2_sig_str': f2_sig_str,
-            'f1_sig_pct': f1_sig_pct, 'f2_sig_pct': f2_sig_pct,
-            'f1_tot_str': f1_tot_str, 'f2_tot_str': f2_tot_str,
-            'f1_td': f1_td, 'f2_td': f2_td,
-            'f1_td_pct': f1_td_pct, 'f2_td_pct': f2_td_pct,
-            'f1_sub_att': f1_sub_att, 'f2_sub_att': f2_sub_att,
-            'f1_rev': f1_rev, 'f2_rev': f2_rev,
-            'f1_ctrl': f1_ctrl, 'f2_ctrl': f2_ctrl
-        }
+        return parse_fight_stats(response.content)
 
     except Exception as e:
         print(f"Error processing {url}: {e}")
         return None
 
-def main():
-    if not os.path.exists(INPUT_FILE):
-        print(f"{INPUT_FILE} not found.")
-        return
-
-    fights_df = pd.read_csv(INPUT_FILE)
-    
-    processed_links = set()
-    if os.path.exists(OUTPUT_FILE):
+async def get_fight_stats_async(session, semaphore, url):
+    """
+    Async version of get_fight_stats. The semaphore caps how many fights are in flight at once.
+    """
+    async with semaphore:
         try:
-            existing_data = pd.read_csv(OUTPUT_FILE)
-            if 'fight_link' in existing_data.columns:
-                processed_links = set(existing_data['fight_link'].unique())
-                print(f"Resuming... {len(processed_links)} processed fights found.")
-        except pd.errors.EmptyDataError:
-            print("Output file is empty. Starting from scratch.")
+            status, content = await http_client.get_client().get_async(session, url)
+            if status != 200:
+                return None
 
-    fights_to_process = fights_df[~fights_df['fight_link'].isin(processed_links)]
+            return parse_fight_stats(content)
 
-    print(f"Starting scrape of details for {len(fights_to_process)} remaining fights...")
+        except Exception as e:
+            print(f"Error processing {url}: {e}")
+            return None
 
-    if len(fights_to_process) == 0:
-        print("All fights have already been processed!")
-        return
+def fetch_page(row):
+    response = http_client.get(row['fight_link'])
+    return response.content if response.status_code == 200 else None
+
+def parse_record(row, content):
+    stats = parse_fight_stats(content)
+    return row | stats if stats else None
+
+def get_manifest():
+    return KeyManifest(OUTPUT_FILE, 'fight_link')
 
+def append_rows(rows):
+    """Appends a chunk of scraped records to the output file, writing the header only once"""
+    chunk_df = pd.DataFrame(rows)
+    
+    header = not os.path.exists(OUTPUT_FILE)
+    
+    chunk_df.to_csv(OUTPUT_FILE, mode='a', header=header, index=False)
+    get_manifest().add(row['fight_link'] for row in rows)
+
+def scrape_sequentially(fights_to_process):
     new_rows = []
 
     for i, (index, row) in enumerate(tqdm(fights_to_process.iterrows(), total=len(fights_to_process))):
@@ -146,18 +170,85 @@ def main():
             full_record = row.to_dict() | stats 
             new_rows.append(full_record)
 
-        time.sleep(0.05)
-
         if len(new_rows) >= SAVE_INTERVAL or (i + 1) == len(fights_to_process):
             if new_rows:
-                chunk_df = pd.DataFrame(new_rows)
-                
-                header = not os.path.exists(OUTPUT_FILE)
-                
-                chunk_df.to_csv(OUTPUT_FILE, mode='a', header=header, index=False)
+                append_rows(new_rows)
+                new_rows = []
+
+async def scrape_concurrently(fights_to_process, concurrency=CONCURRENCY, per_host_limit=PER_HOST_LIMIT):
+    """
+    Fetches fight pages concurrently over a shared aiohttp session.
+    `concurrency` caps the number of fights in flight and `per_host_limit` caps
+    the open connections to a single host. Records are appended in chunks as
+    they complete, so an interrupted run resumes like the sequential mode.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    new_rows = []
+
+    async with http_client.get_client().async_session(concurrency, per_host_limit) as session:
+        async def fetch(row):
+            return row, await get_fight_stats_async(session, semaphore, row['fight_link'])
+
+        tasks = [asyncio.create_task(fetch(row)) for row in fights_to_process.to_dict('records')]
+
+        for task in tqdm(asyncio.as_completed(tasks), total=len(tasks)):
+            row, stats = await task
+
+            if stats:
+                new_rows.append(row | stats)
+
+            if len(new_rows) >= SAVE_INTERVAL:
+                append_rows(new_rows)
                 new_rows = []
 
+    if new_rows:
+        append_rows(new_rows)
+
+def scrape_staged(fights_to_process, fetch_workers=FETCH_WORKERS, parse_workers=PARSE_WORKERS):
+    """Fetches on I/O threads, parses on a process pool and appends from a single writer."""
+    run_staged(fights_to_process.to_dict('records'), fetch_page, parse_record, append_rows,
+               SAVE_INTERVAL, fetch_workers, parse_workers)
+
+def main(concurrent=False, concurrency=CONCURRENCY, per_host_limit=PER_HOST_LIMIT,
+         pipelined=False, fetch_workers=FETCH_WORKERS, parse_workers=PARSE_WORKERS):
+    if not os.path.exists(INPUT_FILE):
+        print(f"{INPUT_FILE} not found.")
+        return
+
+    fights_df = pd.read_csv(INPUT_FILE)
+    
+    processed_links = get_manifest().load()
+    if processed_links:
+        print(f"Resuming... {len(processed_links)} processed fights found.")
+
+    fights_to_process = fights_df[~fights_df['fight_link'].isin(processed_links)]
+
+    print(f"Starting scrape of details for {len(fights_to_process)} remaining fights...")
+
+    if len(fights_to_process) == 0:
+        print("All fights have already been processed!")
+        return
+
+    if concurrent:
+        asyncio.run(scrape_concurrently(fights_to_process, concurrency, per_host_limit))
+    elif pipelined:
+        scrape_staged(fights_to_process, fetch_workers, parse_workers)
+    else:
+        scrape_sequentially(fights_to_process)
+
     print("Scrape completed successfully!")
+    http_client.report()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Scrape fight details from ufcstats.com")
+    parser.add_argument('--concurrent', action='store_true', help="Fetch fight pages concurrently with aiohttp")
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY, help="Maximum fights in flight at once")
+    parser.add_argument('--per-host', type=int, default=PER_HOST_LIMIT, help="Maximum open connections per host")
+    parser.add_argument('--pipelined', action='store_true', help="Run fetch, parse and write as separate pipelined stages")
+    parser.add_argument('--fetch-workers', type=int, default=FETCH_WORKERS, help="Fetch threads in pipelined mode")
+    parser.add_argument('--parse-workers', type=int, default=PARSE_WORKERS, help="Parse processes in pipelined mode (defaults to the number of cores)")
+    args = parser.parse_args()
+
+    main(concurrent=args.concurrent, concurrency=args.concurrency, per_host_limit=args.per_host,
+         pipelined=args.pipelined, fetch_workers=args.fetch_workers, parse_workers=args.parse_workers)
\ No newline at end of file
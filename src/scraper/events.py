@@ -1,17 +1,24 @@
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
+import argparse
+import json
 import os
 import re
 
-EVENTS_URL = "http://ufcstats.com/statistics/events/completed?page=all"
-HEADERS = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+from src.core.config import settings
+from src.core.exceptions import CacheMissError
+from src.scraper import http_client
+
+EVENTS_URL = f"{settings.UFCSTATS_BASE_URL}/statistics/events/completed?page=all"
+EVENTS_PAGE_URL = f"{settings.UFCSTATS_BASE_URL}/statistics/events/completed?page={{page}}"
+EVENTS_FILE = 'data/raw/all_events.csv'
+WATERMARK_FILE = 'data/raw/events_watermark.json'
+MAX_INCREMENTAL_PAGES = 3
 
 def get_next_event():
         
-    response = requests.get(EVENTS_URL, headers=HEADERS)
+    response = http_client.get(EVENTS_URL)
     soup = BeautifulSoup(response.content, 'html.parser')
     next_icon = soup.find('img', src=re.compile(r'next\.png'))
 
@@ -40,9 +47,9 @@ def get_event_fights(event_link):
     Find the link of the next event and extract the fights list with fighters names and weight class
     """
     try:
-        response = requests.get(event_link, headers=HEADERS)
+        response = http_client.get(event_link)
         response.raise_for_status()
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, CacheMissError) as e:
         print(f"Request error: {e}")
         return None
     
@@ -67,21 +74,13 @@ def get_event_fights(event_link):
     return fights
 
 
-def get_all_events():
+def parse_events_listing(content, stop_at_link=None, completed_only=False):
     """
-    Search all UFC events list
-    return a DataFrame with: Name, Date, Local and link
+    Parses an events listing page, newest first.
+    Parsing stops at `stop_at_link` (exclusive); the second return value tells
+    whether it was reached. `completed_only` skips the upcoming event row.
     """
-    print(f"Downloading event list from: {EVENTS_URL}...")
-
-    try:
-        response = requests.get(EVENTS_URL, headers=HEADERS)
-        response.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        print(f"Request error: {e}")
-        return None
-
-    soup = BeautifulSoup(response.content, 'html.parser')
+    soup = BeautifulSoup(content, 'html.parser')
     rows = soup.select('tr.b-statistics__table-row')
 
     events_data = []
@@ -97,13 +96,19 @@ def get_all_events():
         if link_tag is None:
             continue
 
+        if completed_only and row.find('img', src=re.compile(r'next\.png')):
+            continue
+
         event_name = link_tag.text.strip()
         event_link = link_tag['href']
 
+        if stop_at_link is not None and event_link == stop_at_link:
+            return events_data, True
+
         date_span = cols[0].find('span')
         event_date = date_span.text.strip() if date_span else "Unknown date"
 
-        event_location = cols[1].text.strip()
+        event_location = cols[1].text.strip() if len(cols) > 1 else ""
 
         events_data.append({
             'name': event_name,
@@ -112,19 +117,113 @@ def get_all_events():
             'link': event_link
         })
 
+    return events_data, False
+
+def get_all_events(completed_only=False):
+    """
+    Search all UFC events list
+    return a DataFrame with: Name, Date, Local and link
+    """
+    print(f"Downloading event list from: {EVENTS_URL}...")
+
+    try:
+        response = http_client.get(EVENTS_URL)
+        response.raise_for_status()
+    except (requests.exceptions.RequestException, CacheMissError) as e:
+        print(f"Request error: {e}")
+        return None
+
+    events_data, _ = parse_events_listing(response.content, completed_only=completed_only)
     return pd.DataFrame(events_data)
 
+def get_new_events(watermark_link):
+    """
+    Returns the completed events newer than `watermark_link`, newest first.
+    Walks the paginated listing and stops at the watermark, so a weekly refresh
+    reads a single short page. Falls back to the full listing if the watermark
+    is not within the first MAX_INCREMENTAL_PAGES pages, and returns None if it
+    is not listed at all.
+    """
+    new_events = []
+
+    try:
+        for page in range(1, MAX_INCREMENTAL_PAGES + 1):
+            response = http_client.get(EVENTS_PAGE_URL.format(page=page))
+            response.raise_for_status()
+
+            events_data, reached = parse_events_listing(response.content, watermark_link, completed_only=True)
+            new_events.extend(events_data)
+            if reached:
+                return pd.DataFrame(new_events, columns=['name', 'date', 'location', 'link'])
+            if not events_data:
+                break
+
+        print(f"Watermark not found in the first {MAX_INCREMENTAL_PAGES} pages. Reading the full listing...")
+        response = http_client.get(EVENTS_URL)
+        response.raise_for_status()
+    except (requests.exceptions.RequestException, CacheMissError) as e:
+        print(f"Request error: {e}")
+        return None
+
+    events_data, reached = parse_events_listing(response.content, watermark_link, completed_only=True)
+    if not reached:
+        return None
+    return pd.DataFrame(events_data, columns=['name', 'date', 'location', 'link'])
+
+def load_watermark():
+    """Returns the latest completed event already in all_events.csv, or None."""
+    try:
+        with open(WATERMARK_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def save_watermark(event):
+    with open(WATERMARK_FILE, 'w', encoding='utf-8') as f:
+        json.dump({'name': event['name'], 'date': event['date'], 'link': event['link']}, f)
+
 def save_raw_data(df):
     """Saves DataFrame into `data/raw` folder"""
-    os.makedirs('data/raw', exist_ok=True)
+    os.makedirs(os.path.dirname(EVENTS_FILE), exist_ok=True)
 
-    file_path = 'data/raw/all_events.csv'
-    df.to_csv(file_path, index=False)
-    print(f"Done! {len(df)} events saved in: {file_path}")
+    df.to_csv(EVENTS_FILE, index=False)
+    print(f"Done! {len(df)} events saved in: {EVENTS_FILE}")
 
-if __name__ == "__main__":
-    df_events = get_all_events()
+def append_raw_data(df):
+    """Appends newly discovered events to all_events.csv"""
+    df.to_csv(EVENTS_FILE, mode='a', header=False, index=False)
+    print(f"Done! {len(df)} new events appended to: {EVENTS_FILE}")
+
+def main(full=False):
+    """
+    Refreshes all_events.csv. Only events newer than the watermark are fetched
+    and appended, unless `full` is set or there is no previous run to build on.
+    """
+    watermark = load_watermark()
 
-    if df_events is not None:
+    if full or watermark is None or not os.path.exists(EVENTS_FILE):
+        df_events = get_all_events(completed_only=True)
+        if df_events is None:
+            return
         save_raw_data(df_events)
+    else:
+        df_events = get_new_events(watermark['link'])
+        if df_events is None:
+            print(f"Watermark event '{watermark['name']}' is no longer listed. Rebuilding the full event list...")
+            return main(full=True)
+        if df_events.empty:
+            print(f"No new events since {watermark['name']} ({watermark['date']}).")
+            return
+        append_raw_data(df_events)
+
+    if not df_events.empty:
+        save_watermark(df_events.iloc[0])
         print(df_events.head())
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Discover UFC events on ufcstats.com")
+    parser.add_argument('--full', action='store_true', help="Re-list every event instead of only new ones")
+    args = parser.parse_args()
+
+    main(full=args.full)
+    http_client.report()
@@ -1,9 +1,12 @@
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
+import argparse
 import os
 from tqdm import tqdm
-import time
+
+from src.scraper import http_client
+from src.scraper.manifest import KeyManifest
+from src.scraper.parsing import fighter_details_filter, make_soup
+from src.scraper.staged import FETCH_WORKERS, PARSE_WORKERS, run_staged
 
 INPUT_FILE = 'data/raw/all_fights.csv'
 OUTPUT_FILE = 'data/raw/fighter_details.csv'
@@ -12,48 +15,87 @@ SAVE_INTERVAL = 50
 def clean_text(text):
     return text.replace('\n', ' ').strip()
 
+def parse_fighter_details(content, fighter_url, backend=None):
+    """
+    Parses a fighter page into the record stored in fighter_details.csv
+    """
+    soup = make_soup(content, fighter_details_filter(), backend)
+    
+    name_tag = soup.find('h2', class_='b-content__title')
+    if not name_tag: return None
+    name = name_tag.text.strip()
+
+    info_box = soup.find('div', class_='b-list__info-box')
+    if not info_box: return None
+    
+    stats = {'name': name, 'url': fighter_url}
+    
+    for li in info_box.find_all('li'):
+        label_tag = li.find('i')
+        if not label_tag: continue
+        
+        label = label_tag.text.strip().replace(':', '')
+        value = li.text.replace(label_tag.text, '').strip()
+        
+        if label == 'Height':
+            stats['height'] = value
+        elif label == 'Weight':
+            stats['weight'] = value
+        elif label == 'Reach':
+            stats['reach'] = value
+        elif label == 'STANCE':
+            stats['stance'] = value
+        elif label == 'DOB':
+            stats['dob'] = value
+
+    return stats
+
 def get_fighter_details(fighter_url):
     try:
-        response = requests.get(fighter_url, timeout=10)
+        response = http_client.get(fighter_url)
         if response.status_code != 200:
             return None
 
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        name_tag = soup.find('h2', class_='b-content__title')
-        if not name_tag: return None
-        name = name_tag.text.strip()
-
-        info_box = soup.find('div', class_='b-list__info-box')
-        if not info_box: return None
-        
-        stats = {'name': name, 'url': fighter_url}
-        
-        for li in info_box.find_all('li'):
-            label_tag = li.find('i')
-            if not label_tag: continue
-            
-            label = label_tag.text.strip().replace(':', '')
-            value = li.text.replace(label_tag.text, '').strip()
-            
-            if label == 'Height':
-                stats['height'] = value
-            elif label == 'Weight':
-                stats['weight'] = value
-            elif label == 'Reach':
-                stats['reach'] = value
-            elif label == 'STANCE':
-                stats['stance'] = value
-            elif label == 'DOB':
-                stats['dob'] = value
-
-        return stats
+        return parse_fighter_details(response.content, fighter_url)
 
     except Exception as e:
         print(f"Error extracting {fighter_url}: {e}")
         return None
 
-def main():
+def fetch_page(fighter_url):
+    response = http_client.get(fighter_url)
+    return response.content if response.status_code == 200 else None
+
+def parse_record(fighter_url, content):
+    return parse_fighter_details(content, fighter_url)
+
+def get_manifest():
+    return KeyManifest(OUTPUT_FILE, 'url')
+
+def append_rows(fighters_data):
+    """Appends a chunk of fighter records to the output file, writing the header only once"""
+    df_chunk = pd.DataFrame(fighters_data)
+    
+    header = not os.path.exists(OUTPUT_FILE)
+    
+    df_chunk.to_csv(OUTPUT_FILE, mode='a', header=header, index=False)
+    get_manifest().add(d['url'] for d in fighters_data)
+
+def scrape_sequentially(links_to_process):
+    fighters_data = []
+    
+    for i, link in enumerate(tqdm(links_to_process)):
+        details = get_fighter_details(link)
+        
+        if details:
+            fighters_data.append(details)
+        
+        if len(fighters_data) >= SAVE_INTERVAL or (i + 1) == len(links_to_process):
+            if fighters_data:
+                append_rows(fighters_data)
+                fighters_data = []
+
+def main(pipelined=False, fetch_workers=FETCH_WORKERS, parse_workers=PARSE_WORKERS):
     if not os.path.exists(INPUT_FILE):
         print(f"Input file {INPUT_FILE} not found.")
         return
@@ -68,15 +110,9 @@ def main():
     all_links = set(fights_df['winner_link'].unique()) | set(fights_df['loser_link'].unique())
     print(f"Total fighters found in the database: {len(all_links)}")
 
-    processed_links = set()
-    if os.path.exists(OUTPUT_FILE):
-        try:
-            existing = pd.read_csv(OUTPUT_FILE)
-            if 'url' in existing.columns:
-                processed_links = set(existing['url'].unique())
-                print(f"Resuming... {len(processed_links)} fighters already processed.")
-        except pd.errors.EmptyDataError:
-            print("Output file is empty. Starting from scratch.")
+    processed_links = get_manifest().load()
+    if processed_links:
+        print(f"Resuming... {len(processed_links)} fighters already processed.")
 
     links_to_process = list(all_links - processed_links)
 
@@ -86,27 +122,20 @@ def main():
         print("All fighters have already been processed!")
         return
 
-    fighters_data = []
-    
-    for i, link in enumerate(tqdm(links_to_process)):
-        details = get_fighter_details(link)
-        
-        if details:
-            fighters_data.append(details)
-        
-        time.sleep(0.05)
-        
-        if len(fighters_data) >= SAVE_INTERVAL or (i + 1) == len(links_to_process):
-            if fighters_data:
-                df_chunk = pd.DataFrame(fighters_data)
-                
-                header = not os.path.exists(OUTPUT_FILE)
-                
-                df_chunk.to_csv(OUTPUT_FILE, mode='a', header=header, index=False)
-                
-                fighters_data = []
+    if pipelined:
+        run_staged(links_to_process, fetch_page, parse_record, append_rows,
+                   SAVE_INTERVAL, fetch_workers, parse_workers)
+    else:
+        scrape_sequentially(links_to_process)
 
     print("Scrape of fighters completed successfully!")
+    http_client.report()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Scrape fighter details from ufcstats.com")
+    parser.add_argument('--pipelined', action='store_true', help="Run fetch, parse and write as separate pipelined stages")
+    parser.add_argument('--fetch-workers', type=int, default=FETCH_WORKERS, help="Fetch threads in pipelined mode")
+    parser.add_argument('--parse-workers', type=int, default=PARSE_WORKERS, help="Parse processes in pipelined mode (defaults to the number of cores)")
+    args = parser.parse_args()
+
+    main(pipelined=args.pipelined, fetch_workers=args.fetch_workers, parse_workers=args.parse_workers)
\ No newline at end of file
@@ -0,0 +1,121 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+
+from src.core.config import settings
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# (URL pattern, class name, TTL in seconds). A TTL of None never expires.
+URL_CLASSES = [
+    (re.compile(r'/fight-details/'), 'fight', None),
+    (re.compile(r'/fighter-details/'), 'fighter', 30 * DAY),
+    (re.compile(r'/event-details/'), 'event', 1 * HOUR),
+    (re.compile(r'/statistics/events/'), 'event_listing', 10 * MINUTE),
+]
+DEFAULT_CLASS = ('other', 10 * MINUTE)
+
+CACHE_MODES = {'on', 'off', 'replay'}
+
+def classify_url(url):
+    """Returns the (class name, TTL) pair that governs how long `url` stays fresh."""
+    for pattern, name, ttl in URL_CLASSES:
+        if pattern.search(url):
+            return name, ttl
+    return DEFAULT_CLASS
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+class ResponseCache:
+    """
+    Content-addressed, gzip-compressed store of successful responses.
+
+    Bodies live under `blobs/` keyed by the hash of their content, so identical
+    pages are stored once. `index/` maps the hash of each URL to its current
+    blob and fetch time. Freshness is decided per URL class (see URL_CLASSES).
+    In "replay" mode every entry is served regardless of age.
+
+    The store doubles as the raw HTML archive used by `src.scraper.reparse`:
+    with `archive` enabled, pages are still stored when reads are "off".
+    """
+
+    def __init__(self, root=None, mode=None, archive=None):
+        self.root = root or settings.HTTP_CACHE_DIR
+        self.mode = mode or settings.HTTP_CACHE_MODE
+        self.archive = settings.HTTP_ARCHIVE if archive is None else archive
+        if self.mode not in CACHE_MODES:
+            raise ValueError(f"Unknown HTTP cache mode '{self.mode}'. Use one of {sorted(CACHE_MODES)}.")
+
+    @property
+    def replay(self):
+        return self.mode == 'replay'
+
+    def _index_path(self, url):
+        key = _sha256(url.encode('utf-8'))
+        return os.path.join(self.root, 'index', key[:2], f'{key}.json')
+
+    def _blob_path(self, content_hash):
+        return os.path.join(self.root, 'blobs', content_hash[:2], f'{content_hash}.gz')
+
+    def _write_atomic(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # A temp file of its own per write: fetch threads may store the same blob or entry at once.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def entry(self, url):
+        """Returns the index entry for `url`, or None if it was never stored."""
+        try:
+            with open(self._index_path(url), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def is_fresh(self, entry, now=None):
+        if self.replay:
+            return True
+        _, ttl = classify_url(entry['url'])
+        if ttl is None:
+            return True
+        return (now or time.time()) - entry['fetched_at'] < ttl
+
+    def read_blob(self, content_hash):
+        try:
+            with gzip.open(self._blob_path(content_hash), 'rb') as f:
+                return f.read()
+        except (FileNotFoundError, OSError, EOFError):
+            return None
+
+    def get(self, url):
+        """Returns the cached body for `url` if it is present and fresh, else None."""
+        if self.mode == 'off':
+            return None
+        entry = self.entry(url)
+        if entry is None or not self.is_fresh(entry):
+            return None
+        return self.read_blob(entry['content_hash'])
+
+    def put(self, url, content):
+        """Stores a successful response body for `url`."""
+        if self.mode == 'off' and not self.archive:
+            return
+        content_hash = _sha256(content)
+        blob_path = self._blob_path(content_hash)
+        if not os.path.exists(blob_path):
+            self._write_atomic(blob_path, gzip.compress(content))
+        entry = {'url': url, 'content_hash': content_hash, 'fetched_at': time.time()}
+        self._write_atomic(self._index_path(url), json.dumps(entry).encode('utf-8'))
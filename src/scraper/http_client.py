@@ -0,0 +1,283 @@
+import asyncio
+import json
+import random
+import threading
+import time
+from collections import Counter, deque
+from urllib.parse import urlsplit
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.core.config import settings
+from src.core.exceptions import CacheMissError
+from src.scraper.http_cache import ResponseCache
+from src.scraper.rate_limiter import AIMDRateLimiter
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+DEFAULT_TIMEOUT = 10
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+POOL_SIZE = 32
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+LATENCY_SAMPLES = 10000
+
+def backoff_delay(attempt, retry_after=None):
+    """
+    Exponential backoff with full jitter: a random delay between 0 and
+    BACKOFF_BASE * 2^attempt (capped at BACKOFF_MAX). A Retry-After sent by
+    the server is used as a lower bound.
+    """
+    delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+def parse_retry_after(value):
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+class RequestStats:
+    """Thread-safe counters and latency samples for every request made by a client."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.retries = 0
+            self.errors = 0
+            self.cache_hits = 0
+            self.status_counts = Counter()
+            self.total_latency = 0.0
+            self.latencies = deque(maxlen=LATENCY_SAMPLES)
+            self.started_at = time.perf_counter()
+
+    def record(self, latency, status=None, retry=False):
+        with self._lock:
+            self.requests += 1
+            self.total_latency += latency
+            self.latencies.append(latency)
+            if status is None:
+                self.errors += 1
+            else:
+                self.status_counts[status] += 1
+            if retry:
+                self.retries += 1
+
+    def record_cache_hit(self):
+        with self._lock:
+            self.cache_hits += 1
+
+    def percentile(self, pct):
+        with self._lock:
+            samples = sorted(self.latencies)
+        if not samples:
+            return 0.0
+        index = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started_at
+        with self._lock:
+            requests_made = self.requests
+            summary = {
+                'requests': requests_made,
+                'retries': self.retries,
+                'errors': self.errors,
+                'cache_hits': self.cache_hits,
+                'status_counts': dict(self.status_counts),
+                'avg_latency': self.total_latency / requests_made if requests_made else 0.0,
+                'requests_per_sec': requests_made / elapsed if elapsed > 0 else 0.0,
+            }
+        summary['p50_latency'] = self.percentile(50)
+        summary['p99_latency'] = self.percentile(99)
+        return summary
+
+    def dump(self, path):
+        """Writes the summary and the raw latency samples to `path` as JSON."""
+        data = self.summary()
+        with self._lock:
+            data['latencies'] = list(self.latencies)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+    def report(self):
+        s = self.summary()
+        print(
+            f"HTTP: {s['requests']} requests ({s['retries']} retries, {s['errors']} errors, {s['cache_hits']} cache hits) | "
+            f"{s['requests_per_sec']:.1f} req/s | "
+            f"latency avg {s['avg_latency'] * 1000:.0f}ms, p50 {s['p50_latency'] * 1000:.0f}ms, p99 {s['p99_latency'] * 1000:.0f}ms"
+        )
+
+class HttpClient:
+    """
+    Pooled HTTP client shared by every ufcstats.com caller.
+    Keeps connections alive, applies the same headers and timeout everywhere
+    and retries connection errors and retryable statuses with backoff.
+    When a `ResponseCache` is given, fresh entries are served from disk and
+    every successful response is stored. Requests to each host are paced by
+    their own limiter built by `limiter_factory` (pass None to disable pacing).
+    """
+
+    def __init__(self, headers=None, timeout=DEFAULT_TIMEOUT, max_retries=MAX_RETRIES, pool_size=POOL_SIZE, cache=None,
+                 limiter_factory=AIMDRateLimiter):
+        self.cache = cache
+        self.limiter_factory = limiter_factory
+        self.limiters = {}
+        self._limiters_lock = threading.Lock()
+        self.headers = dict(headers or DEFAULT_HEADERS)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.pool_size = pool_size
+        self.stats = RequestStats()
+
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def limiter_for(self, url):
+        """Returns the rate limiter for the host of `url`, or None when pacing is disabled."""
+        if self.limiter_factory is None:
+            return None
+        host = urlsplit(url).netloc
+        with self._limiters_lock:
+            if host not in self.limiters:
+                self.limiters[host] = self.limiter_factory()
+            return self.limiters[host]
+
+    def rates(self):
+        """Current allowed requests per second for every host contacted so far."""
+        with self._limiters_lock:
+            return {host: limiter.rate for host, limiter in self.limiters.items()}
+
+    def _cached(self, url):
+        """Returns the cached body for `url`, raising CacheMissError in replay mode when there is none."""
+        if self.cache is None:
+            return None
+        content = self.cache.get(url)
+        if content is not None:
+            self.stats.record_cache_hit()
+        elif self.cache.replay:
+            raise CacheMissError(f"{url} is not in the response cache (replay mode)")
+        return content
+
+    def _store(self, url, status, content):
+        if self.cache is not None and status == 200:
+            self.cache.put(url, content)
+
+    def get(self, url, **kwargs):
+        """GET `url`, returning the final `requests.Response` or raising the last connection error."""
+        content = self._cached(url)
+        if content is not None:
+            response = requests.Response()
+            response.status_code = 200
+            response.url = url
+            response._content = content
+            return response
+
+        kwargs.setdefault('timeout', self.timeout)
+        limiter = self.limiter_for(url)
+
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            if limiter:
+                limiter.acquire()
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self.stats.record(time.perf_counter() - start, retry=not last_attempt)
+                if limiter:
+                    limiter.record(None)
+                if last_attempt:
+                    raise
+                time.sleep(backoff_delay(attempt))
+                continue
+
+            latency = time.perf_counter() - start
+            if limiter:
+                limiter.record(response.status_code, latency)
+            retry = response.status_code in RETRY_STATUSES and not last_attempt
+            self.stats.record(latency, response.status_code, retry=retry)
+            if not retry:
+                self._store(url, response.status_code, response.content)
+                return response
+
+            time.sleep(backoff_delay(attempt, parse_retry_after(response.headers.get('Retry-After'))))
+
+    def async_session(self, concurrency, per_host_limit):
+        """Creates an aiohttp session with the same headers and timeout as the sync client."""
+        connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=per_host_limit)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        return aiohttp.ClientSession(connector=connector, timeout=timeout, headers=self.headers)
+
+    async def get_async(self, session, url):
+        """Async counterpart of `get`. Returns a `(status, content)` tuple."""
+        content = self._cached(url)
+        if content is not None:
+            return 200, content
+
+        limiter = self.limiter_for(url)
+
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            if limiter:
+                await limiter.acquire_async()
+            start = time.perf_counter()
+            try:
+                async with session.get(url) as response:
+                    content = await response.read()
+                    status = response.status
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                self.stats.record(time.perf_counter() - start, retry=not last_attempt)
+                if limiter:
+                    limiter.record(None)
+                if last_attempt:
+                    raise
+                await asyncio.sleep(backoff_delay(attempt))
+                continue
+
+            latency = time.perf_counter() - start
+            if limiter:
+                limiter.record(status, latency)
+            retry = status in RETRY_STATUSES and not last_attempt
+            self.stats.record(latency, status, retry=retry)
+            if not retry:
+                self._store(url, status, content)
+                return status, content
+
+            await asyncio.sleep(backoff_delay(attempt, retry_after))
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """Returns the process-wide shared client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient(cache=ResponseCache())
+        return _client
+
+def get(url, **kwargs):
+    return get_client().get(url, **kwargs)
+
+def report():
+    client = get_client()
+    client.stats.report()
+    for host, rate in client.rates().items():
+        print(f"Rate limit for {host}: {rate:.1f} req/s")
+    if settings.HTTP_STATS_FILE:
+        client.stats.dump(settings.HTTP_STATS_FILE)
@@ -0,0 +1,57 @@
+import os
+
+import pandas as pd
+
+class KeyManifest:
+    """
+    Append-only index of the keys already written to a scraper output file.
+
+    Lives next to the output as `<output>.keys`, one key per line, so resuming
+    costs one small file read instead of parsing the whole output CSV. If the
+    sidecar is missing (e.g. output written before manifests existed) it is
+    bootstrapped once from the output's key column. If the output is missing,
+    nothing has been scraped, whatever the sidecar says.
+
+    Keys are appended after their rows are flushed, so a crash in between can
+    only cause a row to be scraped again, never to be skipped.
+    """
+
+    def __init__(self, output_file, key_column):
+        self.output_file = output_file
+        self.key_column = key_column
+        self.path = f'{output_file}.keys'
+
+    def load(self):
+        if not os.path.exists(self.output_file):
+            # A sidecar left behind by a deleted output would skip every key.
+            if os.path.exists(self.path):
+                self.reset(set())
+            return set()
+
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return {line.rstrip('\n') for line in f if line.strip()}
+
+        try:
+            existing = pd.read_csv(self.output_file, usecols=[self.key_column])
+        except (pd.errors.EmptyDataError, ValueError):
+            return set()
+
+        keys = set(existing[self.key_column].dropna().astype(str))
+        self.reset(keys)
+        return keys
+
+    def add(self, keys):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for key in keys:
+                f.write(f'{key}\n')
+
+    def reset(self, keys):
+        """Replaces the manifest with exactly `keys` (used after an output file is rewritten)."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for key in keys:
+                f.write(f'{key}\n')
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,63 @@
+from functools import cache
+
+from bs4 import BeautifulSoup
+from bs4.filter import ElementFilter
+
+from src.core.config import settings
+
+@cache
+def available_backends():
+    """The BeautifulSoup backends usable here; lxml is an optional dependency."""
+    backends = ['html.parser']
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        backends.append('lxml')
+    return backends
+
+class FirstMatches(ElementFilter):
+    """
+    `parse_only` filter that builds only the first subtree matching each
+    (tag name, CSS class) rule; a class of None matches any tag of that name.
+
+    The rest of the document is still tokenized but never turned into Tag objects,
+    which is where most of the parsing time goes. The first top-level match is
+    always the first match in document order, so `soup.find(...)` on the partial
+    tree returns the same element as on the full one. The filter tracks which
+    rules have matched, so create a new one for every document.
+    """
+
+    def __init__(self, *rules):
+        super().__init__()
+        self.pending = list(rules)
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        for rule in self.pending:
+            tag_name, css_class = rule
+            if name != tag_name:
+                continue
+            # Attributes are still raw strings here, before bs4 splits multi-valued ones.
+            if css_class is None or css_class in (attrs or {}).get('class', '').split():
+                self.pending.remove(rule)
+                return True
+        return False
+
+    def allow_string_creation(self, string):
+        return False
+
+def fight_details_filter():
+    """The header block and the totals table read by `details.parse_fight_stats`."""
+    return FirstMatches(('div', 'b-fight-details__content'), ('table', None))
+
+def fighter_details_filter():
+    """The name and the bio box read by `fighters.parse_fighter_details`."""
+    return FirstMatches(('h2', 'b-content__title'), ('div', 'b-list__info-box'))
+
+def make_soup(content, parse_only=None, backend=None):
+    """Parses `content` with the configured backend, optionally building only part of the tree."""
+    backend = backend or settings.HTML_PARSER
+    if backend not in available_backends():
+        raise ValueError(f"HTML parser '{backend}' is not available. Use one of {available_backends()}.")
+    return BeautifulSoup(content, backend, parse_only=parse_only)
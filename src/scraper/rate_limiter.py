@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+
+INITIAL_RATE = 10.0
+MIN_RATE = 0.5
+MAX_RATE = 50.0
+ADDITIVE_INCREASE = 1.0
+DECREASE_FACTOR = 0.5
+LATENCY_SPIKE_FACTOR = 3.0
+MAX_LATENCY = 5.0
+LATENCY_SMOOTHING = 0.2
+
+class AIMDRateLimiter:
+    """
+    Adaptive request pacing using additive-increase/multiplicative-decrease.
+
+    Every healthy response raises the rate by about ADDITIVE_INCREASE requests
+    per second for each second of traffic. A 429, a 5xx, a connection error or
+    a latency spike (above LATENCY_SPIKE_FACTOR times the smoothed healthy
+    latency, or above MAX_LATENCY) multiplies the rate by DECREASE_FACTOR.
+    At most one decrease happens per cooldown window, so a burst of failures
+    from requests already in flight counts as a single congestion signal.
+    """
+
+    def __init__(self, initial_rate=INITIAL_RATE, min_rate=MIN_RATE, max_rate=MAX_RATE,
+                 increase=ADDITIVE_INCREASE, decrease_factor=DECREASE_FACTOR):
+        self.rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.baseline_latency = None
+        self.decreases = 0
+        self._next_slot = time.monotonic()
+        self._last_decrease = float('-inf')
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Claims the next request slot and returns how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / self.rate
+            return slot - now
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def is_congested(self, status, latency):
+        if status is None or status == 429 or status >= 500:
+            return True
+        if latency is None:
+            return False
+        if latency > MAX_LATENCY:
+            return True
+        return self.baseline_latency is not None and latency > LATENCY_SPIKE_FACTOR * self.baseline_latency
+
+    def record(self, status, latency=None):
+        """Feeds a response back into the limiter. `status` is None for connection errors."""
+        with self._lock:
+            if self.is_congested(status, latency):
+                now = time.monotonic()
+                cooldown = max(1.0 / self.rate, self.baseline_latency or 0.0)
+                if now - self._last_decrease >= cooldown:
+                    self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                    self._last_decrease = now
+                    self.decreases += 1
+                return
+
+            self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+            if latency is not None:
+                if self.baseline_latency is None:
+                    self.baseline_latency = latency
+                else:
+                    self.baseline_latency += LATENCY_SMOOTHING * (latency - self.baseline_latency)
@@ -0,0 +1,132 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from tqdm import tqdm
+
+from src.core.config import settings
+from src.scraper import details, fighters, fights
+from src.scraper.http_cache import ResponseCache
+from src.scraper.manifest import KeyManifest
+
+EVENTS_FILE = 'data/raw/all_events.csv'
+CHUNK_SIZE = 64
+TARGETS = ['fights', 'fighters', 'details']
+
+def _parse_archived(job):
+    """
+    Worker: loads one archived page and runs the matching scraper parser on it.
+    Returns None when the page is not archived or cannot be parsed.
+    """
+    kind, url, cache_root = job
+    content = ResponseCache(root=cache_root, mode='replay').get(url)
+    if content is None:
+        return None
+
+    try:
+        if kind == 'event':
+            return fights.parse_event_fights(content)
+        if kind == 'fighter':
+            return fighters.parse_fighter_details(content, url)
+        return details.parse_fight_stats(content)
+    except Exception as e:
+        print(f"Error reparsing {url}: {e}")
+        return None
+
+def parse_all(kind, urls, workers=None, cache_root=None):
+    """Parses the archived pages for `urls` on a process pool, preserving input order."""
+    cache_root = cache_root or settings.HTTP_CACHE_DIR
+    jobs = [(kind, url, cache_root) for url in urls]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(tqdm(executor.map(_parse_archived, jobs, chunksize=CHUNK_SIZE), total=len(jobs), desc=kind))
+
+def write_csv(df, path, key_column):
+    """
+    Replaces `path` atomically so an interrupted reparse never leaves a
+    half-written file, and resets its resume manifest to match.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    keys = df[key_column].dropna().astype(str) if key_column in df.columns else []
+    KeyManifest(path, key_column).reset(dict.fromkeys(keys))
+
+def report_missing(kind, total, missing):
+    if missing:
+        print(f"Warning: {missing} of {total} {kind} pages are not in the archive and were skipped.")
+
+def rebuild_fights(workers=None, cache_root=None):
+    if not os.path.exists(EVENTS_FILE):
+        print(f"Event file {EVENTS_FILE} not found.")
+        return None
+
+    events_df = pd.read_csv(EVENTS_FILE)
+    results = parse_all('event', events_df['link'].tolist(), workers, cache_root)
+
+    rows = []
+    for event, event_fights in zip(events_df.to_dict('records'), results):
+        for f in event_fights or []:
+            f['event_name'] = event['name']
+            f['event_date'] = event['date']
+            rows.append(f)
+
+    report_missing('event', len(results), sum(r is None for r in results))
+    fights_df = pd.DataFrame(rows)
+    write_csv(fights_df, fights.OUTPUT_FIGHTS_FILE, 'event_name')
+    print(f"Rebuilt {fights.OUTPUT_FIGHTS_FILE} with {len(fights_df)} fights.")
+    return fights_df
+
+def rebuild_fighters(fights_df, workers=None, cache_root=None):
+    links = sorted(set(fights_df['winner_link'].dropna()) | set(fights_df['loser_link'].dropna()))
+    results = parse_all('fighter', links, workers, cache_root)
+
+    report_missing('fighter', len(results), sum(r is None for r in results))
+    fighters_df = pd.DataFrame([r for r in results if r])
+    write_csv(fighters_df, fighters.OUTPUT_FILE, 'url')
+    print(f"Rebuilt {fighters.OUTPUT_FILE} with {len(fighters_df)} fighters.")
+
+def rebuild_details(fights_df, workers=None, cache_root=None):
+    records = fights_df.to_dict('records')
+    results = parse_all('fight', [r['fight_link'] for r in records], workers, cache_root)
+
+    report_missing('fight', len(results), sum(r is None for r in results))
+    details_df = pd.DataFrame([row | stats for row, stats in zip(records, results) if stats])
+    write_csv(details_df, details.OUTPUT_FILE, 'fight_link')
+    print(f"Rebuilt {details.OUTPUT_FILE} with {len(details_df)} fights.")
+
+def main(only=None, workers=None, cache_root=None):
+    """
+    Regenerates the raw CSVs from archived HTML without touching the network.
+    `only` restricts the rebuild to some of 'fights', 'fighters' and 'details';
+    the latter two read all_fights.csv, rebuilt first when 'fights' is selected.
+    """
+    only = set(only or TARGETS)
+
+    if 'fights' in only:
+        fights_df = rebuild_fights(workers, cache_root)
+    elif os.path.exists(fights.OUTPUT_FIGHTS_FILE):
+        fights_df = pd.read_csv(fights.OUTPUT_FIGHTS_FILE)
+    else:
+        fights_df = None
+
+    if fights_df is None or fights_df.empty:
+        print("No fights available to reparse fighters and details.")
+        return
+
+    if 'fighters' in only:
+        rebuild_fighters(fights_df, workers, cache_root)
+    if 'details' in only:
+        rebuild_details(fights_df, workers, cache_root)
+
+    print("Reparse completed successfully!")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild data/raw CSVs from the archived HTML pages")
+    parser.add_argument('--only', nargs='+', choices=TARGETS, help="Rebuild only these outputs")
+    parser.add_argument('--workers', type=int, default=None, help="Parser processes (defaults to the number of cores)")
+    args = parser.parse_args()
+
+    main(only=args.only, workers=args.workers)
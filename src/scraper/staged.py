@@ -0,0 +1,185 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from tqdm import tqdm
+
+FETCH_WORKERS = 8
+PARSE_WORKERS = None
+QUEUE_SIZE = 64
+
+_DONE = object()
+
+class StageStats:
+    """Work counters for one pipeline stage and depth samples of the queue feeding the next one."""
+
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.busy = 0.0
+        self.max_depth = 0
+        self.depth_total = 0
+        self.depth_samples = 0
+        self._lock = threading.Lock()
+
+    def record(self, busy, items=1):
+        with self._lock:
+            self.items += items
+            self.busy += busy
+
+    def sample_depth(self, depth):
+        with self._lock:
+            self.max_depth = max(self.max_depth, depth)
+            self.depth_total += depth
+            self.depth_samples += 1
+
+    def utilization(self, elapsed):
+        """Fraction of the stage's total worker time spent doing work."""
+        return self.busy / (elapsed * self.workers) if elapsed > 0 else 0.0
+
+def report(stats, elapsed):
+    print(f"\n{'Stage':<8}{'Workers':>9}{'Items':>8}{'Items/s':>10}{'Busy':>8}{'Queue max':>11}{'Queue avg':>11}")
+    for s in stats:
+        avg_depth = s.depth_total / s.depth_samples if s.depth_samples else 0.0
+        print(
+            f"{s.name:<8}{s.workers:>9}{s.items:>8}{s.items / elapsed if elapsed > 0 else 0:>10.1f}"
+            f"{s.utilization(elapsed):>8.0%}{s.max_depth:>11}{avg_depth:>11.1f}"
+        )
+    bottleneck = max(stats, key=lambda s: s.utilization(elapsed))
+    print(f"Bottleneck: {bottleneck.name} stage ({bottleneck.utilization(elapsed):.0%} busy)")
+
+def _timed_parse(parse, item, content):
+    """Runs in the parse pool; returns the record with the time spent parsing it."""
+    start = time.perf_counter()
+    try:
+        record = parse(item, content)
+    except Exception as e:
+        print(f"Error parsing {item}: {e}")
+        record = None
+    return record, time.perf_counter() - start
+
+def _inline_future(fn, *args):
+    future = Future()
+    future.set_result(fn(*args))
+    return future
+
+def run_staged(items, fetch, parse, write, batch_size, fetch_workers=FETCH_WORKERS,
+               parse_workers=PARSE_WORKERS, queue_size=QUEUE_SIZE):
+    """
+    Runs `items` through three stages connected by bounded queues:
+
+    - `fetch(item)` on `fetch_workers` threads, returning the page content or None;
+    - `parse(item, content)` on a process pool of `parse_workers` (0 parses inline),
+      returning a record or None. It must be a picklable module-level function;
+    - `write(records)` on a single thread, called with batches of `batch_size`.
+
+    A full queue blocks the stage feeding it, so a slow writer or parser throttles
+    fetching instead of buffering pages in memory. Per-stage throughput and queue
+    depth are printed at the end and returned as StageStats.
+    """
+    todo = queue.Queue()
+    for item in items:
+        todo.put(item)
+    for _ in range(fetch_workers):
+        todo.put(_DONE)
+
+    fetched = queue.Queue(maxsize=queue_size)
+    parsed = queue.Queue(maxsize=queue_size)
+
+    fetch_stats = StageStats('fetch', fetch_workers)
+    parse_stats = StageStats('parse', parse_workers or 1)
+    write_stats = StageStats('write', 1)
+
+    def fetcher():
+        while (item := todo.get()) is not _DONE:
+            start = time.perf_counter()
+            try:
+                content = fetch(item)
+            except Exception as e:
+                print(f"Error fetching {item}: {e}")
+                content = None
+            fetch_stats.record(time.perf_counter() - start)
+            fetched.put((item, content))
+            fetch_stats.sample_depth(fetched.qsize())
+        fetched.put(_DONE)
+
+    def dispatcher(executor):
+        finished_fetchers = 0
+        while finished_fetchers < fetch_workers:
+            entry = fetched.get()
+            if entry is _DONE:
+                finished_fetchers += 1
+                continue
+            item, content = entry
+            if content is None:
+                future = _inline_future(lambda: (None, 0.0))
+            elif executor is None:
+                future = _inline_future(_timed_parse, parse, item, content)
+            else:
+                future = executor.submit(_timed_parse, parse, item, content)
+            parsed.put(future)
+            parse_stats.sample_depth(parsed.qsize())
+        parsed.put(_DONE)
+
+    errors = []
+
+    def flush(batch):
+        # After a failed write keep draining the queue so upstream stages can finish.
+        if errors:
+            return
+        start = time.perf_counter()
+        try:
+            write(batch)
+        except Exception as e:
+            errors.append(e)
+            return
+        write_stats.record(time.perf_counter() - start, len(batch))
+
+    def writer(progress):
+        batch = []
+        while (future := parsed.get()) is not _DONE:
+            try:
+                record, parse_time = future.result()
+            except Exception as e:
+                print(f"Parse worker failed: {e}")
+                record, parse_time = None, 0.0
+            parse_stats.record(parse_time)
+            progress.update(1)
+            if record is not None:
+                batch.append(record)
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+
+    started = time.perf_counter()
+    executor = None
+    if parse_workers != 0:
+        parse_stats.workers = parse_workers or os.cpu_count()
+        executor = ProcessPoolExecutor(max_workers=parse_stats.workers)
+        # Start the workers before any thread exists, so they are never forked mid-request.
+        executor.submit(os.getpid).result()
+
+    try:
+        with tqdm(total=len(items)) as progress:
+            threads = [threading.Thread(target=fetcher, daemon=True) for _ in range(fetch_workers)]
+            threads.append(threading.Thread(target=dispatcher, args=(executor,), daemon=True))
+            threads.append(threading.Thread(target=writer, args=(progress,), daemon=True))
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if errors:
+        raise errors[0]
+
+    stats = [fetch_stats, parse_stats, write_stats]
+    report(stats, time.perf_counter() - started)
+    return stats
@@ -22,14 +22,6 @@ class FakeCtx:
         return message
 
 
-class DummyModel:
-    def predict(self, X):
-        return [1]
-
-    def predict_proba(self, X):
-        return [[0.1, 0.9]]
-
-
 def test_predict_fight_rejects_invalid_format():
     ctx = FakeCtx()
     asyncio.run(bot_main.predict_fight.callback(ctx, args="Conor,Dustin"))
@@ -41,40 +33,33 @@ def test_predict_fight_rejects_invalid_format():
 def test_predict_fight_handles_missing_profiles(monkeypatch):
     ctx = FakeCtx()
 
-    monkeypatch.setattr(bot_main, "get_fighter_profile", lambda *args, **kwargs: None)
+    monkeypatch.setattr(bot_main, "predict_many", lambda matchups: [None])
+    monkeypatch.setattr(bot_main, "unknown_fighters", lambda names: {names[1]: ["Dustin Poirier"]})
 
-    asyncio.run(bot_main.predict_fight.callback(ctx, args="Conor McGregor, Dustin Poirier, Lightweight"))
+    asyncio.run(bot_main.predict_fight.callback(ctx, args="Conor McGregor, Dustin Porier, Lightweight"))
 
     status_message = ctx.sent[0]["message"]
     assert status_message.edits
     assert "Could not find profiles" in status_message.edits[-1]["content"]
+    assert "Did you mean Dustin Poirier for **Dustin Porier**?" in status_message.edits[-1]["content"]
 
 
 def test_predict_fight_success_saves_prediction_and_returns_embed(monkeypatch):
     ctx = FakeCtx()
     saved = []
+    matchups = []
 
-    fake_profile = {
-        "name": "Conor McGregor",
-        "age": 30,
-        "height": 175,
-        "reach": 188,
-        "ctrl_hist_avg": 10,
-        "sig_pct_hist_avg": 0.5,
-        "kd_hist_avg": 0.2,
-        "sig_str_landed_hist_avg": 3.0,
-        "td_landed_hist_avg": 0.5,
-    }
+    def fake_predict_many(batch):
+        matchups.extend(batch)
+        return [{"winner": "Conor McGregor", "confidence": 90.0}]
 
-    monkeypatch.setattr(bot_main, "get_fighter_profile", lambda *args, **kwargs: fake_profile)
-    monkeypatch.setattr(bot_main, "prepare_data_prevision", lambda *args, **kwargs: [[1, 2, 3]])
-    monkeypatch.setattr(bot_main, "model", DummyModel())
+    monkeypatch.setattr(bot_main, "predict_many", fake_predict_many)
     monkeypatch.setattr(bot_main, "save_prediction", lambda *args: saved.append(args))
 
     asyncio.run(bot_main.predict_fight.callback(ctx, args="Conor McGregor, Dustin Poirier, Lightweight"))
 
-    assert len(saved) == 1
-    assert saved[0][0] == "Individual fight"
+    assert matchups == [("Conor McGregor", "Dustin Poirier", "Lightweight")]
+    assert saved == [("Individual fight", "Conor McGregor", "Dustin Poirier", "Lightweight", "Conor McGregor", 0.9)]
     status_message = ctx.sent[0]["message"]
     assert status_message.edits[-1]["embed"] is not None
 
@@ -141,6 +126,17 @@ def test_fighter_profile_not_found(monkeypatch):
     assert "Could not find a profile" in ctx.sent[0]["content"]
 
 
+def test_fighter_profile_not_found_suggests_similar_names(monkeypatch):
+    ctx = FakeCtx()
+    monkeypatch.setattr(bot_main, "get_fighter_profile", lambda *args, **kwargs: None)
+    monkeypatch.setattr(bot_main, "unknown_fighters", lambda names: {names[0]: ["Conor McGregor"]})
+
+    asyncio.run(bot_main.fighter_profile.callback(ctx, fighter_name="conor mcgreggor"))
+
+    assert "**conor mcgreggor**" in ctx.sent[0]["content"]
+    assert "Did you mean: Conor McGregor?" in ctx.sent[0]["content"]
+
+
 def test_fighter_profile_success(monkeypatch):
     ctx = FakeCtx()
     profile = {
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ml import features
+
+
+def fights_frame(n=6, seed=3):
+    rng = np.random.default_rng(seed)
+    data = {'weight_class': rng.choice(['Lightweight', 'Welterweight', 'Heavyweight'], n), 'target': rng.integers(0, 2, n)}
+    for side in features.SIDES:
+        data[f'{side}_name'] = [f'{side} fighter {i}' for i in range(n)]
+        for name in features.CORNER_INPUTS:
+            data[f'{side}_{name}'] = rng.random(n) * 100
+        data[f'{side}_stance'] = rng.choice(['Orthodox', 'Southpaw', 'Switch'], n)
+    return pd.DataFrame(data)
+
+
+def test_training_matrix_has_registered_columns_only():
+    df = fights_frame()
+    feature_set = features.FeatureSet().fit(df)
+
+    X = feature_set.transform(df)
+
+    assert list(X.columns) == feature_set.columns
+    assert 'f1_name' not in X.columns and 'target' not in X.columns
+    assert 'weight_class_Lightweight' in X.columns and 'weight_class_Heavyweight' not in X.columns
+    np.testing.assert_allclose(X['age_diff'], df['f1_age'] - df['f2_age'])
+    np.testing.assert_allclose(X['f2_kd_hist_avg'], df['f2_kd_hist_avg'])
+
+
+def test_inference_row_matches_training_row():
+    df = fights_frame()
+    feature_set = features.FeatureSet().fit(df)
+    training = feature_set.transform(df)
+
+    matchups = [(features.corner_profile(row, 'f1'), features.corner_profile(row, 'f2'), row['weight_class'])
+                for _, row in df.iterrows()]
+    serving = feature_set.transform(features.matchup_frame(matchups))
+
+    np.testing.assert_array_equal(serving.to_numpy(), training.to_numpy())
+
+
+def test_unknown_category_and_missing_profile_values():
+    feature_set = features.FeatureSet().fit(fights_frame())
+    profile = {'age': 30, 'stance': 'Open Stance'}
+
+    X = feature_set.transform(features.matchup_frame([(profile, profile, 'Catch Weight')]))
+
+    assert X.filter(like='weight_class_').sum(axis=1).iloc[0] == 0
+    assert X.filter(like='_stance_').sum(axis=1).iloc[0] == 0
+    assert X['age_diff'].iloc[0] == 0
+    assert np.isnan(X['f1_win_streak'].iloc[0])
+
+
+def test_transform_rejects_missing_inputs_and_stale_fits(monkeypatch):
+    df = fights_frame()
+    feature_set = features.FeatureSet().fit(df)
+
+    with pytest.raises(ValueError, match="f1_reach"):
+        feature_set.transform(df.drop(columns=['f1_reach']))
+
+    monkeypatch.setattr(features, 'NUMERIC_FEATURES', features.NUMERIC_FEATURES[:-1])
+    with pytest.raises(ValueError, match="Retrain"):
+        feature_set.transform(df)
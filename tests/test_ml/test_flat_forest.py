@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.ml.flat_forest import FlatForest
+
+
+@pytest.mark.parametrize("n_classes, max_depth", [(2, 15), (3, None)])
+def test_flat_forest_matches_sklearn(n_classes, max_depth):
+    rng = np.random.default_rng(n_classes)
+    X = rng.normal(size=(600, 8))
+    y = np.digitize(X[:, 0] + X[:, 1] * X[:, 2], np.linspace(-1, 1, n_classes + 1)[1:-1])
+    forest = RandomForestClassifier(n_estimators=15, max_depth=max_depth, random_state=0).fit(X, y)
+    flat = FlatForest.from_sklearn(forest)
+
+    X_new = np.vstack([rng.normal(size=(200, 8)), X[:50]])
+    np.testing.assert_allclose(flat.predict_proba(X_new), forest.predict_proba(X_new), atol=1e-12)
+    np.testing.assert_array_equal(flat.predict(X_new), forest.predict(X_new))
+    np.testing.assert_array_equal(flat.apply(X_new[:1]).shape, (1, 15))
+
+
+def test_flat_forest_rejects_missing_values():
+    forest = RandomForestClassifier(n_estimators=2, random_state=0).fit([[0.0], [1.0]], [0, 1])
+
+    with pytest.raises(ValueError, match="imputed"):
+        FlatForest.from_sklearn(forest).predict_proba([[np.nan]])
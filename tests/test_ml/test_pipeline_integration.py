@@ -1,36 +1,189 @@
+import importlib
+import threading
+
 import pytest
 
 from src.ml import pipeline
 
 
-def test_execute_complete_pipeline_runs_expected_scripts_in_order(monkeypatch):
-    executed = []
+class FakeStage(pipeline.Stage):
+    def __init__(self, name, fn, **kwargs):
+        super().__init__(name, f'fake:{name}', **kwargs)
+        self.fn = fn
+
+    def source_files(self):
+        return []
+
+    def run(self):
+        self.fn()
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    # STATE_FILE is relative, so the pipeline state lands in tmp_path too.
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
 
-    def fake_run_script(path):
-        executed.append(path)
 
-    monkeypatch.setattr(pipeline, "run_script", fake_run_script)
+def toy_stages(workdir, calls):
+    def source():
+        calls.append('source')
+        write(workdir / 'raw.csv', (workdir / 'seed.txt').read_text())
 
-    pipeline.execute_complete_pipeline()
+    def clean():
+        calls.append('clean')
+        write(workdir / 'clean.csv', (workdir / 'raw.csv').read_text().upper())
 
-    assert executed == [
-        "src/scraper/events.py",
-        "src/scraper/fights.py",
-        "src/scraper/fighters.py",
-        "src/scraper/details.py",
-        "src/processing/clean_data.py",
-        "src/processing/clean_fighters.py",
-        "src/processing/merge_data.py",
-        "src/processing/shuffle_data.py",
-        "train.py",
+    def enrich():
+        calls.append('enrich')
+        write(workdir / 'clean.csv', (workdir / 'clean.csv').read_text() + '!')
+
+    def train():
+        calls.append('train')
+        write(workdir / 'model.pkl', (workdir / 'clean.csv').read_text())
+
+    return [
+        FakeStage('source', source, inputs=['seed.txt'], outputs=['raw.csv']),
+        FakeStage('clean', clean, inputs=['raw.csv'], outputs=['clean.csv']),
+        FakeStage('enrich', enrich, inputs=['clean.csv'], outputs=['clean.csv']),
+        FakeStage('train', train, inputs=['clean.csv'], outputs=['model.pkl']),
+    ]
+
+
+def test_stages_run_in_pipeline_order_and_resolve():
+    assert [stage.name for stage in pipeline.STAGES] == [
+        "events", "fights", "fighters", "details",
+        "clean_data", "clean_fighters",
+        "merge_data", "shuffle_data", "feature_engineering",
+        "train",
     ]
+    assert pipeline.check_order(pipeline.STAGES) == pipeline.STAGES
+    # Network stages run every time, so failed pages get retried.
+    assert [s.name for s in pipeline.STAGES if s.always_run] == ["events", "fights", "fighters", "details"]
+
+    for stage in pipeline.STAGES:
+        module, function = stage.target.split(':')
+        assert callable(getattr(importlib.import_module(module), function))
+
+
+def test_check_order_rejects_reading_a_later_output():
+    stages = [
+        FakeStage('a', lambda: None, inputs=['b.csv'], outputs=['a.csv']),
+        FakeStage('b', lambda: None, outputs=['b.csv']),
+    ]
+
+    with pytest.raises(ValueError, match="written later by b"):
+        pipeline.check_order(stages)
+
+
+def test_unchanged_inputs_skip_every_stage_including_in_place_ones(workdir):
+    write(workdir / 'seed.txt', 'fight')
+    calls = []
+    stages = toy_stages(workdir, calls)
+
+    assert pipeline.execute_complete_pipeline(stages=stages) == ['source', 'clean', 'enrich', 'train']
+    assert (workdir / 'model.pkl').read_text() == 'FIGHT!'
+
+    calls.clear()
+    assert pipeline.execute_complete_pipeline(stages=stages) == []
+    assert calls == []
+
+
+def test_changed_input_reruns_downstream_stages_only(workdir):
+    write(workdir / 'seed.txt', 'fight')
+    calls = []
+    stages = toy_stages(workdir, calls)
+    pipeline.execute_complete_pipeline(stages=stages)
+
+    # Same content under a new mtime is still up to date.
+    write(workdir / 'seed.txt', 'fight')
+    assert pipeline.execute_complete_pipeline(stages=stages) == []
+
+    write(workdir / 'raw.csv', 'bout')
+    assert pipeline.execute_complete_pipeline(stages=stages) == ['clean', 'enrich', 'train']
+    assert (workdir / 'model.pkl').read_text() == 'BOUT!'
 
 
-def test_run_script_exits_on_nonzero_returncode(monkeypatch):
-    class Result:
-        returncode = 1
+def test_missing_output_and_force_rerun_a_stage(workdir):
+    write(workdir / 'seed.txt', 'fight')
+    stages = toy_stages(workdir, [])
+    pipeline.execute_complete_pipeline(stages=stages)
 
-    monkeypatch.setattr(pipeline.subprocess, "run", lambda *args, **kwargs: Result())
+    (workdir / 'model.pkl').unlink()
+    assert pipeline.execute_complete_pipeline(stages=stages) == ['train']
+
+    assert pipeline.execute_complete_pipeline(force=['source'], stages=stages) == ['source']
+    assert pipeline.execute_complete_pipeline(force=['all'], stages=stages) == ['source', 'clean', 'enrich', 'train']
+
+    with pytest.raises(ValueError, match="Unknown stage"):
+        pipeline.execute_complete_pipeline(force=['nope'], stages=stages)
+
+
+def test_failed_stage_exits_and_is_not_recorded(workdir):
+    def boom():
+        raise RuntimeError("scrape failed")
+
+    stages = [FakeStage('broken', boom, outputs=['out.csv'])]
 
     with pytest.raises(SystemExit):
-        pipeline.run_script("dummy.py")
\ No newline at end of file
+        pipeline.execute_complete_pipeline(stages=stages)
+
+    assert 'broken' not in pipeline.load_state()['stages']
+
+
+def test_dependencies_follow_file_conflicts():
+    deps = pipeline.dependencies(pipeline.STAGES)
+
+    assert deps['fighters'] == ['fights']
+    assert deps['details'] == ['fights']
+    assert deps['clean_data'] == ['details']
+    assert deps['clean_fighters'] == ['fighters']
+    assert deps['merge_data'] == ['clean_data', 'clean_fighters']
+    assert deps['train'] == ['shuffle_data', 'feature_engineering']
+
+
+def test_independent_stages_run_concurrently(workdir):
+    barrier = threading.Barrier(2, timeout=5)
+
+    def branch(name):
+        def run():
+            barrier.wait()  # times out unless both branches are running at once
+            write(workdir / f'{name}.csv', name)
+        return run
+
+    stages = [
+        FakeStage('left', branch('left'), outputs=['left.csv']),
+        FakeStage('right', branch('right'), outputs=['right.csv']),
+        FakeStage('join', lambda: write(workdir / 'join.csv', 'x'), inputs=['left.csv', 'right.csv'], outputs=['join.csv']),
+    ]
+
+    ran = pipeline.execute_complete_pipeline(stages=stages, workers=2)
+
+    assert sorted(ran[:2]) == ['left', 'right']
+    assert ran[2] == 'join'
+
+
+def test_single_worker_keeps_declared_order(workdir):
+    order = []
+    stages = [
+        FakeStage(name, lambda name=name: (order.append(name), write(workdir / f'{name}.csv', name)), outputs=[f'{name}.csv'])
+        for name in ['a', 'b', 'c']
+    ]
+
+    pipeline.execute_complete_pipeline(stages=stages, workers=1)
+
+    assert order == ['a', 'b', 'c']
+
+
+def test_critical_path_follows_the_latest_dependency():
+    timeline = {'fights': (0, 1), 'fighters': (1, 3), 'details': (1, 9), 'clean_data': (9, 10), 'clean_fighters': (3, 4),
+                'merge_data': (10, 11)}
+    deps = {'fights': [], 'fighters': ['fights'], 'details': ['fights'], 'clean_data': ['details'],
+            'clean_fighters': ['fighters'], 'merge_data': ['clean_data', 'clean_fighters']}
+
+    assert pipeline.critical_path(timeline, deps) == ['fights', 'details', 'clean_data', 'merge_data']
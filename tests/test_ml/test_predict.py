@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.impute import SimpleImputer
+
+from src.ml import features, predict, serving
+from src.ml.prediction_cache import PredictionCache
+from src.processing.fighter_profiles import ProfileTable
+
+
+class CountingModel:
+    def __init__(self, model):
+        self.model = model
+        self.calls = []
+
+    def predict(self, X):
+        self.calls.append('predict')
+        return self.model.predict(X)
+
+    def predict_proba(self, X):
+        self.calls.append('predict_proba')
+        return self.model.predict_proba(X)
+
+
+class FixedServer:
+    def __init__(self, artifacts):
+        self.artifacts = artifacts
+
+    def current(self):
+        return self.artifacts
+
+
+@pytest.fixture
+def artifacts(monkeypatch):
+    rng = np.random.default_rng(0)
+    n = 200
+    data = {'weight_class': rng.choice(['Lightweight', 'Heavyweight'], n)}
+    for side in features.SIDES:
+        for name in features.CORNER_INPUTS:
+            data[f'{side}_{name}'] = rng.random(n) * 10
+        data[f'{side}_stance'] = rng.choice(['Orthodox', 'Southpaw'], n)
+    df = pd.DataFrame(data)
+    y = (df['f1_reach'] > df['f2_reach']).astype(int)
+
+    feature_set = features.FeatureSet().fit(df)
+    imputer = SimpleImputer().fit(feature_set.transform(df))
+    model = CountingModel(RandomForestClassifier(n_estimators=10, random_state=0).fit(imputer.transform(feature_set.transform(df)), y))
+
+    profiles = ProfileTable(pd.DataFrame([
+        {'name': f'Fighter {i}', 'url': f'/f{i}', 'last_fight_date': pd.Timestamp('2024-01-01'),
+         **features.corner_profile(df.iloc[i], 'f1')}
+        for i in range(20)
+    ]))
+    served = serving.Artifacts(model, imputer, feature_set, profiles, 'test')
+    monkeypatch.setattr(predict, 'model', FixedServer(served))
+    monkeypatch.setattr(predict, 'prediction_cache', PredictionCache(path=None))
+    return served
+
+
+def test_card_is_scored_with_one_predict_proba_call(artifacts):
+    card = [(f'Fighter {i}', f'Fighter {i + 1}', 'Lightweight') for i in range(14)]
+    card.insert(3, ('Fighter 1', 'Nobody', 'Lightweight'))
+
+    results = predict.predict_many(card)
+
+    assert artifacts.model.calls == ['predict_proba']
+    assert results[3] is None
+    assert all(result is not None for i, result in enumerate(results) if i != 3)
+
+
+def test_batch_matches_single_predictions(artifacts):
+    card = [(f'Fighter {i}', f'Fighter {19 - i}', 'Heavyweight') for i in range(10)]
+
+    batch = predict.predict_many(card)
+
+    for matchup, result in zip(card, batch):
+        X = predict.prepare_data_prevision(predict.get_fighter_profile(matchup[0]), predict.get_fighter_profile(matchup[1]),
+                                           matchup[2])
+        expected_winner = matchup[0] if artifacts.model.model.predict(X)[0] == 1 else matchup[1]
+        assert result['winner'] == expected_winner
+        assert result['confidence'] == pytest.approx(100 * artifacts.model.model.predict_proba(X).max())
+
+
+def test_repeated_matchups_come_from_the_cache(artifacts):
+    card = [(f'Fighter {i}', f'Fighter {i + 1}', 'Lightweight') for i in range(5)]
+
+    first = predict.predict_many(card)
+    again = predict.predict_many(card[:3] + [('Fighter 7', 'Fighter 8', 'Lightweight')])
+
+    assert artifacts.model.calls == ['predict_proba', 'predict_proba']
+    assert again[:3] == first[:3]
+    assert predict.prediction_cache.stats()['hits'] == 3
+
+    predict.model.artifacts = artifacts._replace(version='retrained')
+    predict.predict_many(card[:1])
+    assert artifacts.model.calls == ['predict_proba'] * 3
+
+
+def test_profiles_are_aged_to_the_prediction_day(artifacts):
+    card = [('Fighter 0', 'Fighter 1', 'Lightweight')]
+
+    predict.predict_many(card, as_of='2024-06-01')
+    predict.predict_many(card, as_of='2024-06-01 20:00')
+    assert artifacts.model.calls == ['predict_proba']
+
+    # A later day ages both fighters, so it is not answered from the cache.
+    predict.predict_many(card, as_of='2025-06-01')
+    assert artifacts.model.calls == ['predict_proba'] * 2
+    assert predict.get_fighter_profile('Fighter 0', as_of='2024-06-01')['days_since_last'] == 152
+
+
+def test_large_batches_are_scored_by_sklearn(artifacts, monkeypatch):
+    flat = CountingModel(artifacts.model.model)
+    predict.model.artifacts = artifacts._replace(flat_forest=flat)
+    monkeypatch.setattr(serving, 'FLAT_FOREST_MAX_ROWS', 4)
+
+    card = [(f'Fighter {i}', f'Fighter {i + 1}', 'Lightweight') for i in range(6)]
+    predict.predict_many(card[:4])
+    assert flat.calls == ['predict_proba'] and artifacts.model.calls == []
+
+    predict.predict_many(card, as_of='2024-06-01')
+    assert flat.calls == ['predict_proba'] and artifacts.model.calls == ['predict_proba']
@@ -0,0 +1,69 @@
+import datetime
+import sqlite3
+
+from src.ml.prediction_cache import PredictionCache, cache_key
+
+# A day the persistent tier does not prune yet.
+DAY = (datetime.date.today() + datetime.timedelta(days=30)).isoformat()
+
+
+def test_lru_evicts_least_recently_used_and_counts_hits():
+    cache = PredictionCache(max_size=2, path=None)
+    a, b, c = (cache_key(f'Fighter {i}', 'Other', 'Lightweight', 'v1', DAY) for i in 'abc')
+
+    cache.put(a, 0.1)
+    cache.put(b, 0.2)
+    assert cache.get(a) == 0.1
+    cache.put(c, 0.3)
+
+    assert cache.get(b) is None
+    assert cache.get(c) == 0.3
+    assert cache.stats() == {'hits': 2, 'misses': 1, 'hit_rate': 2 / 3, 'size': 2}
+
+
+def test_keys_are_normalized_versioned_and_dated():
+    cache = PredictionCache(path=None)
+    cache.put(cache_key("José Aldo", "Max Holloway", "Featherweight", 'v1', DAY), 0.4)
+
+    assert cache.get(cache_key("jose aldo", " max  holloway", "featherweight", 'v1', DAY + ' 18:30')) == 0.4
+    assert cache.get(cache_key("José Aldo", "Max Holloway", "Featherweight", 'v2', DAY)) is None
+    assert cache.get(cache_key("José Aldo", "Max Holloway", "Featherweight", 'v1', '2020-01-01')) is None
+    assert cache.get(cache_key("Max Holloway", "José Aldo", "Featherweight", 'v1', DAY)) is None
+
+
+def test_persistent_tier_survives_restarts_and_drops_old_versions(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    old, new = (cache_key('Ana', 'Bia', 'Flyweight', version, DAY) for version in ('v1', 'v2'))
+    PredictionCache(path=path).put(old, 0.7)
+
+    restarted = PredictionCache(path=path)
+    assert restarted.get(old) == 0.7 and restarted.stats()['hits'] == 1
+
+    restarted.put(new, 0.6)
+    assert PredictionCache(path=path).get(old) is None
+    assert PredictionCache(path=path).get(new) == 0.6
+
+
+def test_persistent_tier_drops_past_days(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    past, future = (cache_key('Ana', 'Bia', 'Flyweight', 'v1', day) for day in ('2020-01-01', DAY))
+    PredictionCache(path=path).put(past, 0.7)
+
+    PredictionCache(path=path).put(future, 0.6)
+
+    assert PredictionCache(path=path).get(past) is None
+    assert PredictionCache(path=path).get(future) == 0.6
+
+
+def test_table_from_before_dated_keys_is_replaced(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    with sqlite3.connect(path) as conn:
+        conn.execute('CREATE TABLE prediction_cache (fighter_1 TEXT, fighter_2 TEXT, weight_class TEXT, version TEXT, '
+                     'f1_win REAL, PRIMARY KEY (fighter_1, fighter_2, weight_class, version))')
+        conn.execute("INSERT INTO prediction_cache VALUES ('ana', 'bia', 'flyweight', 'v1', 0.7)")
+    conn.close()
+
+    cache = PredictionCache(path=path)
+    cache.put(cache_key('Ana', 'Bia', 'Flyweight', 'v1', DAY), 0.6)
+
+    assert PredictionCache(path=path).get(cache_key('Ana', 'Bia', 'Flyweight', 'v1', DAY)) == 0.6
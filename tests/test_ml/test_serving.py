@@ -0,0 +1,129 @@
+import os
+
+import joblib
+import pandas as pd
+import pytest
+
+from src.ml import serving
+
+
+class Constant:
+    def __init__(self, value):
+        self.value = value
+
+    def predict_proba(self, X):
+        return [[1 - self.value, self.value] for _ in X]
+
+
+@pytest.fixture
+def files(tmp_path):
+    files = {name: str(tmp_path / f'{name}.pkl') for name in ('model', 'imputer', 'features')}
+    files['profiles'] = str(tmp_path / 'fighter_profiles.csv')
+    pd.DataFrame({'name': ['Ana Lima'], 'url': ['/ana'], 'last_fight_date': ['2020-01-01'], 'age': [30.0]}) \
+        .to_csv(files['profiles'], index=False)
+    for name in ('imputer', 'features'):
+        joblib.dump(name, files[name])
+    joblib.dump(Constant(0.5), files['model'])
+    publish(files)
+    return files
+
+
+def manifest_path(files):
+    return os.path.join(os.path.dirname(files['model']), 'manifest.json')
+
+
+def publish(files):
+    path = manifest_path(files)
+    previous = os.stat(path).st_mtime_ns if os.path.exists(path) else 0
+    serving.write_manifest(files, path)
+    # Make sure the mtime moves even on filesystems with coarse timestamps.
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, max(stat.st_mtime_ns, previous + 10**9)))
+
+
+def retrain(files, value):
+    joblib.dump(Constant(value), files['model'])
+    publish(files)
+
+
+def test_artifacts_load_once_and_swap_when_retrained(files, monkeypatch):
+    server = serving.ModelServer(manifest_path(files))
+    loads = []
+    load = joblib.load
+    monkeypatch.setattr(serving.joblib, 'load', lambda path: loads.append(path) or load(path))
+
+    first = server.current()
+    assert server.current() is first
+    assert len(loads) == 3
+    assert first.profiles.get('ana lima')['name'] == 'Ana Lima'
+    assert server.predict_proba([[0]]) == [[0.5, 0.5]]
+
+    retrain(files, 0.75)
+    second = server.current()
+    assert second is not first and second.version != first.version
+    assert server.predict_proba([[0]]) == [[0.25, 0.75]]
+    # A request holding the old snapshot keeps using it.
+    assert first.model.predict_proba([[0]]) == [[0.5, 0.5]]
+
+
+def test_artifacts_are_only_swapped_in_through_the_manifest(files):
+    server = serving.ModelServer(manifest_path(files))
+    first = server.current()
+
+    # A retrain that has replaced the model but not yet written its manifest.
+    joblib.dump(Constant(0.75), files['model'])
+    assert server.current() is first
+
+    # Artifacts that no longer match the manifest are never loaded.
+    stat = os.stat(manifest_path(files))
+    os.utime(manifest_path(files), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert server.current() is first
+
+    publish(files)
+    assert server.current().model.value == 0.75
+
+
+def test_broken_artifacts_keep_serving_the_previous_ones(files):
+    server = serving.ModelServer(manifest_path(files))
+    first = server.current()
+
+    with open(files['model'], 'wb') as f:
+        f.write(b'half-written')
+    publish(files)
+
+    assert server.current() is first
+    retrain(files, 0.9)
+    assert server.current().model.value == 0.9
+
+
+def test_same_artifacts_get_the_same_version(files, tmp_path):
+    first = serving.write_manifest(files, str(tmp_path / 'a.json'))
+
+    assert serving.write_manifest(files, str(tmp_path / 'b.json')) == first
+    joblib.dump(Constant(0.75), files['model'])
+    assert serving.write_manifest(files, str(tmp_path / 'c.json')) != first
+
+
+def test_missing_artifacts(tmp_path):
+    server = serving.ModelServer(str(tmp_path / 'missing.json'))
+
+    assert server.current() is None
+    with pytest.raises(RuntimeError, match="Run the pipeline"):
+        server.predict([[0]])
+
+
+def test_small_batches_use_the_flat_forest_and_large_ones_sklearn(files):
+    from sklearn.ensemble import RandomForestClassifier
+
+    from src.ml.flat_forest import FlatForest
+
+    forest = RandomForestClassifier(n_estimators=3, random_state=0).fit([[0.0], [1.0]], [0, 1])
+    joblib.dump(forest, files['model'])
+    publish(files)
+    artifacts = serving.ModelServer(manifest_path(files)).current()
+
+    assert isinstance(artifacts.model, RandomForestClassifier)
+    assert isinstance(artifacts.flat_forest, FlatForest)
+    assert serving.scoring_model(artifacts, 14) is artifacts.flat_forest
+    assert serving.scoring_model(artifacts, serving.FLAT_FOREST_MAX_ROWS + 1) is artifacts.model
+    assert serving.flat_forest(Constant(0.5)) is None
@@ -0,0 +1,43 @@
+"""
+The row-wise fight-details cleaner that `clean_frame` replaced, kept as the
+reference the vectorized cleaner is tested (and benchmarked) against.
+"""
+from src.processing.clean_data import (
+    PCT_COLS,
+    SPLIT_COLS,
+    TIME_COLS,
+    calc_total_time,
+    clean_percentage,
+    clean_seconds,
+    clean_text_nuclear,
+    split_stats,
+)
+
+def clean_frame_rowwise(df):
+    """
+    Applies the scalar cleaners value by value, column by column.
+    """
+    df = df.loc[:, ~df.columns.duplicated()].copy()
+
+    for col in df.select_dtypes(include=['object', 'string']).columns:
+        df[col] = df[col].apply(clean_text_nuclear)
+
+    for col in PCT_COLS:
+        if col in df.columns:
+            df[col] = df[col].apply(clean_percentage)
+
+    for col in SPLIT_COLS:
+        if col in df.columns:
+            new_data = df[col].apply(split_stats)
+            df[f'{col}_landed'] = new_data.apply(lambda x: x[0])
+            df[f'{col}_attempted'] = new_data.apply(lambda x: x[1])
+            df.drop(columns=[col], inplace=True)
+
+    for col in TIME_COLS:
+        if col in df.columns:
+            df[col] = df[col].apply(clean_seconds)
+
+    if 'end_round' in df.columns and 'end_time' in df.columns:
+        df['total_time_seconds'] = df.apply(lambda row: calc_total_time(row['end_round'], row['end_time']), axis=1)
+
+    return df
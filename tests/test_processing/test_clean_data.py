@@ -1,11 +1,17 @@
+import numpy as np
+import pandas as pd
 import pytest
 
 from src.processing.clean_data import (
+    calc_total_time,
+    clean_frame,
     clean_percentage,
     clean_seconds,
     clean_text_nuclear,
     split_stats,
+    total_time_column,
 )
+from tests.test_processing.clean_data_reference import clean_frame_rowwise
 
 
 @pytest.mark.parametrize(
@@ -65,4 +71,41 @@ def test_split_stats(raw, expected):
     ],
 )
 def test_clean_percentage(raw, expected):
-    assert clean_percentage(raw) == expected
\ No newline at end of file
+    assert clean_percentage(raw) == expected
+
+def _raw_details():
+    return pd.DataFrame(
+        {
+            "event_name": ["UFC 1\n  Night", "UFC 1\n  Night", None, "UFC 2"],
+            "method": ["SUB \n Rear Naked Choke", "KO/TKO", "U-DEC", "  DQ  "],
+            "method_detail": ["Rear Naked Choke", None, "", "Punches"],
+            "end_round": ["3", "1", "²", "--"],
+            "end_time": ["4:31", " 0:59 ", "5:00", "1:00"],
+            "f1_sig_str": ["31 of 55", "31  of 55", "---", None],
+            "f2_sig_str": ["0 of 1", "bad of value", "31/55", "7 of 9"],
+            "f1_sig_pct": ["55%", "5%5", None, "--"],
+            "f1_ctrl": ["5:12", "--", "120", "1:2:3"],
+            "f1_kd": [1, 0, 2, 0],
+        }
+    )
+
+
+def test_clean_frame_matches_rowwise_reference():
+    raw = _raw_details()
+
+    vectorized = clean_frame(raw)
+    reference = clean_frame_rowwise(raw)
+
+    assert list(vectorized.columns) == list(reference.columns)
+    assert vectorized.to_csv(index=False) == reference.to_csv(index=False)
+    assert vectorized["total_time_seconds"].tolist() == [871, 59, 0, 0]
+    assert vectorized["f1_sig_str_landed"].tolist() == [31, 31, 0, 0]
+
+
+def test_total_time_is_zero_for_non_integer_rounds():
+    # A float end_round column (e.g. with missing values) stringifies as "3.0".
+    end_round = pd.Series([3.0, np.nan])
+    end_time = pd.Series(["4:31", "1:00"])
+
+    assert total_time_column(end_round, end_time).tolist() == [0, 0]
+    assert [calc_total_time(r, t) for r, t in zip(end_round, end_time)] == [0, 0]
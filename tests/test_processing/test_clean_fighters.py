@@ -7,6 +7,7 @@ from src.processing.clean_fighters import (
     clean_name,
     clean_reach,
     clean_weight,
+    parse_attributes,
     parse_dob,
 )
 
@@ -76,4 +77,27 @@ def test_parse_dob_valid():
 @pytest.mark.parametrize("raw", ["--", None, "invalid date"])
 def test_parse_dob_invalid(raw):
     result = parse_dob(raw)
-    assert pd.isna(result)
\ No newline at end of file
+    assert pd.isna(result)
+
+def test_parse_attributes_matches_scalar_parsers_and_counts_invalid():
+    raw = pd.DataFrame(
+        {
+            "height": ["5' 10\"", "6'", "--", None, "5' 10\""],
+            "weight": ["155 lbs.", "lbs", "--", "205 lbs.", None],
+            "reach": ['70"', '72"', 'x"', None, '70"'],
+            "dob": ["Jul 21, 1991", "Feb 30, 1990", "--", None, "invalid date"],
+        }
+    )
+
+    parsed, invalid = parse_attributes(raw)
+
+    expected = pd.DataFrame(
+        {
+            "height_cm": raw["height"].apply(clean_height),
+            "weight_kg": raw["weight"].apply(clean_weight),
+            "reach_cm": raw["reach"].apply(clean_reach),
+            "dob": raw["dob"].apply(parse_dob),
+        }
+    )
+    assert parsed.to_csv(index=False) == expected.to_csv(index=False)
+    assert invalid == {"height": 1, "weight": 1, "reach": 1, "dob": 2}
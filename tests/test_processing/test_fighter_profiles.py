@@ -0,0 +1,54 @@
+import pandas as pd
+import pytest
+
+from src.processing import fighter_profiles, fighter_state
+
+
+def fights():
+    rows = []
+    for date, winner, loser, winner_kd, loser_kd in [
+        ('2020-01-01', 'Ana Lima', 'Bia Souza', 2, 0),
+        ('2020-06-01', 'Bia Souza', 'Ana Lima', 1, 1),
+        ('2021-01-01', 'Ana Lima', 'Cris Melo', 0, 1),
+    ]:
+        for target, (f1, f2, f1_kd, f2_kd) in ((1, (winner, loser, winner_kd, loser_kd)),
+                                                (0, (loser, winner, loser_kd, winner_kd))):
+            row = {'event_date': date, 'target': target, 'f1_name': f1, 'f2_name': f2, 'f1_kd': f1_kd, 'f2_kd': f2_kd}
+            for side, name in (('f1', f1), ('f2', f2)):
+                row[f'{side}_link'] = f'http://ufcstats.com/fighter-details/{name[:3].lower()}'
+                row[f'{side}_age'] = 30.0 if date < '2021' else 31.0
+                row[f'{side}_reach'] = {'Ana Lima': 170.0, 'Bia Souza': 165.0, 'Cris Melo': 180.0}[name]
+                row[f'{side}_stance'] = 'Orthodox'
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def table(tmp_path):
+    df = fights()
+    _, state = fighter_state.rebuild(fighter_state.fighter_entries(df, stats=['kd']), stats=['kd'])
+    path = str(tmp_path / 'fighter_profiles.csv')
+    fighter_profiles.save_profiles(fighter_profiles.build_profiles(df, state, stats=['kd']), path)
+    return fighter_profiles.load_profiles(path)
+
+
+def test_profile_holds_state_after_last_fight(table):
+    profile = table.get('Ana Lima', as_of='2021-01-11')
+
+    assert profile['name'] == 'Ana Lima'
+    assert profile['win_streak'] == 1 and profile['loss_streak'] == 0
+    assert profile['kd_hist_avg'] == 1.0
+    assert profile['days_since_last'] == 10
+    assert profile['age'] == pytest.approx(31 + 10 / 365.25)
+    assert profile['reach'] == 170.0 and profile['stance'] == 'Orthodox'
+
+
+def test_lookup_by_normalized_name_or_url(table):
+    assert table.get('  bia   SOUZA ', as_of='2021-01-01')['name'] == 'Bia Souza'
+    assert table.get('http://ufcstats.com/fighter-details/cri', as_of='2021-01-01')['name'] == 'Cris Melo'
+    assert table.get('Dana White') is None
+    assert len(table) == 3
+
+
+def test_missing_table_loads_as_none(tmp_path):
+    assert fighter_profiles.load_profiles(str(tmp_path / 'missing.csv')) is None
@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.processing import fighter_state
+
+
+def balanced(fights):
+    """Mirrors (date, winner, loser, winner_kd, loser_kd) fights into the two rows balanced_fights.csv holds."""
+    rows = []
+    for date, winner, loser, winner_kd, loser_kd in fights:
+        rows.append({'event_date': date, 'f1_name': winner, 'f2_name': loser, 'target': 1,
+                     'f1_kd': winner_kd, 'f2_kd': loser_kd})
+        rows.append({'event_date': date, 'f1_name': loser, 'f2_name': winner, 'target': 0,
+                     'f1_kd': loser_kd, 'f2_kd': winner_kd})
+    return pd.DataFrame(rows)
+
+
+def random_fights(n, seed=0):
+    rng = np.random.default_rng(seed)
+    names = [f'Fighter {i}' for i in range(40)]
+    dates = pd.date_range('2015-01-01', periods=60, freq='14D')
+    fights = []
+    for _ in range(n):
+        a, b = rng.choice(names, 2, replace=False)
+        kd = [rng.integers(0, 3), np.nan if rng.random() < 0.1 else rng.integers(0, 3)]
+        fights.append((dates[rng.integers(len(dates))].strftime('%Y-%m-%d'), a, b, *kd))
+    return fights
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # The store paths are relative, so it lands in tmp_path.
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_streaks_and_ring_rust_count_each_fight_once():
+    df = balanced([
+        ('2020-01-01', 'Ana', 'Bia', 1, 0),
+        ('2020-03-01', 'Ana', 'Cris', 0, 0),
+        ('2020-06-01', 'Bia', 'Ana', 2, 0),
+        ('2020-07-01', 'Bia', 'Ana', 1, 1),
+    ])
+    entries = fighter_state.fighter_entries(df, stats=['kd'])
+    history, state = fighter_state.rebuild(entries, stats=['kd'])
+
+    ana = history[history['fighter'] == 'Ana'].reset_index(drop=True)
+    assert ana['days_since_last'].tolist() == [180, 60, 92, 30]
+    assert ana['win_streak'].tolist() == [0, 1, 2, 0]
+    assert ana['loss_streak'].tolist() == [0, 0, 0, 1]
+    assert ana['kd_hist_avg'].tolist() == [0, 1, 0.5, 1 / 3]
+
+    assert state.loc['Ana', 'loss_streak'] == 2
+    assert state.loc['Bia', 'win_streak'] == 2
+    assert state.loc['Ana', 'kd_sum'] == 2 and state.loc['Ana', 'kd_count'] == 4
+
+
+def test_attach_history_fills_both_corners_of_mirrored_rows():
+    df = balanced([('2020-01-01', 'Ana', 'Bia', 1, 0), ('2020-03-01', 'Ana', 'Bia', 0, 0)])
+    history, _ = fighter_state.rebuild(fighter_state.fighter_entries(df, stats=['kd']), stats=['kd'])
+
+    fighter_state.attach_history(df, history, stats=['kd'])
+
+    rematch = df[df['event_date'] == '2020-03-01'].set_index('f1_name')
+    assert rematch.loc['Ana', 'f1_win_streak'] == 1 and rematch.loc['Ana', 'f2_loss_streak'] == 1
+    assert rematch.loc['Bia', 'f1_loss_streak'] == 1 and rematch.loc['Bia', 'f2_win_streak'] == 1
+    assert rematch.loc['Bia', 'f2_kd_hist_avg'] == 1
+
+
+def test_incremental_updates_match_a_full_rebuild(store):
+    fights = sorted(random_fights(400))
+    cutoffs = [fights[100][0], fights[250][0], fights[-1][0]]
+
+    for cutoff in cutoffs:
+        seen = balanced([f for f in fights if f[0] <= cutoff])
+        entries = fighter_state.fighter_entries(seen, stats=['kd'])
+        history, _ = fighter_state.refresh(entries, stats=['kd'])
+
+    assert fighter_state.verify(entries, history, stats=['kd']) == []
+    _, expected_state = fighter_state.rebuild(entries, stats=['kd'])
+    _, stored_state = fighter_state.load_store()
+    pd.testing.assert_frame_equal(stored_state, expected_state, check_dtype=False)
+
+
+def test_refresh_only_rebuilds_when_needed(store, caplog):
+    caplog.set_level('INFO')
+    fights = sorted(random_fights(50))
+
+    def refresh(fights):
+        caplog.clear()
+        fighter_state.refresh(fighter_state.fighter_entries(balanced(fights), stats=['kd']), stats=['kd'])
+        return caplog.text
+
+    assert "no fighter state store yet" in refresh(fights)
+    assert "Updating fighter state with 2 new fight entries" in refresh(fights + [('2030-01-01', 'Ana', 'Bia', 1, 0)])
+    assert "already-stored fights changed" in refresh(fights[1:] + [('2030-01-01', 'Ana', 'Bia', 1, 0)])
+
+
+def test_corrected_result_or_stats_of_a_stored_fight_forces_a_rebuild(store, caplog):
+    caplog.set_level('INFO')
+    fights = [('2020-01-01', 'Ana', 'Bia', 1, 0), ('2020-03-01', 'Ana', 'Cris', 2, 0)]
+
+    def refresh(fights):
+        caplog.clear()
+        entries = fighter_state.fighter_entries(balanced(fights), stats=['kd'])
+        history, _ = fighter_state.refresh(entries, stats=['kd'])
+        return caplog.text, entries, history
+
+    refresh(fights[:1])
+    assert "Updating fighter state with 2 new" in refresh(fights)[0]
+    assert "Updating fighter state with 0 new" in refresh(fights)[0]
+
+    overturned = [('2020-01-01', 'Bia', 'Ana', 0, 1)] + fights[1:]
+    text, entries, history = refresh(overturned)
+    assert "already-stored fights changed" in text
+    assert fighter_state.verify(entries, history, stats=['kd']) == []
+
+    corrected_stats = [('2020-01-01', 'Bia', 'Ana', 3, 1)] + fights[1:]
+    assert "already-stored fights changed" in refresh(corrected_stats)[0]
+
+
+@pytest.mark.parametrize("window", [None, 1, 3])
+def test_prior_mean_matches_shifted_groupby_transform(window):
+    rng = np.random.default_rng(7)
+    n = 500
+    values = pd.DataFrame({'a': rng.integers(0, 5, n).astype(float), 'b': rng.random(n)})
+    values.loc[rng.random(n) < 0.15, 'a'] = np.nan
+    names = pd.Series(rng.choice(['Ana', 'Bia', 'Cris', None], n))
+
+    result = fighter_state.prior_mean(values, names, window=window)
+
+    for col in values:
+        if window is None:
+            expected = values.groupby(names)[col].transform(lambda x: x.shift(1).expanding().mean())
+        else:
+            expected = values.groupby(names)[col].transform(lambda x: x.shift(1).rolling(window, min_periods=1).mean())
+        np.testing.assert_allclose(result[col], expected, equal_nan=True)
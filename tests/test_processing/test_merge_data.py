@@ -2,22 +2,99 @@ import numpy as np
 import pandas as pd
 import pytest
 
-from src.processing.merge_data import calculate_age
+from src.processing.merge_data import DAYS_PER_YEAR, ages_at, attach_bios, fighter_bios
 
 
-def test_calculate_age_valid():
-    row = pd.Series({"dob": "1990-01-01", "event_date": "2020-01-01"})
-    age = calculate_age(row, "dob", "event_date")
-    assert age == pytest.approx(30.0, rel=0.01)
+def calculate_age(row, dob_col, date_col):
+    """The row-wise age `attach_bios` replaced, kept as its reference."""
+    if pd.isna(row[dob_col]) or pd.isna(row[date_col]):
+        return np.nan
+    try:
+        born = pd.to_datetime(row[dob_col])
+        fight_date = pd.to_datetime(row[date_col])
+        return (fight_date - born).days / DAYS_PER_YEAR
+    except (ValueError, TypeError, OverflowError):
+        return np.nan
 
 
-def test_calculate_age_missing_values():
-    row = pd.Series({"dob": None, "event_date": "2020-01-01"})
-    age = calculate_age(row, "dob", "event_date")
-    assert np.isnan(age)
+def test_ages_at_valid():
+    ages = ages_at(pd.Series(pd.to_datetime(["1990-01-01"])), pd.Series(pd.to_datetime(["2020-01-01"])))
+    assert ages[0] == pytest.approx(30.0, rel=0.01)
 
 
-def test_calculate_age_invalid_values():
-    row = pd.Series({"dob": "bad-date", "event_date": "2020-01-01"})
-    age = calculate_age(row, "dob", "event_date")
-    assert np.isnan(age)
\ No newline at end of file
+def test_ages_at_missing_values():
+    ages = ages_at(pd.Series(pd.to_datetime([None, "1990-01-01"])), pd.Series(pd.to_datetime(["2020-01-01", None])))
+    assert ages.isna().all()
+
+
+def test_unparseable_dob_has_no_age():
+    bios = fighter_bios(pd.DataFrame({"url": ["u/a"], "height_cm": [180.0], "weight_kg": [70.0], "reach_cm": [185.0],
+                                      "stance": ["Orthodox"], "dob": ["bad-date"]}))
+    ages = ages_at(bios["dob"], pd.Series(pd.to_datetime(["2020-01-01"]), index=bios.index))
+    assert np.isnan(ages["u/a"])
+
+def _fighters():
+    return pd.DataFrame(
+        {
+            "name": ["A", "B", "C"],
+            "url": ["u/a", "u/b", "u/c"],
+            "height_cm": [180.0, 175.0, 190.0],
+            "weight_kg": [70.0, 77.0, 93.0],
+            "reach_cm": [185.0, np.nan, 195.0],
+            "stance": ["Orthodox", "Southpaw", "Switch"],
+            "dob": ["1990-01-01", "bad-date", "1985-06-15"],
+        }
+    )
+
+
+def test_attach_bios_adds_both_corners_in_order():
+    fights = pd.DataFrame(
+        {
+            "winner_link": ["u/a", "u/c", "u/missing"],
+            "loser_link": ["u/b", "u/a", "u/a"],
+            "event_date": pd.to_datetime(["2020-01-01", "2021-03-01", None]),
+        }
+    )
+
+    merged = attach_bios(fights, _fighters())
+
+    assert list(merged.columns[3:]) == [
+        "winner_height", "winner_weight", "winner_reach", "winner_stance",
+        "loser_height", "loser_weight", "loser_reach", "loser_stance",
+        "winner_age", "loser_age",
+    ]
+    assert merged["winner_height"].tolist()[:2] == [180.0, 190.0]
+    assert np.isnan(merged.loc[2, "winner_height"])
+    assert merged["loser_stance"].tolist() == ["Southpaw", "Orthodox", "Orthodox"]
+    assert np.isnan(merged.loc[0, "loser_age"])
+    assert np.isnan(merged.loc[2, "loser_age"])
+
+
+def test_attach_bios_ages_match_calculate_age():
+    fights = pd.DataFrame(
+        {
+            "winner_link": ["u/a", "u/c"],
+            "loser_link": ["u/c", "u/a"],
+            "event_date": pd.to_datetime(["2020-01-01", "2021-03-01"]),
+        }
+    )
+    fighters = _fighters()
+    dobs = fighters.set_index("url")["dob"]
+
+    merged = attach_bios(fights, fighters)
+
+    for i, row in fights.iterrows():
+        expected = calculate_age(
+            pd.Series({"dob": dobs[row["winner_link"]], "event_date": row["event_date"]}), "dob", "event_date"
+        )
+        assert merged.loc[i, "winner_age"] == expected
+
+
+def test_attach_bios_ignores_duplicated_fighters():
+    fighters = pd.concat([_fighters(), _fighters().iloc[[0]].assign(height_cm=999.0)])
+    fights = pd.DataFrame({"winner_link": ["u/a"], "loser_link": ["u/b"], "event_date": pd.to_datetime(["2020-01-01"])})
+
+    merged = attach_bios(fights, fighters)
+
+    assert len(merged) == 1
+    assert merged.loc[0, "winner_height"] == 180.0
@@ -0,0 +1,43 @@
+import pytest
+
+from src.processing.name_index import NameIndex, normalize_name
+
+
+@pytest.mark.parametrize("name, key", [
+    ("José Aldo", "jose aldo"),
+    ("Sean O'Malley", "sean omalley"),
+    ("Sean O’Malley", "sean omalley"),
+    ("B.J. Penn", "bj penn"),
+    ("Georges St-Pierre", "georges st pierre"),
+    ("  Jan   BŁACHOWICZ ", "jan blachowicz"),
+    ("Conor McGregor", "conor mcgregor"),
+])
+def test_normalize_name(name, key):
+    assert normalize_name(name) == key
+
+
+def index():
+    names = NameIndex()
+    for i, name in enumerate(["Conor McGregor", "Jan Błachowicz", "Georges St-Pierre", "Alex Pereira", "Alexa Grasso"]):
+        names.add(name, f'/fighter/{i}')
+    return names
+
+
+def test_exact_lookup_ignores_accents_case_and_punctuation():
+    names = index()
+
+    assert names.get("conor mcgregor") == '/fighter/0'
+    assert names.get("Jan Blachowicz") == '/fighter/1'
+    assert names.get("Georges St. Pierre") == '/fighter/2'
+    assert names.get("Georges Pierre") is None
+    assert names.get("Georges St Pierre") == '/fighter/2'
+    assert len(names) == 5
+
+
+def test_suggestions_rank_closest_names_first():
+    names = index()
+
+    assert names.suggest("Conor Mcgreggor")[0][0] == "Conor McGregor"
+    assert [name for name, _ in names.suggest("Alex Pereyra", limit=2)] == ["Alex Pereira", "Alexa Grasso"]
+    assert names.suggest("Alex Pereira")[0] == ("Alex Pereira", 1.0)
+    assert names.suggest("Zzyzx") == []
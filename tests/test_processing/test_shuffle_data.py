@@ -0,0 +1,41 @@
+import pandas as pd
+
+from scripts.benchmark_shuffle_data import balanced_frame_copying
+from src.processing import shuffle_data
+
+
+def merged(n=7):
+    rows = []
+    for i in range(n):
+        winner, loser = f'Winner {i}', f'Loser {i}'
+        f1_won = i % 3 != 0
+        rows.append({
+            'event_date': f'2020-01-{i + 1:02d}', 'weight_class': 'Lightweight', 'referee': 'Herb Dean',
+            'method_detail': 'Punches', 'total_time_seconds': 60 * i,
+            'winner': winner, 'loser': loser, 'winner_link': f'/w{i}', 'loser_link': f'/l{i}',
+            'f1_name': winner if f1_won else loser, 'f2_name': loser if f1_won else winner,
+            'f1_kd': 10 + i if f1_won else i, 'f2_kd': i if f1_won else 10 + i,
+            'winner_reach': 180.0 + i, 'loser_reach': 170.0 + i,
+        })
+    return pd.DataFrame(rows)
+
+
+def test_chunked_output_matches_copying_reference():
+    df = merged()
+
+    expected = balanced_frame_copying(df)
+    for chunk_size in (3, 100):
+        result = pd.concat(shuffle_data.balanced_chunks(df, chunk_size=chunk_size), ignore_index=True)
+        pd.testing.assert_frame_equal(result, expected)
+
+
+def test_every_fight_appears_once_per_orientation():
+    result = shuffle_data.balanced_frame(merged())
+
+    assert list(result.columns[:5]) == ['f1_name', 'f2_name', 'f1_link', 'f2_link', 'target']
+    assert result['target'].sum() == 7 and len(result) == 14
+    winners = result[result['target'] == 1]
+    assert winners['f1_name'].str.startswith('Winner').all()
+    assert (winners['f1_kd'] >= 10).all() and (winners['f1_reach'] > winners['f2_reach']).all()
+    losers = result[result['target'] == 0]
+    assert losers['f2_name'].str.startswith('Winner').all() and (losers['f2_kd'] >= 10).all()
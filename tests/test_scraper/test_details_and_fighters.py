@@ -33,4 +33,36 @@ def test_extract_header_stats():
     assert stats["last_round_time"] == "4:31"
     assert stats["time_format"] == "3 Rnd (5-5-5)"
     assert stats["referee"] == "Herb Dean"
-    assert stats["win_method_details"] == "Rear Naked Choke"
\ No newline at end of file
+    assert stats["win_method_details"] == "Rear Naked Choke"
+
+def test_concurrent_scrape_appends_chunks_and_resumes(tmp_path, monkeypatch):
+    import pandas as pd
+
+    from src.scraper import details
+
+    input_file = tmp_path / "all_fights.csv"
+    output_file = tmp_path / "fight_details.csv"
+    links = [f"http://fight/{i}" for i in range(6)]
+    pd.DataFrame({"fight_link": links, "winner": "A", "loser": "B"}).to_csv(input_file, index=False)
+
+    fetched = []
+
+    async def fake_get_fight_stats_async(session, semaphore, url):
+        async with semaphore:
+            fetched.append(url)
+            return {"end_round": "3", "f1_name": "A", "f2_name": "B"}
+
+    monkeypatch.setattr(details, "INPUT_FILE", str(input_file))
+    monkeypatch.setattr(details, "OUTPUT_FILE", str(output_file))
+    monkeypatch.setattr(details, "SAVE_INTERVAL", 2)
+    monkeypatch.setattr(details, "get_fight_stats_async", fake_get_fight_stats_async)
+
+    pd.DataFrame({"fight_link": links[:1], "winner": "A", "loser": "B", "end_round": "3",
+                  "f1_name": "A", "f2_name": "B"}).to_csv(output_file, index=False)
+
+    details.main(concurrent=True, concurrency=3, per_host_limit=2)
+
+    assert sorted(fetched) == links[1:]
+    result = pd.read_csv(output_file)
+    assert sorted(result["fight_link"]) == links
+    assert list(result.columns[:3]) == ["fight_link", "winner", "loser"]
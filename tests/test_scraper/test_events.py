@@ -26,7 +26,7 @@ def test_get_next_event(monkeypatch):
     </table>
     """
 
-    monkeypatch.setattr(events.requests, "get", lambda *args, **kwargs: DummyResponse(html))
+    monkeypatch.setattr(events.http_client, "get", lambda *args, **kwargs: DummyResponse(html))
     result = events.get_next_event()
     assert result["name"] == "UFC Future"
     assert result["link"] == "http://event-link"
@@ -44,7 +44,7 @@ def test_get_event_fights(monkeypatch):
       </tr>
     </tbody>
     """
-    monkeypatch.setattr(events.requests, "get", lambda *args, **kwargs: DummyResponse(html))
+    monkeypatch.setattr(events.http_client, "get", lambda *args, **kwargs: DummyResponse(html))
     fights = events.get_event_fights("http://event-link")
     assert fights == [("Fighter A", "Fighter B", "Lightweight")]
 
@@ -62,8 +62,69 @@ def test_get_all_events(monkeypatch):
       </tr>
     </table>
     """
-    monkeypatch.setattr(events.requests, "get", lambda *args, **kwargs: DummyResponse(html))
+    monkeypatch.setattr(events.http_client, "get", lambda *args, **kwargs: DummyResponse(html))
     df = events.get_all_events()
     assert isinstance(df, pd.DataFrame)
     assert len(df) == 1
-    assert set(["name", "date", "location", "link"]).issubset(df.columns)
\ No newline at end of file
+    assert set(["name", "date", "location", "link"]).issubset(df.columns)
+
+LISTING_ROW = """
+      <tr class="b-statistics__table-row">
+        <td><a href="{link}">{name}</a><span>{date}</span>{icon}</td>
+        <td>Las Vegas, Nevada</td>
+      </tr>
+"""
+
+
+def listing_page(*events, upcoming=None):
+    rows = ['<tr class="b-statistics__table-row"><th>header</th></tr>']
+    if upcoming:
+        rows.append(LISTING_ROW.format(link=upcoming, name="UFC Next", date="Jan 01, 2030", icon='<img src="next.png" />'))
+    for number in events:
+        rows.append(LISTING_ROW.format(link=f"http://e{number}", name=f"UFC {number}", date="Jan 01, 2024", icon=""))
+    return "<table>" + "".join(rows) + "</table>"
+
+
+def use_tmp_event_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(events, "EVENTS_FILE", str(tmp_path / "all_events.csv"))
+    monkeypatch.setattr(events, "WATERMARK_FILE", str(tmp_path / "events_watermark.json"))
+
+
+def test_main_first_run_lists_completed_events_and_sets_watermark(tmp_path, monkeypatch):
+    use_tmp_event_files(tmp_path, monkeypatch)
+    monkeypatch.setattr(events.http_client, "get", lambda url: DummyResponse(listing_page(3, 2, 1, upcoming="http://next")))
+
+    events.main()
+
+    df = pd.read_csv(tmp_path / "all_events.csv")
+    assert list(df["link"]) == ["http://e3", "http://e2", "http://e1"]
+    assert events.load_watermark()["link"] == "http://e3"
+
+
+def test_main_incremental_reads_only_until_watermark_and_appends(tmp_path, monkeypatch):
+    use_tmp_event_files(tmp_path, monkeypatch)
+    pd.DataFrame([{"name": "UFC 3", "date": "Jan 01, 2024", "location": "X", "link": "http://e3"}]).to_csv(
+        tmp_path / "all_events.csv", index=False
+    )
+    events.save_watermark({"name": "UFC 3", "date": "Jan 01, 2024", "link": "http://e3"})
+
+    requested = []
+
+    def fake_get(url):
+        requested.append(url)
+        return DummyResponse(listing_page(5, 4, 3, 2, 1, upcoming="http://next"))
+
+    monkeypatch.setattr(events.http_client, "get", fake_get)
+
+    events.main()
+
+    assert requested == [events.EVENTS_PAGE_URL.format(page=1)]
+    df = pd.read_csv(tmp_path / "all_events.csv")
+    assert list(df["link"]) == ["http://e3", "http://e5", "http://e4"]
+    assert events.load_watermark()["link"] == "http://e5"
+
+
+def test_get_new_events_returns_none_when_watermark_is_gone(monkeypatch):
+    monkeypatch.setattr(events.http_client, "get", lambda url: DummyResponse(listing_page(2, 1) if "all" in url else listing_page()))
+
+    assert events.get_new_events("http://missing") is None
@@ -0,0 +1,60 @@
+import requests
+
+from scripts.fixture_server import FixtureServer, RecordedSite, SyntheticSite
+from src.scraper import details, events, fighters, fights
+from src.scraper.http_cache import ResponseCache
+
+BASE = "http://127.0.0.1:9999"
+
+
+def test_synthetic_pages_parse_with_the_scrapers():
+    site = SyntheticSite(events=30, fights_per_event=2, padding_kb=0)
+
+    listed, _ = events.parse_events_listing(site.render("/statistics/events/completed", "page=all", BASE), completed_only=True)
+    assert len(listed) == 30
+    assert listed[0]["link"].startswith(f"{BASE}/event-details/")
+
+    first_page, _ = events.parse_events_listing(site.render("/statistics/events/completed", "page=1", BASE))
+    assert len(first_page) == 25
+
+    event_fights = fights.parse_event_fights(site.render(listed[0]["link"][len(BASE):], "", BASE))
+    assert len(event_fights) == 2
+
+    stats = details.parse_fight_stats(site.render(event_fights[0]["fight_link"][len(BASE):], "", BASE))
+    assert stats["f1_name"] == event_fights[0]["winner"]
+    assert stats["f1_sig_str"].split(" of ")[0].isdigit()
+
+    fighter = fighters.parse_fighter_details(site.render(event_fights[0]["winner_link"][len(BASE):], "", BASE), "x")
+    assert set(fighter) >= {"height", "weight", "reach", "stance", "dob"}
+
+    assert site.render("/fighter-details/unknown", "", BASE) is None
+
+
+def test_error_injection_and_throttling():
+    site = SyntheticSite(events=1, fights_per_event=1, padding_kb=0)
+
+    failing = FixtureServer(site, error_rate=1.0)
+    throttled = FixtureServer(site, max_rps=1)
+    try:
+        assert failing.respond("/statistics/events/completed?page=all")[0] == 503
+
+        statuses = [throttled.respond("/statistics/events/completed?page=all")[0] for _ in range(3)]
+        assert statuses[0] == 200
+        assert 429 in statuses
+        assert throttled.status_counts[429] == statuses.count(429)
+    finally:
+        failing.httpd.server_close()
+        throttled.httpd.server_close()
+
+
+def test_recorded_site_serves_cached_pages_over_http(tmp_path):
+    cache = ResponseCache(root=str(tmp_path), mode="on")
+    cache.put("http://ufcstats.com/fighter-details/abc", b'<a href="http://ufcstats.com/fight-details/1">x</a>')
+
+    with FixtureServer(RecordedSite(str(tmp_path))) as server:
+        response = requests.get(f"{server.base_url}/fighter-details/abc", timeout=5)
+        missing = requests.get(f"{server.base_url}/fighter-details/zzz", timeout=5)
+
+    assert response.status_code == 200
+    assert response.content == f'<a href="{server.base_url}/fight-details/1">x</a>'.encode()
+    assert missing.status_code == 404
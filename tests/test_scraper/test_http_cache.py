@@ -0,0 +1,93 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.core.exceptions import CacheMissError
+from src.scraper import http_cache, http_client
+
+FIGHT_URL = "http://ufcstats.com/fight-details/abc"
+LISTING_URL = "http://ufcstats.com/statistics/events/completed?page=all"
+
+
+def test_classify_url():
+    assert http_cache.classify_url(FIGHT_URL) == ("fight", None)
+    assert http_cache.classify_url(LISTING_URL)[0] == "event_listing"
+    assert http_cache.classify_url("http://ufcstats.com/fighter-details/x")[0] == "fighter"
+    assert http_cache.classify_url("http://example.com/")[0] == "other"
+
+
+def test_put_and_get_roundtrip_deduplicates_identical_bodies(tmp_path):
+    cache = http_cache.ResponseCache(root=str(tmp_path), mode="on")
+    cache.put(FIGHT_URL, b"<html>same</html>")
+    cache.put("http://ufcstats.com/fight-details/def", b"<html>same</html>")
+
+    assert cache.get(FIGHT_URL) == b"<html>same</html>"
+    blobs = [f for _, _, files in os.walk(tmp_path / "blobs") for f in files]
+    assert len(blobs) == 1
+
+
+def test_concurrent_puts_of_the_same_page_do_not_collide(tmp_path):
+    cache = http_cache.ResponseCache(root=str(tmp_path), mode="on")
+    body = b"<html>" + b"x" * 100_000 + b"</html>"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: cache.put(FIGHT_URL, body), range(64)))
+
+    assert cache.get(FIGHT_URL) == body
+    assert not [f for _, _, files in os.walk(tmp_path) for f in files if f.endswith(".tmp")]
+
+
+def test_listing_expires_but_completed_fight_does_not(tmp_path, monkeypatch):
+    cache = http_cache.ResponseCache(root=str(tmp_path), mode="on")
+    cache.put(FIGHT_URL, b"fight")
+    cache.put(LISTING_URL, b"listing")
+
+    later = http_cache.time.time() + 365 * http_cache.DAY
+    monkeypatch.setattr(http_cache.time, "time", lambda: later)
+
+    assert cache.get(FIGHT_URL) == b"fight"
+    assert cache.get(LISTING_URL) is None
+
+    replay = http_cache.ResponseCache(root=str(tmp_path), mode="replay")
+    assert replay.get(LISTING_URL) == b"listing"
+
+
+def test_off_mode_neither_reads_nor_writes_without_archive(tmp_path):
+    cache = http_cache.ResponseCache(root=str(tmp_path), mode="off", archive=False)
+    cache.put(FIGHT_URL, b"fight")
+    assert cache.get(FIGHT_URL) is None
+    assert not os.listdir(tmp_path)
+
+
+def test_off_mode_still_archives_pages(tmp_path):
+    cache = http_cache.ResponseCache(root=str(tmp_path), mode="off", archive=True)
+    cache.put(FIGHT_URL, b"fight")
+    assert cache.get(FIGHT_URL) is None
+
+    replay = http_cache.ResponseCache(root=str(tmp_path), mode="replay")
+    assert replay.get(FIGHT_URL) == b"fight"
+
+
+def test_unknown_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        http_cache.ResponseCache(root=str(tmp_path), mode="sometimes")
+
+
+def test_client_serves_hits_from_cache_and_fails_on_replay_miss(tmp_path, monkeypatch):
+    cache = http_cache.ResponseCache(root=str(tmp_path), mode="replay")
+    cache.put(FIGHT_URL, b"<html>cached</html>")
+    client = http_client.HttpClient(cache=cache)
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("network used in replay mode")
+
+    monkeypatch.setattr(client.session, "get", no_network)
+
+    response = client.get(FIGHT_URL)
+    assert response.status_code == 200
+    assert response.content == b"<html>cached</html>"
+    assert client.stats.summary()["cache_hits"] == 1
+
+    with pytest.raises(CacheMissError):
+        client.get("http://ufcstats.com/fight-details/missing")
@@ -0,0 +1,70 @@
+import pytest
+import requests
+
+from src.scraper import http_client
+
+
+class DummyResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = b""
+
+
+def make_client(monkeypatch, responses):
+    client = http_client.HttpClient(max_retries=2, limiter_factory=None)
+    calls = []
+
+    def fake_get(url, **kwargs):
+        calls.append(kwargs)
+        result = responses.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monkeypatch.setattr(client.session, "get", fake_get)
+    monkeypatch.setattr(http_client.time, "sleep", lambda seconds: None)
+    return client, calls
+
+
+def test_get_retries_retryable_statuses_then_succeeds(monkeypatch):
+    client, calls = make_client(monkeypatch, [DummyResponse(503), DummyResponse(429), DummyResponse(200)])
+
+    response = client.get("http://ufcstats.com/x")
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+    assert calls[0]["timeout"] == http_client.DEFAULT_TIMEOUT
+    stats = client.stats.summary()
+    assert stats["requests"] == 3
+    assert stats["retries"] == 2
+    assert stats["status_counts"] == {503: 1, 429: 1, 200: 1}
+
+
+def test_get_returns_last_response_when_retries_exhausted(monkeypatch):
+    client, calls = make_client(monkeypatch, [DummyResponse(500), DummyResponse(500), DummyResponse(500)])
+
+    assert client.get("http://ufcstats.com/x").status_code == 500
+    assert len(calls) == 3
+
+
+def test_get_does_not_retry_client_errors(monkeypatch):
+    client, calls = make_client(monkeypatch, [DummyResponse(404)])
+
+    assert client.get("http://ufcstats.com/x").status_code == 404
+    assert len(calls) == 1
+
+
+def test_get_raises_after_repeated_connection_errors(monkeypatch):
+    error = requests.exceptions.ConnectionError("boom")
+    client, calls = make_client(monkeypatch, [error, error, error])
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get("http://ufcstats.com/x")
+    assert client.stats.summary()["errors"] == 3
+
+
+def test_backoff_delay_is_capped_and_honors_retry_after():
+    for attempt in range(10):
+        assert 0 <= http_client.backoff_delay(attempt) <= http_client.BACKOFF_MAX
+    assert http_client.backoff_delay(0, retry_after=5) >= 5
@@ -0,0 +1,53 @@
+import pandas as pd
+
+from src.scraper.manifest import KeyManifest
+
+
+def test_load_without_output_is_empty(tmp_path):
+    assert KeyManifest(str(tmp_path / "out.csv"), "url").load() == set()
+
+
+def test_add_then_load_roundtrip(tmp_path):
+    (tmp_path / "out.csv").write_text("url\n")
+    manifest = KeyManifest(str(tmp_path / "out.csv"), "url")
+    manifest.add(["http://a", "http://b"])
+    manifest.add(["http://c"])
+
+    assert manifest.load() == {"http://a", "http://b", "http://c"}
+
+
+def test_bootstraps_once_from_existing_output(tmp_path, monkeypatch):
+    output = tmp_path / "out.csv"
+    pd.DataFrame({"url": ["http://a", "http://b"], "name": ["A", "B"]}).to_csv(output, index=False)
+    manifest = KeyManifest(str(output), "url")
+
+    assert manifest.load() == {"http://a", "http://b"}
+    assert (tmp_path / "out.csv.keys").exists()
+
+    def fail_read_csv(*args, **kwargs):
+        raise AssertionError("output CSV parsed again")
+
+    monkeypatch.setattr(pd, "read_csv", fail_read_csv)
+    manifest.add(["http://c"])
+    assert manifest.load() == {"http://a", "http://b", "http://c"}
+
+
+def test_reset_replaces_keys(tmp_path):
+    (tmp_path / "out.csv").write_text("url\n")
+    manifest = KeyManifest(str(tmp_path / "out.csv"), "url")
+    manifest.add(["http://old"])
+    manifest.reset(["http://new"])
+
+    assert manifest.load() == {"http://new"}
+
+
+def test_sidecar_of_a_deleted_output_is_discarded(tmp_path):
+    output = tmp_path / "out.csv"
+    output.write_text("url\n")
+    manifest = KeyManifest(str(output), "url")
+    manifest.add(["http://a"])
+
+    output.unlink()
+
+    assert manifest.load() == set()
+    assert (tmp_path / "out.csv.keys").read_text() == ""
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pytest
+
+from src.scraper import details, fighters
+from src.scraper.parsing import FirstMatches, make_soup
+
+FIXTURES = Path(__file__).resolve().parents[1] / "fixtures" / "pages"
+
+
+def test_partial_fight_parse_matches_full_parse(monkeypatch):
+    page = (FIXTURES / "fight_details.html").read_bytes()
+    partial = details.parse_fight_stats(page)
+
+    monkeypatch.setattr(details, "fight_details_filter", lambda: None)
+
+    assert partial is not None
+    assert partial == details.parse_fight_stats(page)
+
+
+def test_partial_fighter_parse_matches_full_parse(monkeypatch):
+    page = (FIXTURES / "fighter_details.html").read_bytes()
+    partial = fighters.parse_fighter_details(page, "http://ufcstats.com/fighter-details/abc")
+
+    monkeypatch.setattr(fighters, "fighter_details_filter", lambda: None)
+
+    assert partial is not None
+    assert partial == fighters.parse_fighter_details(page, "http://ufcstats.com/fighter-details/abc")
+
+
+def test_first_matches_keeps_only_the_first_subtree_per_rule():
+    html = """
+    <div class="box wide"><p>first</p></div>
+    <table><tr><td>one</td></tr></table>
+    <div class="box"><p>second</p></div>
+    <table><tr><td>two</td></tr></table>
+    <span>ignored</span>
+    """
+    soup = make_soup(html, FirstMatches(("div", "box"), ("table", None)), "html.parser")
+
+    assert [div.text for div in soup.find_all("div")] == ["first"]
+    assert [table.text for table in soup.find_all("table")] == ["one"]
+    assert soup.find("span") is None
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="not available"):
+        make_soup(b"<html></html>", backend="html5lib")
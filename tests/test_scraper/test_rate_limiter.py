@@ -0,0 +1,68 @@
+import pytest
+
+from src.scraper import rate_limiter
+from src.scraper.rate_limiter import AIMDRateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", fake.monotonic)
+    return fake
+
+
+def test_healthy_responses_increase_rate_up_to_max(clock):
+    limiter = AIMDRateLimiter(initial_rate=10, max_rate=12, increase=1.0)
+    for _ in range(500):
+        limiter.record(200, 0.1)
+    assert limiter.rate == 12
+
+
+@pytest.mark.parametrize("status,latency", [(429, 0.1), (503, 0.1), (None, None), (200, 10.0)])
+def test_congestion_signals_halve_rate(clock, status, latency):
+    limiter = AIMDRateLimiter(initial_rate=10)
+    limiter.record(status, latency)
+    assert limiter.rate == 5
+
+
+def test_latency_spike_relative_to_baseline_backs_off(clock):
+    limiter = AIMDRateLimiter(initial_rate=10, increase=0.0)
+    for _ in range(10):
+        limiter.record(200, 0.1)
+    limiter.record(200, 0.5)
+    assert limiter.rate == 5
+
+
+def test_burst_of_failures_counts_as_one_decrease_per_cooldown(clock):
+    limiter = AIMDRateLimiter(initial_rate=10)
+    for _ in range(5):
+        limiter.record(429, 0.1)
+    assert limiter.rate == 5
+    assert limiter.decreases == 1
+
+    clock.now += 1.0
+    limiter.record(429, 0.1)
+    assert limiter.rate == 2.5
+
+
+def test_rate_never_drops_below_minimum(clock):
+    limiter = AIMDRateLimiter(initial_rate=1, min_rate=0.5)
+    for _ in range(10):
+        clock.now += 10
+        limiter.record(500)
+    assert limiter.rate == 0.5
+
+
+def test_reserve_spaces_requests_by_current_rate(clock):
+    limiter = AIMDRateLimiter(initial_rate=4)
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == pytest.approx(0.25)
+    assert limiter.reserve() == pytest.approx(0.5)
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+import pandas as pd
+
+from src.scraper import details, fighters, fights, reparse
+from src.scraper.http_cache import ResponseCache
+
+PAGES = Path(__file__).resolve().parents[1] / "fixtures" / "pages"
+EVENT_URL = "http://ufcstats.com/event-details/e0001"
+
+
+def test_reparse_rebuilds_raw_csvs_from_archive(tmp_path, monkeypatch):
+    cache_root = str(tmp_path / "cache")
+    archive = ResponseCache(root=cache_root, mode="on")
+    archive.put(EVENT_URL, (PAGES / "event_details.html").read_bytes())
+    archive.put("http://ufcstats.com/fight-details/g0001", (PAGES / "fight_details.html").read_bytes())
+    archive.put("http://ufcstats.com/fighter-details/f0001", (PAGES / "fighter_details.html").read_bytes())
+
+    pd.DataFrame([{"name": "UFC Fight Night: Alpha vs. Bravo", "date": "March 02, 2024",
+                   "location": "Las Vegas", "link": EVENT_URL}]).to_csv(tmp_path / "all_events.csv", index=False)
+
+    monkeypatch.setattr(reparse, "EVENTS_FILE", str(tmp_path / "all_events.csv"))
+    monkeypatch.setattr(fights, "OUTPUT_FIGHTS_FILE", str(tmp_path / "all_fights.csv"))
+    monkeypatch.setattr(fighters, "OUTPUT_FILE", str(tmp_path / "fighter_details.csv"))
+    monkeypatch.setattr(details, "OUTPUT_FILE", str(tmp_path / "fight_details.csv"))
+
+    reparse.main(workers=2, cache_root=cache_root)
+
+    all_fights = pd.read_csv(tmp_path / "all_fights.csv")
+    assert list(all_fights["winner"]) == ["Fighter Alpha", "Fighter Charlie"]
+    assert set(all_fights["event_name"]) == {"UFC Fight Night: Alpha vs. Bravo"}
+
+    fighter_details = pd.read_csv(tmp_path / "fighter_details.csv")
+    assert list(fighter_details["url"]) == ["http://ufcstats.com/fighter-details/f0001"]
+    assert fighter_details.loc[0, "dob"] == "Jul 21, 1991"
+
+    fight_details = pd.read_csv(tmp_path / "fight_details.csv")
+    assert list(fight_details["fight_link"]) == ["http://ufcstats.com/fight-details/g0001"]
+    assert fight_details.loc[0, "f1_sig_str"] == "31 of 55"
+    assert fight_details.loc[0, "referee"] == "Herb Dean"
@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import pytest
+
+from src.scraper import details
+from src.scraper.staged import run_staged
+
+FIXTURES = Path(__file__).resolve().parents[1] / "fixtures" / "pages"
+
+
+def _upper(item, content):
+    return content.upper()
+
+
+def test_every_fetched_item_is_parsed_and_written_in_batches():
+    items = [f"item-{i}" for i in range(25)]
+    batches = []
+
+    def fetch(item):
+        return None if item == "item-3" else item
+
+    run_staged(items, fetch, _upper, batches.append, batch_size=10,
+               fetch_workers=4, parse_workers=0, queue_size=2)
+
+    written = [record for batch in batches for record in batch]
+    assert sorted(written) == sorted(item.upper() for item in items if item != "item-3")
+    assert [len(batch) for batch in batches] == [10, 10, 4]
+
+
+def test_fetch_and_parse_errors_skip_the_item():
+    def fetch(item):
+        if item == "bad-fetch":
+            raise ConnectionError("boom")
+        return item
+
+    def parse(item, content):
+        if item == "bad-parse":
+            raise ValueError("unparseable")
+        return item
+
+    batches = []
+    stats = run_staged(["a", "bad-fetch", "b", "bad-parse"], fetch, parse, batches.append,
+                       batch_size=10, fetch_workers=2, parse_workers=0)
+
+    assert batches == [["a", "b"]]
+    assert [s.name for s in stats] == ["fetch", "parse", "write"]
+    assert stats[0].items == 4
+    assert stats[2].items == 2
+
+
+def test_write_error_is_raised_after_the_pipeline_drains():
+    def write(batch):
+        raise OSError("disk full")
+
+    with pytest.raises(OSError, match="disk full"):
+        run_staged(list(range(50)), lambda item: item, lambda item, content: content, write,
+                   batch_size=5, fetch_workers=2, parse_workers=0, queue_size=1)
+
+
+def test_parses_details_pages_on_a_process_pool():
+    page = (FIXTURES / "fight_details.html").read_bytes()
+    rows = [{"fight_link": f"http://ufcstats.com/fight-details/{i}"} for i in range(6)]
+    batches = []
+
+    run_staged(rows, lambda row: page, details.parse_record, batches.extend,
+               batch_size=4, fetch_workers=2, parse_workers=2)
+
+    expected = details.parse_fight_stats(page)
+    assert sorted(batches, key=lambda r: r["fight_link"]) == [row | expected for row in rows]